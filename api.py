@@ -1,12 +1,268 @@
 # backend/api.py
-from fastapi import FastAPI
-import json, os
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
+import time
+import os
 
-app = FastAPI()
+from instrumentation import METRICS
+from jobs import ClientLimitExceeded, JobManager, QueueFull
+from prompts import PROMPT_KEYS
+from results_log import LOG_FILE
+from run_history import DEFAULT_ALPHA, DEFAULT_MIN_RATIO, HISTORY_FILE, RunHistory
+from score_cache import ScoreCache
+from score_store import ScoreDocument, ScoreStore
+
+jobs = JobManager(cache=ScoreCache())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await jobs.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 BASE = os.path.dirname(__file__)
+store = ScoreStore(os.path.join(BASE, "scores.json"))
+log_path = LOG_FILE
+history = RunHistory(HISTORY_FILE)
+
+STREAM_POLL_INTERVAL = 0.5
+STREAM_HEARTBEAT = 15.0
+
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # étiquette = gabarit de la route (/api/scores/{model}), pas l'URL brute
+    route = request.scope.get("route")
+    path = getattr(route, "path", "<unmatched>")
+    METRICS.observe_request(request.method, path, response.status_code, time.perf_counter() - start)
+    return response
+
+
+def _not_modified(request: Request, doc: ScoreDocument, etag: str) -> bool:
+    """
+    Requête conditionnelle : If-None-Match prime sur If-Modified-Since.
+    """
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = [t.strip().removeprefix("W/") for t in inm.split(",")]
+        return "*" in tags or etag in tags
+    ims = request.headers.get("if-modified-since")
+    if ims is not None:
+        try:
+            return int(doc.mtime) <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _validators(doc: ScoreDocument, etag: str) -> dict:
+    return {"ETag": etag, "Last-Modified": doc.last_modified, "Cache-Control": "no-cache"}
+
+
+def _derived_etag(request: Request, doc: ScoreDocument) -> str:
+    # une réponse filtrée dépend de la version du document et de l'URL demandée
+    key = f"{doc.etag}{request.url.path}?{request.url.query}".encode("utf-8")
+    return '"' + hashlib.sha256(key).hexdigest()[:32] + '"'
+
+
+def _criteria(criteria: Optional[str]) -> Optional[List[str]]:
+    return [c.strip() for c in criteria.split(",") if c.strip()] if criteria else None
+
+
+def _query_response(request: Request, doc: ScoreDocument, build) -> Response:
+    etag = _derived_etag(request, doc)
+    headers = _validators(doc, etag)
+    if _not_modified(request, doc, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
+
 
 @app.get("/api/scores")
-def get_scores():
-    path = os.path.join(BASE, "scores.json")
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+def get_scores(
+    request: Request,
+    criteria: Optional[str] = None,
+    min_overall: Optional[float] = None,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+):
+    doc = store.current()
+    if criteria is None and min_overall is None and limit is None and not offset:
+        headers = _validators(doc, doc.etag)
+        if _not_modified(request, doc, doc.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=doc.body, media_type="application/json", headers=headers)
+
+    index = doc.index
+    models = index.models[offset:None if limit is None else offset + limit]
+    crits = _criteria(criteria)
+    return _query_response(request, doc, lambda: {
+        m: index.model_cells(m, crits, min_overall) for m in models
+    })
+
+
+@app.get("/api/leaderboard")
+def get_leaderboard(
+    request: Request,
+    sort: str = "overall",
+    min_overall: Optional[float] = None,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+):
+    doc = store.current()
+    try:
+        board = doc.index.leaderboard(sort, limit, offset, min_overall)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"unknown sort criterion: {sort}")
+    return _query_response(request, doc, lambda: board)
+
+
+async def _tail_log(request: Request, path: str, from_start: bool, follow: bool) -> AsyncIterator[bytes]:
+    """
+    Suit le journal NDJSON d'evaluate_models et émet un évènement SSE par
+    cellule scorée. Un journal tronqué (nouveau run) est relu depuis le début.
+    """
+    position = 0
+    if not from_start and os.path.exists(path):
+        position = os.path.getsize(path)
+    pending = b""
+    last_sent = time.monotonic()
+    while True:
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < position:
+            position, pending = 0, b""
+        if size > position:
+            with open(path, "rb") as f:
+                f.seek(position)
+                pending += f.read(size - position)
+            position = size
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield b"event: cell\ndata: " + line + b"\n\n"
+                    last_sent = time.monotonic()
+        if not follow or await request.is_disconnected():
+            return
+        if time.monotonic() - last_sent >= STREAM_HEARTBEAT:
+            yield b": keep-alive\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(STREAM_POLL_INTERVAL)
+
+
+@app.get("/api/stream/scores")
+def stream_scores(request: Request, from_start: bool = False, follow: bool = True):
+    """
+    Flux Server-Sent Events des cellules au fur et à mesure d'un run
+    (`from_start` rejoue le journal existant, `follow=false` s'arrête à la fin).
+    """
+    return StreamingResponse(
+        _tail_log(request, log_path, from_start, follow),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/api/scores/{model}")
+def get_model_scores(
+    request: Request,
+    model: str,
+    criteria: Optional[str] = None,
+    min_overall: Optional[float] = None,
+):
+    doc = store.current()
+    cells = doc.index.model_cells(model, _criteria(criteria), min_overall)
+    if cells is None:
+        raise HTTPException(status_code=404, detail=f"unknown model: {model}")
+    return _query_response(request, doc, lambda: cells)
+
+
+@app.get("/api/scores/{model}/{prompt_key}")
+def get_cell_scores(request: Request, model: str, prompt_key: str, criteria: Optional[str] = None):
+    doc = store.current()
+    entry = doc.index.cell(model, prompt_key, _criteria(criteria))
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"unknown cell: {model}/{prompt_key}")
+    return _query_response(request, doc, lambda: entry)
+
+
+class EvaluateRequest(BaseModel):
+    """
+    Soit `responses` ({prompt_key: code}, comme un responses/<model>.json),
+    soit un seul snippet via `prompt_key` + `code`.
+    """
+    model: str = "submitted"
+    responses: Optional[Dict[str, str]] = None
+    prompt_key: Optional[str] = None
+    code: Optional[str] = None
+
+
+@app.post("/api/evaluate", status_code=202)
+async def submit_evaluation(body: EvaluateRequest, request: Request):
+    if body.responses is not None:
+        responses = body.responses
+    elif body.prompt_key is not None and body.code is not None:
+        responses = {body.prompt_key: body.code}
+    else:
+        raise HTTPException(status_code=422, detail="provide either responses or prompt_key + code")
+    unknown = sorted(set(responses) - set(PROMPT_KEYS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"unknown prompt keys: {', '.join(unknown)}")
+
+    jobs.start()
+    client = request.client.host if request.client else "anonymous"
+    try:
+        job = jobs.submit(client, body.model, responses)
+    except (QueueFull, ClientLimitExceeded) as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return {"job_id": job.id, "status": job.status, "location": f"/api/jobs/{job.id}"}
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"unknown job: {job_id}")
+    return job.as_dict()
+
+
+@app.get("/api/runs")
+def get_runs():
+    return history.runs()
+
+
+@app.get("/api/runs/compare")
+def compare_runs(
+    base: Optional[int] = None,
+    head: Optional[int] = None,
+    alpha: float = Query(DEFAULT_ALPHA, gt=0, lt=1),
+    min_ratio: float = Query(DEFAULT_MIN_RATIO, gt=0),
+    force: bool = False,
+):
+    """
+    Régressions entre deux runs de l'historique (défaut : les deux derniers).
+    409 si les deux runs n'ont pas la même version du scorer (sauf `force`).
+    """
+    try:
+        return history.compare(base, head, alpha, min_ratio, force)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=e.args[0])
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Métriques au format texte Prometheus : étapes des cellules scorées par
+    les jobs (temps mural, CPU, pic mémoire) et latence des requêtes HTTP.
+    """
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
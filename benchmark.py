@@ -0,0 +1,327 @@
+# backend/benchmark.py
+
+import math
+import random
+import functools
+import timeit
+import statistics
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prompts import TEST_CASES
+from generators import MUTABLE_ARGS, finite_float, fresh_args
+
+# Tailles d'entrées générées (progression géométrique) pour les prompts dont
+# le coût dépend de l'entrée
+SCALED_SIZES: Tuple[int, ...] = (10, 100, 1_000, 10_000, 100_000)
+
+# Budget de temps visé par mesure (number est calibré pour l'atteindre)
+TARGET_SAMPLE_TIME = 0.005
+REPEAT = 9
+# Aux grandes tailles (celles qui décident de la classe de complexité), plus
+# de mesures, tant qu'elles tiennent dans REPEAT_BUDGET secondes
+LARGE_SIZE = 10_000
+REPEAT_LARGE = 25
+REPEAT_BUDGET = 0.25
+# Copies d'arguments préparées d'un coup hors de la zone chronométrée
+COPY_BATCH = 1024
+# Au-delà de ce temps projeté par appel, les tailles suivantes sont sautées
+MAX_PROJECTED_CALL = 0.5
+
+# Classes de complexité ajustées sur les mesures : t(n) ≈ a + b·f(n)
+COMPLEXITY_CLASSES: Dict[str, Callable[[int], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: float(n) * n,
+}
+# Score de performance associé à chaque classe
+COMPLEXITY_SCORES = {"O(1)": 5.0, "O(n)": 5.0, "O(n log n)": 4.0, "O(n^2)": 1.0}
+# Une classe plus simple l'emporte si son erreur reste sous
+# meilleure erreur × COMPLEXITY_TOLERANCE + COMPLEXITY_SLACK (bruit de mesure)
+COMPLEXITY_TOLERANCE = 1.15
+COMPLEXITY_SLACK = 0.05
+# Au-delà de cette erreur d'ajustement, les mesures sont trop bruitées pour
+# trancher : la classe est « unresolved » et n'entre pas dans le score
+MAX_FIT_ERROR = 0.25
+UNRESOLVED = "unresolved"
+
+
+def _ints(n: int, rng: random.Random) -> List[int]:
+    return [rng.randint(-10 * n, 10 * n) for _ in range(n)]
+
+
+def _palindrome(n: int, rng: random.Random, alphabet: str) -> str:
+    half = "".join(rng.choice(alphabet) for _ in range(n // 2))
+    return half + half[::-1]
+
+
+# prompt_key → générateur (taille, rng) → tuple d'arguments
+SCALED_INPUTS: Dict[str, Callable[[int, random.Random], Tuple[Any, ...]]] = {
+    "second_largest": lambda n, rng: (_ints(n, rng),),
+    "extreme_numbers_test": lambda n, rng: ([finite_float(rng) for _ in range(n)],),
+    "is_palindrome": lambda n, rng: (_palindrome(n, rng, "abcdefgh"),),
+    "multilingual_palindrome_test": lambda n, rng: (_palindrome(n, rng, "abcéèтоп"),),
+    "weighted_average": lambda n, rng: (
+        [(rng.uniform(0, 20), rng.uniform(0.1, 1.0)) for _ in range(n)],
+    ),
+    "injection_sanitation_test": lambda n, rng: ("".join(rng.choice("abc xyz") for _ in range(n)),),
+}
+
+
+@dataclass
+class Timing:
+    """
+    Mesure d'une entrée : temps par appel (médiane, p95 et minimum sur
+    REPEAT mesures). Le minimum, le moins sensible à la charge de la
+    machine, sert à l'ajustement de complexité. `size` vaut None pour un
+    cas réel de TEST_CASES.
+    """
+    size: Optional[int]
+    median: float
+    p95: float
+    number: int
+    best: Optional[float] = None
+
+    @property
+    def fit_time(self) -> float:
+        return self.best if self.best is not None else self.median
+
+
+@dataclass
+class Benchmark:
+    """
+    Résultat du harnais pour une fonction : cas réels + entrées mises à l'échelle.
+    """
+    prompt_key: str
+    timings: List[Timing] = field(default_factory=list)
+
+    @property
+    def scaled(self) -> List[Timing]:
+        return sorted((t for t in self.timings if t.size is not None), key=lambda t: t.size)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"timings": [asdict(t) for t in self.timings]}
+
+
+@dataclass
+class ComplexityFit:
+    """
+    Classe de complexité empirique : t(n) ≈ overhead + constant·f(n) (secondes),
+    `fit_error` = erreur relative quadratique moyenne de l'ajustement.
+    `complexity` vaut UNRESOLVED si même le meilleur ajustement dépasse
+    MAX_FIT_ERROR (constantes de ce meilleur ajustement conservées).
+    """
+    complexity: str
+    constant: float
+    overhead: float
+    fit_error: float
+    sizes: List[int]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "class": self.complexity,
+            "constant": self.constant,
+            "overhead": self.overhead,
+            "fit_error": round(self.fit_error, 4),
+            "sizes": self.sizes,
+        }
+
+    @property
+    def resolved(self) -> bool:
+        return self.complexity != UNRESOLVED
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def _measure(func: Any, args: Tuple[Any, ...], number: int) -> float:
+    """
+    Durée de `number` appels de func. Si des arguments sont modifiables,
+    chaque appel reçoit sa propre copie (fresh_args), préparée par lots de
+    COPY_BATCH hors de la zone chronométrée : une fonction qui trie ou vide
+    son entrée n'est pas mesurée sur des données déjà traitées.
+    """
+    if not any(isinstance(a, MUTABLE_ARGS) for a in args):
+        return timeit.Timer(lambda: func(*args)).timeit(number)
+    total, left = 0.0, number
+    while left:
+        batch = [fresh_args(args) for _ in range(min(left, COPY_BATCH))]
+
+        def run() -> None:
+            for call_args in batch:
+                func(*call_args)
+
+        total += timeit.Timer(run).timeit(1)
+        left -= len(batch)
+    return total
+
+
+def time_call(func: Any, args: Tuple[Any, ...], size: Optional[int] = None, repeat: int = REPEAT) -> Timing:
+    """
+    Chronomètre func(*args) : `number` est doublé jusqu'à ce qu'une mesure
+    dure au moins TARGET_SAMPLE_TIME, puis `repeat` mesures sont prises
+    (REPEAT au moins, plus seulement si elles tiennent dans REPEAT_BUDGET).
+    Chaque appel part d'arguments neufs (voir _measure).
+    Les exceptions levées par func remontent à l'appelant.
+    """
+    number = 1
+    while True:
+        elapsed = _measure(func, args, number)
+        if elapsed >= TARGET_SAMPLE_TIME or number >= 1 << 20:
+            break
+        number *= 2
+    if repeat > REPEAT:
+        repeat = max(REPEAT, min(repeat, int(REPEAT_BUDGET / max(elapsed, 1e-9))))
+    samples = [_measure(func, args, number) / number for _ in range(repeat)]
+    return Timing(size, statistics.median(samples), _percentile(samples, 0.95), number, min(samples))
+
+
+@functools.lru_cache(maxsize=None)
+def _scaled_inputs(prompt_key: str, seed: int) -> Tuple[Tuple[int, Tuple[Any, ...]], ...]:
+    # généré une fois par worker : partagé par tous les snippets (et échantillons) du prompt
+    gen = SCALED_INPUTS.get(prompt_key)
+    if gen is None:
+        return ()
+    rng = random.Random(seed)
+    return tuple((n, gen(n, rng)) for n in SCALED_SIZES)
+
+
+def benchmark_inputs(prompt_key: str, seed: int = 0) -> List[Tuple[Optional[int], Tuple[Any, ...]]]:
+    """
+    Entrées du benchmark : arguments réels de TEST_CASES (hors cas qui doivent
+    lever une exception) puis entrées générées aux tailles SCALED_SIZES.
+    Les entrées générées sont mémoïsées par (prompt, graine) ; chaque appel
+    en renvoie des copies, qu'un snippet peut modifier sans affecter le suivant.
+    """
+    inputs: List[Tuple[Optional[int], Tuple[Any, ...]]] = []
+    for args, expected in TEST_CASES.get(prompt_key, []):
+        if isinstance(expected, type) and issubclass(expected, Exception):
+            continue
+        inputs.append((None, args))
+    inputs.extend((n, fresh_args(args)) for n, args in _scaled_inputs(prompt_key, seed))
+    return inputs
+
+
+def run_benchmark(prompt_key: str, func: Any) -> Benchmark:
+    """
+    Lance le harnais sur func. Une entrée qui lève une exception est ignorée.
+    Les grandes tailles ne sont mesurées que si la projection depuis la taille
+    précédente reste sous MAX_PROJECTED_CALL ; la projection suit la pente
+    log-log des deux dernières tailles (au mieux linéaire).
+    """
+    bench = Benchmark(prompt_key)
+    last: Optional[Timing] = None
+    slope = 1.0
+    for size, args in benchmark_inputs(prompt_key):
+        if size is not None and last is not None:
+            if last.median * (size / last.size) ** slope > MAX_PROJECTED_CALL:
+                break
+        try:
+            repeat = REPEAT_LARGE if size is not None and size >= LARGE_SIZE else REPEAT
+            timing = time_call(func, args, size, repeat)
+        except Exception:
+            continue
+        bench.timings.append(timing)
+        if size is not None:
+            if last is not None and last.median > 0 and timing.median > 0:
+                slope = max(1.0, math.log(timing.median / last.median) / math.log(size / last.size))
+            last = timing
+    return bench
+
+
+def _fit_class(points: List[Tuple[int, float]], f: Callable[[int], float]) -> Optional[Tuple[float, float, float]]:
+    """
+    Moindres carrés pondérés par 1/t² (erreur relative) de t ≈ a + b·f(n),
+    a ≥ 0, b > 0 (b = 0 pour la classe constante). Renvoie (a, b, erreur).
+    En posant u = 1/t et v = f(n)/t, on minimise Σ(a·u + b·v − 1)².
+    """
+    u = [1.0 / t for _, t in points]
+    v = [f(n) / t for n, t in points]
+    suu = sum(x * x for x in u)
+    suv = sum(x * y for x, y in zip(u, v))
+    svv = sum(y * y for y in v)
+    su, sv = sum(u), sum(v)
+    constant = all(y == x for x, y in zip(u, v))
+    det = suu * svv - suv * suv
+    if constant or det <= 0:
+        a, b = su / suu, 0.0
+    else:
+        a = (su * svv - sv * suv) / det
+        b = (suu * sv - suv * su) / det
+        if a < 0:
+            a, b = 0.0, sv / svv
+        if b <= 0:
+            return None
+    error = math.sqrt(sum((a * x + b * y - 1.0) ** 2 for x, y in zip(u, v)) / len(u))
+    return a, b, error
+
+
+def fit_complexity(bench: Benchmark) -> Optional[ComplexityFit]:
+    """
+    Ajuste chaque classe de COMPLEXITY_CLASSES sur les entrées mises à
+    l'échelle (au moins trois tailles, temps minimal par appel) et garde la
+    meilleure ; une classe plus simple l'emporte si son erreur reste proche
+    de la meilleure (le bruit de mesure ne doit pas suffire à « monter »
+    d'une classe). Au-delà de MAX_FIT_ERROR, la classe est UNRESOLVED.
+    """
+    points = [(t.size, t.fit_time) for t in bench.scaled if t.fit_time > 0]
+    if len(points) < 3:
+        return None
+    fits = []
+    for name, f in COMPLEXITY_CLASSES.items():
+        fit = _fit_class(points, f)
+        if fit is not None:
+            fits.append((name, *fit))
+    best = min(e for _, _, _, e in fits)
+    sizes = [n for n, _ in points]
+    if best > MAX_FIT_ERROR:
+        _, a, b, error = min(fits, key=lambda fit: fit[3])
+        return ComplexityFit(UNRESOLVED, b, a, error, sizes)
+    name, a, b, error = next(fit for fit in fits if fit[3] <= best * COMPLEXITY_TOLERANCE + COMPLEXITY_SLACK)
+    return ComplexityFit(name, b, a, error, sizes)
+
+
+def _score_latency(seconds: float) -> float:
+    """
+    Échelle logarithmique du temps par appel : ≤1 µs → 5.0, ≥10 ms → 1.0.
+    """
+    if seconds <= 1e-6:
+        return 5.0
+    if seconds >= 1e-2:
+        return 1.0
+    return round(5.0 - (math.log10(seconds) + 6.0), 1)
+
+
+def _score_scaling(small: Timing, large: Timing) -> float:
+    """
+    Pente log-log du temps entre deux tailles : ≤1 (linéaire) → 5.0,
+    ≥2 (quadratique) → 1.0.
+    """
+    slope = math.log(large.fit_time / small.fit_time) / math.log(large.size / small.size)
+    if slope <= 1.0:
+        return 5.0
+    if slope >= 2.0:
+        return 1.0
+    return round(5.0 - (slope - 1.0) * 4.0, 1)
+
+
+def score_benchmark(bench: Benchmark) -> float:
+    """
+    Score [1.0…5.0] : d'après la classe de complexité ajustée quand au moins
+    trois tailles ont été mesurées et que l'ajustement tranche, sinon d'après
+    la pente log-log des deux plus grandes tailles, sinon d'après la latence
+    médiane par appel sur les cas réels.
+    """
+    fit = fit_complexity(bench)
+    if fit is not None and fit.resolved:
+        return COMPLEXITY_SCORES[fit.complexity]
+    scaled = [t for t in bench.scaled if t.fit_time > 0]
+    if len(scaled) >= 2:
+        return _score_scaling(scaled[-2], scaled[-1])
+    if bench.timings:
+        return _score_latency(statistics.median(t.median for t in bench.timings))
+    return 0.0
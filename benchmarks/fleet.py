@@ -0,0 +1,116 @@
+# backend/benchmarks/fleet.py
+
+import os
+import json
+import random
+from typing import Dict, List, Optional
+
+from prompts import PROMPT_KEYS
+
+RESP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "responses")
+
+# Cas pathologiques : (description, générateur de source pour un prompt donné)
+PATHOLOGICAL = {
+    # boucle lente mais bornée (~ quelques centaines de ms par appel)
+    "slow_loop": lambda key: (
+        f"def {key}(*args):\n"
+        "    total = 0\n"
+        "    for i in range(3_000_000):\n"
+        "        total += i % 7\n"
+        "    return total\n"
+    ),
+    # sortie énorme (~10 Mo) renvoyée à chaque appel
+    "huge_output": lambda key: (
+        f"def {key}(*args):\n"
+        "    return 'x' * 10_000_000\n"
+    ),
+    # dépasse le plafond mémoire du worker
+    "memory_hog": lambda key: (
+        f"def {key}(*args):\n"
+        "    blob = bytearray(8 * 1024 ** 3)\n"
+        "    return len(blob)\n"
+    ),
+    "syntax_error": lambda key: f"def {key}(:\n    return\n",
+    "missing_function": lambda key: "def unrelated():\n    return None\n",
+}
+
+
+def _padding(rng: random.Random, functions: int) -> str:
+    """
+    Helpers documentés ajoutés aux gros snippets (~12 lignes chacun).
+    """
+    parts = []
+    for i in range(functions):
+        a, b = rng.randint(1, 9), rng.randint(1, 9)
+        parts.append(
+            f"\n\ndef _helper_{i}(values):\n"
+            f'    """Helper {i} : combine les valeurs par {a} et {b}."""\n'
+            "    # accumule puis normalise\n"
+            "    acc = 0\n"
+            "    for v in values:\n"
+            f"        if v % {a} == 0:\n"
+            f"            acc += v * {b}\n"
+            "        else:\n"
+            "            acc -= v\n"
+            "    return acc / max(1, len(values))\n"
+        )
+    return "".join(parts)
+
+
+def load_templates(resp_dir: str = RESP_DIR) -> Dict[str, List[str]]:
+    """
+    {prompt_key: [sources]} tirés des réponses réelles de `resp_dir`.
+    """
+    templates: Dict[str, List[str]] = {key: [] for key in PROMPT_KEYS}
+    for name in sorted(os.listdir(resp_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(resp_dir, name), encoding="utf-8") as f:
+            for key, code in json.load(f).items():
+                if key in templates and code:
+                    templates[key].append(code)
+    return templates
+
+
+def generate_fleet(
+    directory: str,
+    models: int,
+    size: str = "small",
+    pathological: float = 0.0,
+    seed: int = 0,
+    templates: Optional[Dict[str, List[str]]] = None,
+) -> List[str]:
+    """
+    Écrit `models` fichiers <directory>/bench_NNNN.json (un responses/ synthétique)
+    et renvoie leurs noms. Chaque snippet est une réponse réelle tirée au hasard,
+    marquée d'un commentaire propre au modèle (pas de hit de cache entre
+    modèles) ; size="large" y ajoute ~40 helpers documentés. Une proportion
+    `pathological` des cellules est remplacée par un cas de PATHOLOGICAL.
+    Même graine → même flotte.
+    """
+    if size not in ("small", "large"):
+        raise ValueError(f"taille inconnue : {size}")
+    rng = random.Random(seed)
+    templates = templates if templates is not None else load_templates()
+    kinds = sorted(PATHOLOGICAL)
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for m in range(models):
+        name = f"bench_{m:04d}"
+        responses: Dict[str, str] = {}
+        for key in PROMPT_KEYS:
+            if pathological and rng.random() < pathological:
+                kind = kinds[rng.randrange(len(kinds))]
+                responses[key] = f"# {name} pathological:{kind}\n" + PATHOLOGICAL[kind](key)
+                continue
+            pool = templates.get(key) or []
+            if not pool:
+                continue
+            code = f"# {name}\n" + pool[rng.randrange(len(pool))]
+            if size == "large":
+                code += _padding(rng, 40)
+            responses[key] = code
+        with open(os.path.join(directory, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(responses, f, ensure_ascii=False, indent=2)
+        names.append(name)
+    return names
@@ -0,0 +1,270 @@
+# backend/benchmarks/suite.py
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import subprocess
+from typing import Any, Dict, Iterator, List, Optional
+
+import evaluate_models
+from instrumentation import StageSummary, recording
+from prompts import PROMPT_KEYS
+from scoring import SCORER_VERSION, score_code
+from scorers import STATIC_CRITERIA, get_scorers
+from benchmarks.fleet import generate_fleet, load_templates
+
+REPORT_FILE = "bench_report.json"
+
+# critères statiques mesurés isolément, sur le source brut (sans mémoïsation)
+STATIC_SCORERS = get_scorers(STATIC_CRITERIA)
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+        "p50_ms": statistics.median(ordered) * 1e3,
+        "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1e3,
+    }
+
+
+@contextlib.contextmanager
+def _patched(module: Any, **attrs: Any) -> Iterator[None]:
+    saved = {name: getattr(module, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+# --- 1) Pipeline complet : evaluate_models.main sur une flotte synthétique ---
+
+def bench_pipeline(
+    workdir: str,
+    models: int,
+    size: str = "small",
+    pathological: float = 0.0,
+    workers: int = 1,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Génère une flotte de `models` modèles puis chronomètre evaluate_models.main
+    deux fois : cache froid puis cache chaud (même contenu).
+    """
+    resp_dir = os.path.join(workdir, "responses")
+    generate_fleet(resp_dir, models, size, pathological, seed)
+    out_file = os.path.join(workdir, "scores.json")
+    argv = [
+        "--workers", str(workers),
+        "--cache-dir", os.path.join(workdir, "cache"),
+        "--log", os.path.join(workdir, "scores.ndjson"),
+        "--history", os.path.join(workdir, "runs.sqlite"),
+    ]
+    timings = {}
+    with _patched(evaluate_models, RESP_DIR=resp_dir, OUT_FILE=out_file):
+        for phase in ("cold", "warm"):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                evaluate_models.main(argv)
+            timings[phase] = time.perf_counter() - start
+    cells = models * len(PROMPT_KEYS)
+    return {
+        "models": models,
+        "size": size,
+        "pathological": pathological,
+        "workers": workers,
+        "cells": cells,
+        "cold_seconds": timings["cold"],
+        "warm_seconds": timings["warm"],
+        "cold_cells_per_second": cells / timings["cold"],
+        "scores_file": out_file,
+    }
+
+
+# --- 2) score_code, étape par étape, et critères statiques isolés ------------
+
+def bench_criteria(repeat: int = 3) -> Dict[str, Any]:
+    """
+    Exécute score_code sur chaque réponse réelle (`repeat` fois) sous
+    instrumentation, et chronomètre chaque critère statique isolément.
+    """
+    summary = StageSummary()
+    static: Dict[str, List[float]] = {name: [] for name in STATIC_SCORERS}
+    for key, sources in load_templates().items():
+        for source in sources:
+            for _ in range(repeat):
+                with recording() as recorder:
+                    with recorder.stage("score_code"):
+                        score_code(key, source)
+                summary.add(recorder.as_dict())
+            for name, scorer in STATIC_SCORERS.items():
+                start = time.perf_counter()
+                scorer(source)
+                static[name].append(time.perf_counter() - start)
+    return {
+        "stages": {
+            row["stage"]: {
+                "cells": row["cells"],
+                "mean_ms": row["wall_mean"] * 1e3,
+                "p95_ms": row["wall_p95"] * 1e3,
+                "cpu_seconds": row["cpu_total"],
+            }
+            for row in summary.rows()
+        },
+        "static_scorers": {name: _stats(samples) for name, samples in static.items()},
+    }
+
+
+# --- 3) API sous charge concurrente ------------------------------------------
+
+async def _load(client: Any, path: str, requests: int, concurrency: int,
+                headers: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    gate = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with gate:
+            start = time.perf_counter()
+            r = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if r.status_code not in (200, 304):
+                raise RuntimeError(f"{path}: HTTP {r.status_code}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {"concurrency": concurrency, "requests_per_second": requests / elapsed, **_stats(latencies)}
+
+
+def bench_api(scores_file: str, requests: int = 500, concurrency: int = 32) -> Dict[str, Any]:
+    """
+    Charge l'application FastAPI en process (transport ASGI, sans réseau)
+    sur `scores_file`. Nécessite fastapi et httpx.
+    """
+    import httpx
+    import api
+    from score_store import ScoreStore
+
+    async def run() -> Dict[str, Any]:
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            first = await client.get("/api/scores")
+            etag = first.headers["etag"]
+            model = next(iter(first.json()), "")
+            return {
+                "/api/scores": await _load(client, "/api/scores", requests, concurrency),
+                "/api/scores (304)": await _load(client, "/api/scores", requests, concurrency,
+                                                 {"If-None-Match": etag}),
+                "/api/scores/{model}": await _load(client, f"/api/scores/{model}", requests, concurrency),
+                "/api/leaderboard": await _load(client, "/api/leaderboard?limit=20", requests, concurrency),
+            }
+
+    with _patched(api, store=ScoreStore(scores_file)):
+        return asyncio.run(run())
+
+
+# --- Rapport -------------------------------------------------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    if isinstance(data, dict):
+        flat: Dict[str, float] = {}
+        for k, v in data.items():
+            flat.update(_flatten(v, f"{prefix}.{k}" if prefix else str(k)))
+        return flat
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        return {prefix: float(data)}
+    return {}
+
+
+def compare_reports(baseline: Dict[str, Any], report: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Ratio nouveau / référence de chaque mesure de temps commune aux deux
+    rapports (> 1 : plus lent que la référence).
+    """
+    old, new = _flatten(baseline), _flatten(report)
+    return {
+        k: round(new[k] / old[k], 3)
+        for k in sorted(old.keys() & new.keys())
+        if old[k] > 0 and (k.endswith("_ms") or k.endswith("_seconds")) and not k.startswith("meta.")
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark de l'évaluateur sur des flottes synthétiques")
+    parser.add_argument("--models", default="10", help="tailles de flotte, ex. 10,100,1000")
+    parser.add_argument("--sizes", default="small", help="small, large ou small,large")
+    parser.add_argument("--pathological", type=float, default=0.1,
+                        help="proportion de cellules pathologiques (boucles lentes, sorties énormes…)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3, help="répétitions de score_code par réponse")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--skip", default="", help="parties à sauter : pipeline,criteria,api")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=REPORT_FILE)
+    parser.add_argument("--baseline", default=None, help="rapport précédent à comparer")
+    args = parser.parse_args(argv)
+    skip = {s.strip() for s in args.skip.split(",") if s.strip()}
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "created_at": time.time(),
+            "commit": _git_commit(),
+            "scorer_version": SCORER_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+    }
+    with tempfile.TemporaryDirectory(prefix="evalbench_") as tmp:
+        scores_file = None
+        if "pipeline" not in skip:
+            report["pipeline"] = {}
+            for size in (s.strip() for s in args.sizes.split(",")):
+                for models in (int(m) for m in args.models.split(",")):
+                    workdir = os.path.join(tmp, f"{models}x{size}")
+                    print(f"pipeline: {models} modèles ({size})…", file=sys.stderr)
+                    result = bench_pipeline(workdir, models, size, args.pathological, args.workers, args.seed)
+                    scores_file = result.pop("scores_file")
+                    report["pipeline"][f"{models}x{size}"] = result
+        if "criteria" not in skip:
+            print("criteria…", file=sys.stderr)
+            report["criteria"] = bench_criteria(args.repeat)
+        if "api" not in skip:
+            print("api…", file=sys.stderr)
+            report["api"] = bench_api(scores_file or evaluate_models.OUT_FILE, args.requests, args.concurrency)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["vs_baseline"] = compare_reports(json.load(f), report)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Rapport écrit dans {args.out}", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
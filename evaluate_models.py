@@ -4,10 +4,23 @@ import os
 import json
 import ast
 import logging
-from typing import Any, Dict
+import contextlib
+import argparse
+import functools
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from prompts import PROMPT_KEYS
+from scorers import CRITERIA, uses_tests
+from score_cache import CACHE_DIR, DEFAULT_MAX_ENTRIES, ScoreCache, cell_key
+from sandbox import SandboxError, SandboxLimits, SandboxPool
+from netstub import stub_network
+from results_log import LOG_FILE, ResultsLog
+from run_history import HISTORY_FILE, RunHistory
+from response_loader import iter_responses, list_response_models
+from sampling import Samples, summarize_samples
+from instrumentation import PROFILERS, StageSummary, StageTimes, merge_stages, profiling, recording, stage
 from scoring import (
+    compile_snippet,
     run_tests_for,
     score_from_tests,
     score_code,
@@ -18,94 +31,610 @@ RESP_DIR = os.path.join(os.path.dirname(__file__), "responses")
 OUT_FILE = os.path.join(os.path.dirname(__file__), "scores.json")
 
 
-def load_responses(model_name: str) -> Dict[str, str]:
+def load_responses(model_name: str, prompts: Optional[Iterable[str]] = None) -> Dict[str, Samples]:
     """
-    Charge le JSON de réponses générées par le modèle.
+    Charge les réponses générées par le modèle (<modèle>.json ou .jsonl),
+    lues au fil de l'eau ; avec `prompts`, seuls ces snippets sont décodés.
+    Une valeur est un snippet ou une liste d'échantillons ; en JSONL, un
+    prompt présent sur plusieurs lignes donne une liste d'échantillons.
     """
-    path = os.path.join(RESP_DIR, f"{model_name}.json")
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    responses: Dict[str, Samples] = {}
+    for key, code in iter_responses(RESP_DIR, model_name, prompts):
+        if key not in responses:
+            responses[key] = code
+            continue
+        previous = responses[key]
+        responses[key] = (previous if isinstance(previous, list) else [previous]) + (
+            code if isinstance(code, list) else [code]
+        )
+    return responses
 
 
-def evaluate_model(model_name: str) -> Dict[str, Dict[str, Any]]:
+Criteria = Optional[Tuple[str, ...]]
+
+
+def overall_of(breakdown: Dict[str, Any]) -> float:
     """
-    Pour chaque prompt, compile et score le code généré par `model_name`.
+    Moyenne des critères numériques (complexity, dict, et les None sont ignorés).
+    """
+    all_scores = [v for v in breakdown.values() if isinstance(v, (int, float))]
+    return round(sum(all_scores) / len(all_scores), 1) if all_scores else 0.0
+
+
+def evaluate_cell(key: str, code_str: Optional[str], criteria: Criteria = None) -> Dict[str, Any]:
+    """
+    Compile et score le code généré pour un seul prompt.
     Renvoie un dict {
-      prompt_key: {
-        present: bool,
-        error: str|null,
-        test_counts: { passed, total },
-        overall_score: float,
-        breakdown: { criterion: score, ... }
-      }
+      present: bool,
+      error: str|null,
+      test_counts: { passed, total },
+      overall_score: float,
+      breakdown: { criterion: score, ... },
+      benchmark: { timings: [{ size, median, p95, number, best }, ...] }  (si mesuré)
+    }
+    Chaque cellule (modèle, prompt) est indépendante : cette fonction est
+    exécutée telle quelle dans les processus du pool. Le snippet est exécuté,
+    testé et chronométré sur le réseau virtuel de netstub.py (réponses
+    canned, aucune connexion sortante).
+    Avec `criteria`, seuls ces critères (et leurs dépendances) sont calculés
+    et le breakdown ne contient qu'eux ; si aucun n'exécute les TEST_CASES,
+    les tests ne sont pas lancés : `test_counts` garde sa valeur par défaut
+    et l'entrée porte `tests_skipped: true` (voir merge_criteria).
+    """
+    with stub_network():
+        return _evaluate_cell(key, code_str, criteria)
+
+
+def _evaluate_cell(key: str, code_str: Optional[str], criteria: Criteria = None) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {
+        "present": bool(code_str),
+        "error": None,
+        "test_counts": {"passed": 0, "total": 0},
+        "overall_score": 0.0,
+        "breakdown": {}
     }
+
+    if not code_str:
+        entry["error"] = "missing code"
+        return entry
+
+    # --- 1) Compilation unique & extraction de la fonction ----------
+    # parse + compile + exec une seule fois ; l'artefact est partagé par
+    # les tests et par tous les critères de score_code
+    with stage("compile"):
+        snippet = compile_snippet(key, code_str)
+    if snippet.error is not None:
+        entry["error"] = f"compile error: {snippet.error!r}"
+        return entry
+
+    if snippet.func is None:
+        entry["error"] = "function not found"
+        return entry
+
+    # --- 2) Exécution des tests unitaires de base -------------------
+    # le résultat est mémoïsé sur l'artefact et réutilisé par score_code
+    test_return = None
+    if uses_tests(criteria):
+        with stage("tests"):
+            test_return = run_tests_for(key, snippet)
+        entry["test_counts"] = {"passed": test_return[0], "total": test_return[1]}
+    else:
+        # critères statiques seuls : test_counts non calculés, merge_criteria
+        # reprend ceux de l'entrée précédente s'il y en a une
+        entry["tests_skipped"] = True
+
+    # --- 3) Scoring complet ------------------------------------------
+    # score_code renvoie toutes les métriques (dict criterion → score)
+    scores = score_code(key, snippet, test_return=test_return, criteria=criteria)
+
+    entry["overall_score"] = overall_of(scores)
+    entry["breakdown"] = scores
+    if snippet.benchmark is not None:
+        entry["benchmark"] = snippet.benchmark.as_dict()
+    if snippet.footprint is not None:
+        entry["memory"] = snippet.footprint.as_dict()
+    if snippet.budget_limited:
+        # dépend de la charge de la machine : ScoreCache.put ne l'écrit pas
+        entry["budget_limited"] = sorted(snippet.budget_limited)
+
+    return entry
+
+
+def _evaluate_cell_task(
+    cell: Tuple[str, str, Optional[Samples]],
+    profile_dir: Optional[str] = None,
+    profiler: str = "cprofile",
+    criteria: Criteria = None,
+) -> Tuple[Any, StageTimes]:
+    """
+    Point d'entrée picklable pour le pool : cell = (modèle, prompt, code).
+    Renvoie (entrée, mesures des étapes de l'évaluateur : temps mural, CPU,
+    pic mémoire) ; les mesures ne font pas partie de l'entrée (ni du cache,
+    ni de scores.json). Avec `profile_dir`, la cellule est aussi profilée
+    dans <profile_dir>/<modèle>.<prompt>.prof (ou .html pour pyinstrument).
+    Les échantillons d'une cellule multi-échantillons sont des tâches
+    distinctes (voir iter_cell_results), chacune avec son propre timeout.
+    """
+    model, key, code_str = cell
+    with recording() as recorder:
+        with contextlib.ExitStack() as stack:
+            if profile_dir is not None:
+                stack.enter_context(profiling(os.path.join(profile_dir, f"{model}.{key}"), profiler))
+            with recorder.stage("cell"):
+                entry = evaluate_cell(key, code_str, criteria)
+    return entry, recorder.as_dict()
+
+
+def sandbox_error_entry(code_str: Optional[str], error: SandboxError) -> Dict[str, Any]:
+    """
+    Entrée d'une cellule dont l'exécution a été interrompue par le sandbox
+    (timeout, mémoire, CPU, worker mort) : `error` vaut « <type>: <détail> ».
+    """
+    return {
+        "present": bool(code_str),
+        "error": str(error),
+        "test_counts": {"passed": 0, "total": 0},
+        "overall_score": 0.0,
+        "breakdown": {}
+    }
+
+
+def evaluate_model(model_name: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Pour chaque prompt, compile et score le code généré par `model_name`.
+    Renvoie un dict { prompt_key: entry } (voir evaluate_cell).
     """
     responses = load_responses(model_name)
-    report: Dict[str, Dict[str, Any]] = {}
-
-    for key in PROMPT_KEYS:
-        code_str = responses.get(key)
-        entry: Dict[str, Any] = {
-            "present": bool(code_str),
-            "error": None,
-            "test_counts": {"passed": 0, "total": 0},
-            "overall_score": 0.0,
-            "breakdown": {}
-        }
-
-        if not code_str:
-            entry["error"] = "missing code"
-            report[key] = entry
+    return {key: evaluate_cell(key, responses.get(key)) for key in PROMPT_KEYS}
+
+
+def list_models(selected: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Noms des modèles présents dans RESP_DIR, triés pour un ordre déterministe.
+    Avec `selected`, restreint à ces modèles (KeyError si l'un est absent).
+    """
+    models = list_response_models(RESP_DIR)
+    if selected is None:
+        return models
+    wanted = set(selected)
+    missing = sorted(wanted - set(models))
+    if missing:
+        raise KeyError(f"modèle(s) absent(s) de {RESP_DIR} : {', '.join(missing)}")
+    return [m for m in models if m in wanted]
+
+
+Cell = Tuple[str, str, Optional[Samples]]
+
+
+def collect_cells(models: Iterable[str], prompts: Optional[Iterable[str]] = None) -> List[Cell]:
+    """
+    Liste ordonnée des cellules (modèle, prompt, code) à scorer, restreinte
+    aux prompts de `prompts` s'il est fourni (ordre de PROMPT_KEYS conservé).
+    """
+    wanted = set(PROMPT_KEYS if prompts is None else prompts)
+    keys = [k for k in PROMPT_KEYS if k in wanted]
+    cells: List[Cell] = []
+    for model in models:
+        logging.info(f"Evaluating model {model}...")
+        responses = load_responses(model, keys)
+        cells.extend((model, key, responses.get(key)) for key in keys)
+    return cells
+
+
+def read_report(out_file: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Rapport existant ({modèle: {prompt: entrée}}), vide s'il est absent ou illisible.
+    """
+    try:
+        with open(out_file, encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return report if isinstance(report, dict) else {}
+
+
+def merged_order(previous: Dict[str, Dict[str, Any]], cells: List[Cell]) -> List[Tuple[str, str]]:
+    """
+    Ordre des cellules d'un rapport fusionné : modèles triés, prompts dans
+    l'ordre de PROMPT_KEYS puis prompts inconnus dans leur ordre d'origine.
+    """
+    keys: Dict[str, Dict[str, None]] = {m: dict.fromkeys(p) for m, p in previous.items()}
+    for model, key, _ in cells:
+        keys.setdefault(model, {})[key] = None
+    rank = {k: i for i, k in enumerate(PROMPT_KEYS)}
+    return [
+        (model, key)
+        for model in sorted(keys)
+        for key in sorted(keys[model], key=lambda k: rank.get(k, len(rank)))
+    ]
+
+
+def cell_digest(key: str, code_str: Optional[Samples], criteria: Criteria = None) -> Optional[str]:
+    if isinstance(code_str, list):
+        return cell_key(key, json.dumps(code_str, ensure_ascii=False), criteria) if code_str else None
+    return cell_key(key, code_str, criteria) if code_str else None
+
+
+def merge_criteria(previous: Optional[Dict[str, Any]], entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Entrée d'un run restreint par --criteria : les critères rescorés remplacent
+    ceux de l'entrée précédente (scores.json), les autres sont conservés et
+    overall_score est recalculé. Les clés absentes de la nouvelle entrée
+    (benchmark, memory) sont reprises de la précédente, de même que ses
+    test_counts si les tests n'ont pas été relancés (`tests_skipped`). Une
+    entrée en erreur remplace la précédente telle quelle.
+    """
+    if not previous or entry.get("error") is not None:
+        return entry
+    merged = {**previous, **entry}
+    if entry.get("tests_skipped") and "test_counts" in previous:
+        merged["test_counts"] = previous["test_counts"]
+        merged.pop("tests_skipped")
+    merged["breakdown"] = {**(previous.get("breakdown") or {}), **entry["breakdown"]}
+    merged["overall_score"] = overall_of(merged["breakdown"])
+    return merged
+
+
+class _Batch:
+    """
+    Échantillons d'une cellule multi-échantillons : empreinte de chacun,
+    entrées déjà connues (cache ou doublon) et empreintes restant à scorer.
+    Des échantillons identiques ne sont scorés qu'une fois ; chaque
+    échantillon à scorer est une tâche du pool à part entière.
+    """
+
+    def __init__(self, key: str, samples: List[Optional[str]], cache: Optional[ScoreCache], criteria: Criteria = None):
+        self.digests = [cell_digest(key, sample, criteria) for sample in samples]
+        self.resolved: Dict[Optional[str], Dict[str, Any]] = {None: evaluate_cell(key, None)}
+        self.missing: Dict[str, str] = {}
+        self.hits: Set[str] = set()
+        for digest, sample in zip(self.digests, samples):
+            if digest in self.resolved or digest in self.missing:
+                continue
+            entry = cache.get(digest) if cache is not None else None
+            if entry is not None:
+                self.resolved[digest] = entry
+                self.hits.add(digest)
+            else:
+                self.missing[digest] = sample
+
+        self.stages: Optional[StageTimes] = None
+
+    def resolve(self, digest: str, entry: Dict[str, Any], cache: Optional[ScoreCache],
+                stages: Optional[StageTimes] = None) -> None:
+        self.resolved[digest] = entry
+        if cache is not None:
+            cache.put(digest, entry)
+        if stages is not None:
+            self.stages = merge_stages(self.stages, stages)
+
+    @property
+    def done(self) -> bool:
+        return all(d in self.resolved for d in self.missing)
+
+    def summary(self) -> Dict[str, Any]:
+        distinct = len({d for d in self.digests if d is not None})
+        return summarize_samples([self.resolved[d] for d in self.digests], distinct)
+
+    def best_from_cache(self, summary: Dict[str, Any]) -> bool:
+        # l'entrée retenue (et son benchmark) vient-elle du cache ?
+        return self.digests[summary["samples"]["best"]] in self.hits
+
+
+def iter_cell_results(
+    cells: List[Cell],
+    workers: int = 1,
+    cache: Optional[ScoreCache] = None,
+    limits: Optional[SandboxLimits] = None,
+    pool: Optional[SandboxPool] = None,
+    stages: Optional[Dict[int, StageTimes]] = None,
+    profile_dir: Optional[str] = None,
+    profiler: str = "cprofile",
+    criteria: Criteria = None,
+    cached: Optional[Set[int]] = None,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Produit (index dans `cells`, entrée) au fur et à mesure que les cellules
+    sont scorées. Les cellules sont exécutées dans un pool de `workers`
+    processus sandboxés (timeout, plafonds mémoire/CPU), ou dans `pool` s'il
+    est fourni (pool partagé, non fermé ici) ; avec un cache, les cellules
+    inchangées sont servies depuis le disque et seules les autres sont
+    (re)scorées. Si `stages` est fourni, il reçoit {index: mesures des étapes}
+    pour chaque cellule réellement scorée, avant que son entrée soit produite ;
+    `cached` reçoit de même l'index des cellules servies par le cache.
+    `profile_dir` active le profilage de chaque cellule scorée.
+    Une cellule dont le code est une liste d'échantillons envoie chaque
+    échantillon (doublons et échantillons en cache exclus) comme une tâche
+    distinte, avec son propre timeout ; un échantillon en échec devient une
+    entrée d'erreur et les autres sont conservés. La cellule est résumée par
+    sampling.summarize_samples (pass@k, moyenne, variance) une fois tous ses
+    échantillons connus.
+    `criteria` restreint le scoring à ces critères (voir evaluate_cell) ;
+    les entrées partielles ont leur propre clé de cache.
+    """
+    keys: List[Optional[str]] = [None] * len(cells)
+    batches: Dict[int, _Batch] = {}
+    # une tâche par cellule, ou par échantillon à scorer (tâche → cellule, empreinte)
+    todo: List[int] = []
+    samples: Dict[int, str] = {}
+    tasks: List[Cell] = []
+    for i, (model, key, code_str) in enumerate(cells):
+        if isinstance(code_str, list) and code_str:
+            batch = batches[i] = _Batch(key, code_str, cache, criteria)
+            if not batch.missing:
+                entry = batch.summary()
+                if cached is not None and batch.best_from_cache(entry):
+                    cached.add(i)
+                yield i, entry
+                continue
+            for digest, sample in batch.missing.items():
+                samples[len(tasks)] = digest
+                todo.append(i)
+                tasks.append((model, key, sample))
             continue
+        if cache is not None and code_str:
+            keys[i] = cell_digest(key, code_str, criteria)
+            entry = cache.get(keys[i])
+            if entry is not None:
+                if cached is not None:
+                    cached.add(i)
+                yield i, entry
+                continue
+        todo.append(i)
+        tasks.append(cells[i])
 
-        # --- 1) Tentative de compilation & extraction de la fonction ----
-        namespace: Dict[str, Any] = {}
+    if todo:
+        owned = pool is None
+        if owned:
+            pool = SandboxPool(min(workers, len(todo)), limits)
         try:
-            exec(code_str, {}, namespace)
-        except Exception as e:
-            entry["error"] = f"compile error: {e!r}"
-            report[key] = entry
-            continue
+            if profile_dir is not None:
+                os.makedirs(profile_dir, exist_ok=True)
+            task = functools.partial(_evaluate_cell_task, profile_dir=profile_dir, profiler=profiler, criteria=criteria)
+            for j, result in pool.imap_unordered(task, tasks):
+                i = todo[j]
+                failed = isinstance(result, SandboxError)
+                if failed:
+                    # échec d'exécution (potentiellement transitoire) : jamais mis en cache
+                    logging.warning(f"{cells[i][0]}.{cells[i][1]}: {result}")
+                    entry, cell_stages = sandbox_error_entry(tasks[j][2], result), None
+                else:
+                    entry, cell_stages = result
+                if j in samples:
+                    batch = batches[i]
+                    batch.resolve(samples[j], entry, None if failed else cache, cell_stages)
+                    if batch.done:
+                        if stages is not None and batch.stages is not None:
+                            stages[i] = batch.stages
+                        entry = batch.summary()
+                        if cached is not None and batch.best_from_cache(entry):
+                            cached.add(i)
+                        yield i, entry
+                    continue
+                if not failed:
+                    if stages is not None:
+                        stages[i] = cell_stages
+                    if cache is not None and keys[i] is not None:
+                        cache.put(keys[i], entry)
+                yield i, entry
+        finally:
+            if owned:
+                pool.close()
 
-        func = namespace.get(key)
-        if not callable(func):
-            entry["error"] = "function not found"
-            report[key] = entry
-            continue
+    if cache is not None:
+        logging.info(f"Score cache: {cache.hits} hit(s), {len(set(todo))} cellule(s) scorée(s)")
+        cache.prune()
 
-        # --- 2) Exécution des tests unitaires de base -------------------
-        passed, total = run_tests_for(key, func)
-        entry["test_counts"] = {"passed": passed, "total": total}
 
-        # --- 3) Scoring complet ------------------------------------------
-        # score_code renvoie toutes les métriques (dict criterion → score)
-        scores = score_code(key, code_str, func=func)
+def evaluate_all(
+    models: Iterable[str],
+    workers: int = 1,
+    cache: Optional[ScoreCache] = None,
+    limits: Optional[SandboxLimits] = None,
+    prompts: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Score toutes les cellules (modèle × prompt) et assemble le rapport complet
+    en mémoire, dans l'ordre (modèles, PROMPT_KEYS) quel que soit l'ordre de
+    terminaison. Pour les longs runs, main() passe plutôt par le journal NDJSON.
+    """
+    cells = collect_cells(models, prompts)
+    entries: List[Optional[Dict[str, Any]]] = [None] * len(cells)
+    for i, entry in iter_cell_results(cells, workers, cache, limits):
+        entries[i] = entry
+
+    full_report: Dict[str, Any] = {}
+    for (model, key, _), entry in zip(cells, entries):
+        full_report.setdefault(model, {})[key] = entry
+    return full_report
+
 
-        # calcul de la moyenne globale
-        all_scores = [v for v in scores.values() if isinstance(v, (int, float))]
-        overall = round(sum(all_scores) / len(all_scores), 1) if all_scores else 0.0
+def run_streaming(
+    models: Iterable[str],
+    log: ResultsLog,
+    out_file: str,
+    workers: int = 1,
+    cache: Optional[ScoreCache] = None,
+    limits: Optional[SandboxLimits] = None,
+    resume: bool = False,
+    history: Optional[RunHistory] = None,
+    summary: Optional[StageSummary] = None,
+    profile_dir: Optional[str] = None,
+    profiler: str = "cprofile",
+    prompts: Optional[Iterable[str]] = None,
+    merge: bool = False,
+    criteria: Criteria = None,
+) -> int:
+    """
+    Score les cellules en ajoutant chacune au journal NDJSON dès qu'elle est
+    terminée, puis consolide atomiquement le journal dans `out_file`.
+    Avec resume=True, les cellules déjà journalisées pour le même contenu ne
+    sont pas rescorées. Avec `history`, chaque cellule scorée pendant ce run
+    (scores, benchmark, durées des étapes) est aussi ajoutée à l'historique ;
+    `summary` agrège les mesures des étapes pour le tableau de fin de run.
+    Avec merge=True (run restreint par --model / --prompt), les cellules de
+    `out_file` hors de la sélection sont conservées telles quelles.
+    Avec `criteria` (--criteria), seuls ces critères sont rescorés et fusionnés
+    dans les entrées de `out_file` (voir merge_criteria).
+    Renvoie le nombre de cellules scorées pendant ce run.
+    """
+    cells = collect_cells(models, prompts)
+    previous = read_report(out_file) if merge or criteria is not None else {}
+    if not resume:
+        log.reset()
+    done = log.completed() if resume else {}
+    todo = [c for c in cells if (c[0], c[1]) not in done or done[(c[0], c[1])] != cell_digest(c[1], c[2], criteria)]
+    if resume:
+        logging.info(f"Reprise : {len(cells) - len(todo)} cellule(s) déjà journalisée(s)")
 
-        entry["overall_score"] = overall
-        entry["breakdown"] = scores
+    run_id = history.start_run() if history is not None else None
+    stages: Dict[int, StageTimes] = {}
+    cached: Set[int] = set()
+    results = iter_cell_results(
+        todo, workers, cache, limits, stages=stages, profile_dir=profile_dir, profiler=profiler,
+        criteria=criteria, cached=cached,
+    )
+    for i, entry in results:
+        model, key, code_str = todo[i]
+        digest = cell_digest(key, code_str, criteria)
+        if criteria is not None:
+            entry = merge_criteria(previous.get(model, {}).get(key), entry)
+        log.append(model, key, digest, entry)
+        cell_stages = stages.pop(i, None)
+        if summary is not None:
+            summary.add(cell_stages)
+        if history is not None:
+            history.record_cell(run_id, model, key, digest, entry, cell_stages, cached=i in cached)
 
-        report[key] = entry
+    order = merged_order(previous, cells) if merge or criteria is not None else [(model, key) for model, key, _ in cells]
+    log.rollup(out_file, order, previous)
+    # NumPy n'est chargé qu'ici, pas dans les workers qui importent ce module
+    from score_matrix import MATRIX_FILE, ScoreMatrix, np
+    if np is not None:
+        # matrice dense modèle × prompt × critère, à côté de scores.json
+        matrix_file = os.path.join(os.path.dirname(os.path.abspath(out_file)), os.path.basename(MATRIX_FILE))
+        ScoreMatrix.from_cells(log.entries(order, previous)).save(matrix_file)
+    if history is not None:
+        history.finish_run(run_id)
+    return len(todo)
 
-    return report
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Score responses/*.json → scores.json")
+    parser.add_argument(
+        "--model", action="append", default=None,
+        help="modèle(s) à scorer (répétable ou séparé par des virgules) ; "
+             "les autres cellules de scores.json sont conservées",
+    )
+    parser.add_argument(
+        "--prompt", action="append", default=None,
+        help="prompt(s) à scorer (répétable ou séparé par des virgules)",
+    )
+    parser.add_argument(
+        "--criteria", action="append", default=None,
+        help="critère(s) à rescorer (répétable ou séparé par des virgules) ; "
+             "les autres critères de scores.json sont conservés",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="nombre de processus de scoring (défaut : nombre de cœurs)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="rescore toutes les cellules sans lire ni écrire le cache disque",
+    )
+    parser.add_argument(
+        "--cache-dir", default=CACHE_DIR,
+        help="répertoire du cache de scores (défaut : .score_cache/)",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=DEFAULT_MAX_ENTRIES,
+        help="nombre maximal d'entrées conservées dans le cache (LRU)",
+    )
+    parser.add_argument(
+        "--log", default=LOG_FILE,
+        help="journal NDJSON des cellules scorées (défaut : scores.ndjson)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="reprend un run interrompu à partir du journal NDJSON",
+    )
+    parser.add_argument(
+        "--history", default=HISTORY_FILE,
+        help="base SQLite de l'historique des runs (défaut : runs.sqlite)",
+    )
+    parser.add_argument(
+        "--no-history", action="store_true",
+        help="n'enregistre pas ce run dans l'historique",
+    )
+    parser.add_argument(
+        "--profile", metavar="DIR", default=None,
+        help="profile chaque cellule scorée et écrit un fichier par cellule dans DIR",
+    )
+    parser.add_argument(
+        "--profiler", choices=PROFILERS, default="cprofile",
+        help="profileur utilisé avec --profile (pyinstrument doit être installé)",
+    )
+    defaults = SandboxLimits()
+    parser.add_argument(
+        "--timeout", type=float, default=defaults.timeout,
+        help="timeout d'horloge murale par cellule, en secondes",
+    )
+    parser.add_argument(
+        "--memory-mb", type=int, default=defaults.memory_mb,
+        help="plafond mémoire (RLIMIT_AS) d'un worker, en Mo",
+    )
+    parser.add_argument(
+        "--cpu-seconds", type=int, default=defaults.cpu_seconds,
+        help="plafond de temps CPU (RLIMIT_CPU) par cellule",
+    )
+    parser.add_argument(
+        "--max-tasks-per-worker", type=int, default=defaults.max_tasks,
+        help="nombre de cellules avant recyclage d'un worker",
+    )
+    args = parser.parse_args(argv)
+    for name in ("model", "prompt", "criteria"):
+        values = getattr(args, name)
+        if values is not None:
+            setattr(args, name, [v.strip() for value in values for v in value.split(",") if v.strip()])
+    unknown = sorted(set(args.prompt or ()) - set(PROMPT_KEYS))
+    if unknown:
+        parser.error(f"prompt(s) inconnu(s) : {', '.join(unknown)}")
+    unknown = sorted(set(args.criteria or ()) - set(CRITERIA))
+    if unknown:
+        parser.error(f"critère(s) inconnu(s) : {', '.join(unknown)} (disponibles : {', '.join(CRITERIA)})")
+    if args.criteria is not None:
+        args.criteria = tuple(c for c in CRITERIA if c in args.criteria)
+    return args
 
-def main():
-    full_report: Dict[str, Any] = {}
-    for fname in os.listdir(RESP_DIR):
-        if not fname.endswith(".json"):
-            continue
-        model = fname[:-5]
-        logging.info(f"Evaluating model {model}...")
-        full_report[model] = evaluate_model(model)
 
-    # Écriture JSON indenté, UTF-8
-    with open(OUT_FILE, "w", encoding="utf-8") as out:
-        json.dump(full_report, out, indent=2, ensure_ascii=False)
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    cache = None if args.no_cache else ScoreCache(args.cache_dir, args.cache_size)
+    limits = SandboxLimits(
+        timeout=args.timeout,
+        memory_mb=args.memory_mb,
+        cpu_seconds=args.cpu_seconds,
+        max_tasks=args.max_tasks_per_worker,
+    )
+    try:
+        models = list_models(args.model)
+    except KeyError as e:
+        raise SystemExit(e.args[0])
+    history = None if args.no_history else RunHistory(args.history)
+    summary = StageSummary()
+    # chaque cellule est journalisée dès qu'elle est scorée, puis le journal
+    # est consolidé atomiquement en JSON indenté, UTF-8
+    run_streaming(
+        models, ResultsLog(args.log), OUT_FILE,
+        workers=max(1, args.workers), cache=cache, limits=limits, resume=args.resume,
+        history=history, summary=summary, profile_dir=args.profile, profiler=args.profiler,
+        prompts=args.prompt, merge=args.model is not None or args.prompt is not None,
+        criteria=args.criteria,
+    )
 
+    if summary.samples:
+        print(summary.table())
     print(f"✅ Scores written to {OUT_FILE}")
 
 
@@ -0,0 +1,143 @@
+# backend/features.py
+
+import io
+import ast
+import tokenize
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+# Appels considérés comme dangereux : par nom (eval(...)) ou par attribut (os.system(...))
+DANGEROUS_NAMES = frozenset({"eval", "exec"})
+DANGEROUS_ATTRS = frozenset({"Popen", "system"})
+
+# Instructions qui ouvrent un bloc (profondeur d'imbrication)
+_BLOCKS = (
+    ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.If, ast.For, ast.AsyncFor,
+    ast.While, ast.With, ast.AsyncWith, ast.Try, ast.ExceptHandler,
+)
+# Points de décision de la complexité cyclomatique (McCabe)
+_DECISIONS = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.Assert)
+if hasattr(ast, "match_case"):
+    _DECISIONS += (ast.match_case,)
+if hasattr(ast, "TryStar"):
+    _BLOCKS += (ast.TryStar,)
+
+
+@dataclass
+class SnippetFeatures:
+    """
+    Vecteur de caractéristiques statiques d'un snippet, calculé en un seul
+    parcours de l'AST et un seul passage tokenize. Tous les critères statiques
+    (security, syntax_diversity, logical_originality, comment_richness)
+    en dérivent.
+    """
+    parsed: bool = False
+    node_kinds: Counter = field(default_factory=Counter)
+    call_targets: List[str] = field(default_factory=list)
+    call_func_kinds: Set[str] = field(default_factory=set)
+    dangerous_calls: List[str] = field(default_factory=list)
+    total_lines: int = 0
+    comment_lines: int = 0
+    docstring_lines: int = 0
+    max_depth: int = 0
+    complexity: int = 1
+
+    @property
+    def distinct_kinds(self) -> int:
+        return len(self.node_kinds)
+
+
+def _dotted(node: ast.AST) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted(node.value)}.{node.attr}"
+    return f"<{type(node).__name__}>"
+
+
+def _docstring_node(node: ast.AST) -> Optional[ast.AST]:
+    body = getattr(node, "body", None)
+    if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and body:
+        first = body[0]
+        if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) \
+                and isinstance(first.value.value, str):
+            return first
+    return None
+
+
+class _FeatureVisitor:
+    def __init__(self, features: SnippetFeatures):
+        self.f = features
+        self.doc_lines: Set[int] = set()
+
+    def visit(self, node: ast.AST, depth: int = 0) -> None:
+        f = self.f
+        f.node_kinds[type(node).__name__] += 1
+        if isinstance(node, _BLOCKS):
+            depth += 1
+            f.max_depth = max(f.max_depth, depth)
+        if isinstance(node, _DECISIONS):
+            f.complexity += 1
+        elif isinstance(node, ast.BoolOp):
+            f.complexity += len(node.values) - 1
+        elif isinstance(node, ast.comprehension):
+            f.complexity += 1 + len(node.ifs)
+        elif isinstance(node, ast.Call):
+            f.call_func_kinds.add(type(node.func).__name__)
+            target = _dotted(node.func)
+            f.call_targets.append(target)
+            if getattr(node.func, "id", "") in DANGEROUS_NAMES \
+                    or getattr(node.func, "attr", "") in DANGEROUS_ATTRS:
+                f.dangerous_calls.append(target)
+        doc = _docstring_node(node)
+        if doc is not None:
+            self.doc_lines.update(range(doc.lineno, doc.end_lineno + 1))
+        for child in ast.iter_child_nodes(node):
+            self.visit(child, depth)
+
+
+def _comment_lines(source: str) -> Set[int]:
+    """
+    Lignes dont le premier token est un commentaire (passage tokenize unique) ;
+    repli ligne à ligne si le source ne se tokenise pas.
+    """
+    lines: Set[int] = set()
+    first_on_line: Set[int] = set()
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+            row = tok.start[0]
+            if tok.type in (tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT,
+                            tokenize.ENDMARKER):
+                continue
+            if row not in first_on_line:
+                first_on_line.add(row)
+                if tok.type == tokenize.COMMENT:
+                    lines.add(row)
+    except (tokenize.TokenError, SyntaxError):
+        return {i for i, ln in enumerate(source.splitlines(), 1) if ln.strip().startswith("#")}
+    return lines
+
+
+def extract_features(source: str, tree: Optional[ast.AST] = None) -> SnippetFeatures:
+    """
+    Construit le SnippetFeatures d'un snippet. `tree` évite de re-parser le
+    source ; si le source n'est pas parsable, seuls les compteurs de lignes
+    sont renseignés et `parsed` vaut False.
+    """
+    features = SnippetFeatures(total_lines=len(source.splitlines()))
+    if tree is None:
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            tree = None
+    doc_lines: Set[int] = set()
+    if tree is not None:
+        features.parsed = True
+        visitor = _FeatureVisitor(features)
+        visitor.visit(tree)
+        doc_lines = visitor.doc_lines
+    comments = _comment_lines(source) - doc_lines
+    features.comment_lines = len(comments)
+    features.docstring_lines = len(doc_lines)
+    return features
@@ -0,0 +1,136 @@
+# backend/footprint.py
+
+import sys
+import math
+import statistics
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from benchmark import benchmark_inputs
+from generators import fresh_args
+
+# Mesures répétées par entrée (le pic retenu est la médiane)
+REPEAT = 3
+# En dessous de ce pic (octets), l'empreinte est considérée comme nulle
+FLAT_PEAK = 4 * 1024
+# Entrées mises à l'échelle : octets alloués par élément, ≤1 → 5.0, ≥256 → 1.0
+BEST_BYTES_PER_ELEMENT = 1.0
+WORST_BYTES_PER_ELEMENT = 256.0
+# Cas réels seulement : pic absolu, ≤FLAT_PEAK → 5.0, ≥1 Mio → 1.0
+WORST_PEAK = 1024 * 1024
+
+
+@dataclass
+class Allocation:
+    """
+    Empreinte d'un appel : pic d'allocation au-dessus de l'état avant l'appel
+    (octets, tracemalloc) et blocs mémoire encore alloués après l'appel
+    (résultat compris ; CPython n'expose pas de compteur cumulé
+    d'allocations). `size` vaut None pour un cas réel de TEST_CASES.
+    """
+    size: Optional[int]
+    peak_bytes: int
+    retained_blocks: int
+
+
+@dataclass
+class Footprint:
+    """
+    Résultat du profil mémoire d'une fonction : cas réels + entrées mises à l'échelle.
+    """
+    prompt_key: str
+    allocations: List[Allocation] = field(default_factory=list)
+
+    @property
+    def scaled(self) -> List[Allocation]:
+        return sorted((a for a in self.allocations if a.size is not None), key=lambda a: a.size)
+
+    @property
+    def bytes_per_element(self) -> Optional[float]:
+        """
+        Pic par élément sur la plus grande entrée mise à l'échelle.
+        """
+        scaled = self.scaled
+        return scaled[-1].peak_bytes / scaled[-1].size if scaled else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "allocations": [asdict(a) for a in self.allocations],
+            "bytes_per_element": self.bytes_per_element,
+        }
+
+
+def measure_call(func: Any, args: Tuple[Any, ...], size: Optional[int] = None) -> Allocation:
+    """
+    Appelle func(*args) REPEAT fois sous tracemalloc et renvoie le pic médian.
+    Chaque appel reçoit une copie neuve des arguments modifiables, allouée
+    avant la mesure : seul ce que la fonction alloue elle-même est compté,
+    sur des données qu'un appel précédent n'a pas déjà modifiées.
+    Les exceptions remontent à l'appelant.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    peaks: List[int] = []
+    blocks: List[int] = []
+    try:
+        for _ in range(REPEAT):
+            call_args = fresh_args(args)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            blocks_before = sys.getallocatedblocks()
+            result = func(*call_args)
+            peaks.append(max(0, tracemalloc.get_traced_memory()[1] - before))
+            blocks.append(max(0, sys.getallocatedblocks() - blocks_before))
+            del result, call_args
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return Allocation(size, int(statistics.median(peaks)), int(statistics.median(blocks)))
+
+
+def run_footprint(prompt_key: str, func: Any, sizes: Optional[Iterable[int]] = None) -> Footprint:
+    """
+    Profil mémoire de func sur les entrées du benchmark (benchmark_inputs).
+    `sizes` restreint les entrées mises à l'échelle (typiquement aux tailles
+    que le benchmark a pu chronométrer, pour ne pas relancer une fonction
+    quadratique sur 100 000 éléments). Une entrée qui lève est ignorée.
+    """
+    allowed = set(sizes) if sizes is not None else None
+    footprint = Footprint(prompt_key)
+    for size, args in benchmark_inputs(prompt_key):
+        if size is not None and allowed is not None and size not in allowed:
+            continue
+        try:
+            footprint.allocations.append(measure_call(func, args, size))
+        except Exception:
+            continue
+    return footprint
+
+
+def _log_scale(value: float, best: float, worst: float) -> float:
+    if value <= best:
+        return 5.0
+    if value >= worst:
+        return 1.0
+    return round(5.0 - math.log(value / best) / math.log(worst / best) * 4.0, 1)
+
+
+def score_footprint(footprint: Footprint) -> float:
+    """
+    Score [1.0…5.0] : octets alloués par élément sur la plus grande entrée
+    mise à l'échelle (copie de liste ≈ 8 o/élément → 3.5, sorted(set(…))
+    ≈ 63 → 2.0), sinon pic absolu médian sur les cas réels. 0.0 si rien n'a
+    pu être mesuré.
+    """
+    scaled = footprint.scaled
+    if scaled:
+        largest = scaled[-1]
+        if largest.peak_bytes <= FLAT_PEAK:
+            return 5.0
+        return _log_scale(largest.peak_bytes / largest.size, BEST_BYTES_PER_ELEMENT, WORST_BYTES_PER_ELEMENT)
+    if footprint.allocations:
+        peak = statistics.median(a.peak_bytes for a in footprint.allocations)
+        return _log_scale(peak, FLAT_PEAK, WORST_PEAK)
+    return 0.0
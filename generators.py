@@ -0,0 +1,293 @@
+# backend/generators.py
+
+import math
+import time
+import random
+import string
+import functools
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Budget de temps (horloge murale) des propriétés d'un prompt : au-delà, les
+# familles restantes ne sont pas évaluées (code très lent ≠ code fragile).
+# Le nombre de cas par famille est fixe ; un run interrompu par ce budget
+# dépend de la charge de la machine et n'est donc jamais mis en cache
+# (voir PropertyRun.truncated et CompiledSnippet.budget_limited).
+PROPERTY_BUDGET = 2.0
+
+Args = Tuple[Any, ...]
+
+# --- 1) Oracles (implémentations de référence) -------------------------------
+# Un oracle lève l'exception attendue quand l'entrée doit être rejetée.
+
+def second_largest_oracle(numbers: List[float]) -> float:
+    distinct = sorted(set(numbers))
+    if len(distinct) < 2:
+        raise ValueError("fewer than 2 distinct numbers")
+    return distinct[-2]
+
+
+def extreme_numbers_oracle(numbers: List[float]) -> float:
+    return second_largest_oracle([x for x in numbers if math.isfinite(x)])
+
+
+def is_palindrome_oracle(text: str) -> bool:
+    cleaned = [c.lower() for c in text if c.isalnum()]
+    return cleaned == cleaned[::-1]
+
+
+def multilingual_palindrome_oracle(text: str) -> bool:
+    decomposed = unicodedata.normalize("NFD", text)
+    cleaned = [c.lower() for c in decomposed if c.isalnum() and not unicodedata.combining(c)]
+    return cleaned == cleaned[::-1]
+
+
+# --- 2) Générateurs d'entrées ---------------------------------------------------
+
+_PUNCT = " ,.;:!?'-"
+_ACCENTS = ("́", "̀", "̂", "̈")   # aigu, grave, circonflexe, tréma
+_LATIN = "abcdefghijklmnoprstuvz"
+_CYRILLIC = "абвгдежзиклмнопрстуф"
+_GREEK = "αβγδεζηθικλμνξοπρτυφ"   # sans sigma (forme finale ς à la minuscule)
+
+
+def _distinct_ints(rng: random.Random) -> Args:
+    return (rng.sample(range(-1000, 1000), rng.randint(2, 20)),)
+
+
+def _duplicates(rng: random.Random) -> Args:
+    return ([rng.randint(0, 5) for _ in range(rng.randint(2, 20))],)
+
+
+def _negatives(rng: random.Random) -> Args:
+    return ([rng.randint(-10 ** 6, -1) for _ in range(rng.randint(2, 20))],)
+
+
+def _floats(rng: random.Random) -> Args:
+    return ([rng.uniform(-1e6, 1e6) for _ in range(rng.randint(2, 20))],)
+
+
+def _degenerate(rng: random.Random) -> Args:
+    x = rng.randint(-100, 100)
+    return ([x] * rng.randint(0, 5),)
+
+
+def _large_ints(rng: random.Random) -> Args:
+    return ([rng.randint(-10 ** 9, 10 ** 9) for _ in range(10_000)],)
+
+
+def finite_float(rng: random.Random) -> float:
+    # flottant fini dans [-1e308, 1e308] (partagé avec benchmark.SCALED_INPUTS) ;
+    # uniform(-1e308, 1e308) déborde (b - a = inf) : on met à l'échelle [-1, 1]
+    return rng.uniform(-1.0, 1.0) * 1e308
+
+
+def _huge_magnitudes(rng: random.Random) -> Args:
+    return ([rng.choice((-1, 1)) * rng.uniform(1e300, 1e308) for _ in range(rng.randint(2, 10))],)
+
+
+def _with_non_finite(rng: random.Random) -> Args:
+    values = [finite_float(rng) for _ in range(rng.randint(2, 10))]
+    for _ in range(rng.randint(1, 4)):
+        values.insert(rng.randrange(len(values) + 1), rng.choice((math.nan, math.inf, -math.inf)))
+    return (values,)
+
+
+def _mostly_non_finite(rng: random.Random) -> Args:
+    values = [rng.choice((math.nan, math.inf, -math.inf)) for _ in range(rng.randint(0, 6))]
+    if rng.random() < 0.5:
+        values.append(rng.uniform(-1.0, 1.0))
+    rng.shuffle(values)
+    return (values,)
+
+
+def _large_floats(rng: random.Random) -> Args:
+    values = [finite_float(rng) for _ in range(10_000)]
+    values[rng.randrange(len(values))] = math.nan
+    return (values,)
+
+
+def _decorate(chars: List[str], rng: random.Random, accents: bool = False) -> str:
+    """
+    Ajoute majuscules, accents et ponctuation sans changer le texte nettoyé.
+    """
+    out = []
+    for c in chars:
+        if accents and c.isalpha() and rng.random() < 0.3:
+            c = unicodedata.normalize("NFC", c + rng.choice(_ACCENTS))
+        if rng.random() < 0.3:
+            c = c.upper()
+        out.append(c)
+        if rng.random() < 0.2:
+            out.append(rng.choice(_PUNCT))
+    return "".join(out)
+
+
+def _palindrome(rng: random.Random, alphabet: str, n: int, accents: bool = False) -> str:
+    half = [rng.choice(alphabet) for _ in range(n // 2)]
+    middle = [rng.choice(alphabet)] if n % 2 else []
+    return _decorate(half + middle + half[::-1], rng, accents)
+
+
+def _random_text(rng: random.Random, alphabet: str, accents: bool = False) -> str:
+    return _decorate([rng.choice(alphabet) for _ in range(rng.randint(2, 30))], rng, accents)
+
+
+_ASCII = string.ascii_lowercase + string.digits
+
+
+# --- 3) Familles de propriétés ------------------------------------------------
+
+@dataclass
+class Family:
+    """
+    Famille de cas : `count` entrées tirées par `make`, attendu calculé par l'oracle.
+    """
+    name: str
+    make: Callable[[random.Random], Args]
+    count: int
+
+
+@dataclass
+class PropertySpec:
+    oracle: Callable[..., Any]
+    families: List[Family]
+
+
+PROPERTIES: Dict[str, PropertySpec] = {
+    "second_largest": PropertySpec(second_largest_oracle, [
+        Family("distinct_ints", _distinct_ints, 500),
+        Family("duplicates", _duplicates, 500),
+        Family("negatives", _negatives, 300),
+        Family("floats", _floats, 300),
+        Family("degenerate", _degenerate, 100),
+        Family("large", _large_ints, 5),
+    ]),
+    "extreme_numbers_test": PropertySpec(extreme_numbers_oracle, [
+        Family("huge_magnitudes", _huge_magnitudes, 300),
+        Family("with_non_finite", _with_non_finite, 300),
+        Family("mostly_non_finite", _mostly_non_finite, 200),
+        Family("large", _large_floats, 5),
+    ]),
+    "is_palindrome": PropertySpec(is_palindrome_oracle, [
+        Family("palindromes", lambda rng: (_palindrome(rng, _ASCII, rng.randint(1, 40)),), 500),
+        Family("random_text", lambda rng: (_random_text(rng, _ASCII),), 500),
+        Family("punctuation_only", lambda rng: ("".join(rng.choice(_PUNCT) for _ in range(rng.randint(0, 8))),), 100),
+        Family("large", lambda rng: (_palindrome(rng, _ASCII, 50_000),), 3),
+    ]),
+    "multilingual_palindrome_test": PropertySpec(multilingual_palindrome_oracle, [
+        Family("accented_latin", lambda rng: (_palindrome(rng, _LATIN, rng.randint(1, 40), accents=True),), 400),
+        Family("cyrillic", lambda rng: (_palindrome(rng, _CYRILLIC, rng.randint(1, 40)),), 300),
+        Family("greek", lambda rng: (_palindrome(rng, _GREEK, rng.randint(1, 40), accents=True),), 300),
+        Family("random_text", lambda rng: (_random_text(rng, _LATIN + _CYRILLIC, accents=True),), 500),
+        Family("large", lambda rng: (_palindrome(rng, _LATIN + _CYRILLIC, 50_000, accents=True),), 3),
+    ]),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def generate_cases(prompt_key: str, family_name: str, seed: int = 0) -> Tuple[Tuple[Args, ...], Tuple[Any, ...]]:
+    """
+    Lot (entrées, attendus) d'une famille, généré une seule fois par processus
+    et par graine. Un attendu est une valeur ou un type d'exception, comme
+    dans TEST_CASES.
+    """
+    spec = PROPERTIES[prompt_key]
+    family = next(f for f in spec.families if f.name == family_name)
+    rng = random.Random(f"{prompt_key}:{family_name}:{seed}")
+    inputs = tuple(family.make(rng) for _ in range(family.count))
+    expected = []
+    for args in inputs:
+        try:
+            expected.append(spec.oracle(*args))
+        except Exception as e:
+            expected.append(type(e))
+    return inputs, tuple(expected)
+
+
+# --- 4) Exécution ----------------------------------------------------------------
+
+@dataclass
+class FamilyResult:
+    name: str
+    total: int
+    checked: int = 0
+    passed: bool = False
+    complete: bool = False
+    counterexample: Optional[str] = None
+
+
+@dataclass
+class PropertyRun:
+    prompt_key: str
+    families: List[FamilyResult] = field(default_factory=list)
+
+    @property
+    def complete(self) -> List[FamilyResult]:
+        return [f for f in self.families if f.complete]
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for f in self.complete if f.passed)
+
+    @property
+    def truncated(self) -> bool:
+        """
+        Vrai si le budget de temps a interrompu au moins une famille.
+        """
+        return any(not f.complete for f in self.families)
+
+
+# Conteneurs copiés avant chaque appel : la fonction testée peut les modifier
+# (ex. list.sort(), dict.pop())
+MUTABLE_ARGS = (list, dict, set, bytearray)
+
+
+def fresh_args(args: Args) -> Args:
+    """
+    Copie superficielle des arguments modifiables, pour un appel sur des données neuves.
+    """
+    return tuple(type(a)(a) if isinstance(a, MUTABLE_ARGS) else a for a in args)
+
+
+def check_family(func: Any, inputs: Tuple[Args, ...], expected: Tuple[Any, ...],
+                 result: FamilyResult, deadline: float) -> FamilyResult:
+    """
+    Boucle serrée sur le lot ; s'arrête au premier échec (contre-exemple
+    enregistré) ou quand l'échéance est dépassée (famille incomplète).
+    """
+    clock = time.perf_counter
+    for args, want in zip(inputs, expected):
+        if clock() > deadline:
+            return result
+        raises = isinstance(want, type) and issubclass(want, Exception)
+        try:
+            got = func(*fresh_args(args))
+            ok = not raises and bool(got == want)
+        except Exception as e:
+            ok = raises and isinstance(e, want)
+        result.checked += 1
+        if not ok:
+            result.complete = True
+            result.counterexample = repr(args)[:200]
+            return result
+    result.passed = result.complete = True
+    return result
+
+
+def run_properties(prompt_key: str, func: Any, seed: int = 0,
+                   budget: Optional[float] = None) -> Optional[PropertyRun]:
+    """
+    Vérifie func contre chaque famille de PROPERTIES[prompt_key] ; None si le
+    prompt n'a pas de générateurs. `budget` vaut PROPERTY_BUDGET par défaut.
+    """
+    spec = PROPERTIES.get(prompt_key)
+    if spec is None:
+        return None
+    deadline = time.perf_counter() + (PROPERTY_BUDGET if budget is None else budget)
+    run = PropertyRun(prompt_key)
+    for family in spec.families:
+        inputs, expected = generate_cases(prompt_key, family.name, seed)
+        run.families.append(check_family(func, inputs, expected, FamilyResult(family.name, len(inputs)), deadline))
+    return run
@@ -0,0 +1,319 @@
+# backend/instrumentation.py
+
+import sys
+import time
+import bisect
+import cProfile
+import threading
+import contextlib
+import contextvars
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+# { étape: {"wall": s, "cpu": s, "peak_kb": ko} } d'une cellule
+StageTimes = Dict[str, Dict[str, float]]
+
+
+def _memory_kb() -> Tuple[int, int]:
+    """
+    (RSS courante, pic RSS depuis la dernière remise à zéro) du processus, en
+    Ko. Sous Linux : VmRSS / VmHWM de /proc ; ailleurs, seul le pic de toute
+    la vie du processus (ru_maxrss) est connu et sert pour les deux valeurs.
+    """
+    try:
+        with open("/proc/self/status", "rb") as f:
+            status = dict(line.split(b":", 1) for line in f if b":" in line)
+        return int(status[b"VmRSS"].split()[0]), int(status[b"VmHWM"].split()[0])
+    except (OSError, KeyError, ValueError):
+        pass
+    if resource is None:
+        return 0, 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak // 1024 if sys.platform == "darwin" else peak
+    return peak, peak
+
+
+def _reset_peak() -> bool:
+    """
+    Remet le pic RSS du processus (VmHWM) à la RSS courante ; Linux ≥ 4.0
+    seulement. False si le noyau ne le permet pas.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+@dataclass
+class StageStats:
+    wall: float = 0.0      # secondes d'horloge murale
+    cpu: float = 0.0       # secondes CPU du processus
+    peak_kb: int = 0       # hausse maximale de la RSS pendant l'étape
+
+
+class StageRecorder:
+    """
+    Mesure les étapes d'une cellule. Une étape exécutée plusieurs fois
+    cumule ses temps ; les étapes peuvent être imbriquées (« cell » englobe
+    les autres).
+    La mémoire d'une étape est le pic RSS atteint pendant l'étape au-dessus
+    de la RSS à son entrée : les workers du pool sont réutilisés, leur pic
+    de toute une vie (ru_maxrss) ne dirait rien de l'étape. Le pic du noyau
+    est remis à zéro à chaque frontière d'étape, après avoir été reporté
+    sur les étapes englobantes encore ouvertes. Sans remise à zéro possible
+    (hors Linux), seule la hausse du pic de toute une vie est visible : une
+    borne inférieure, souvent 0. La RSS est celle du processus : des étapes
+    concurrentes (critères "io" en threads) se partagent le même pic.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self._open: List[List[int]] = []   # [RSS d'entrée, pic observé] des étapes ouvertes
+        self._lock = threading.Lock()
+
+    def _checkpoint(self) -> int:
+        """
+        Reporte le pic courant sur les étapes ouvertes puis le remet à zéro ;
+        renvoie la référence d'entrée d'une nouvelle étape.
+        """
+        _, peak = _memory_kb()
+        for frame in self._open:
+            frame[1] = max(frame[1], peak)
+        if _reset_peak():
+            return _memory_kb()[0]
+        return peak
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        with self._lock:
+            base = self._checkpoint()
+            frame = [base, base]
+            self._open.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            with self._lock:
+                self._checkpoint()
+                # par identité : deux étapes ouvertes peuvent avoir les mêmes valeurs
+                self._open = [f for f in self._open if f is not frame]
+                stats = self.stages.setdefault(name, StageStats())
+                stats.wall += wall
+                stats.cpu += cpu
+                stats.peak_kb = max(stats.peak_kb, frame[1] - frame[0])
+
+    def as_dict(self) -> StageTimes:
+        return {name: asdict(s) for name, s in self.stages.items()}
+
+
+_current: contextvars.ContextVar[Optional[StageRecorder]] = contextvars.ContextVar("stage_recorder", default=None)
+
+
+@contextlib.contextmanager
+def recording() -> Iterator[StageRecorder]:
+    """
+    Active un StageRecorder pour le bloc : les appels à stage() y sont enregistrés.
+    """
+    recorder = StageRecorder()
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Hook de mesure posé dans le pipeline ; sans recording() actif, ne fait rien.
+    """
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+    with recorder.stage(name):
+        yield
+
+
+def merge_stages(total: Optional[StageTimes], stages: StageTimes) -> StageTimes:
+    """
+    Cumule les mesures de plusieurs tâches d'une même cellule (échantillons
+    scorés séparément) : temps additionnés, pic maximal.
+    """
+    merged = {name: dict(s) for name, s in (total or {}).items()}
+    for name, s in stages.items():
+        into = merged.setdefault(name, {"wall": 0.0, "cpu": 0.0, "peak_kb": 0})
+        into["wall"] += s["wall"]
+        into["cpu"] += s["cpu"]
+        into["peak_kb"] = max(into["peak_kb"], s["peak_kb"])
+    return merged
+
+
+# --- Profilage optionnel (--profile) ----------------------------------------
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+@contextlib.contextmanager
+def profiling(path: str, profiler: str = "cprofile") -> Iterator[None]:
+    """
+    Profile le bloc et écrit `path`.prof (cProfile, lisible avec pstats /
+    snakeviz) ou `path`.html (pyinstrument, s'il est installé).
+    """
+    if profiler == "pyinstrument":
+        try:
+            import pyinstrument  # optionnel, importé seulement s'il est demandé
+        except ImportError:
+            raise RuntimeError("pyinstrument n'est pas installé") from None
+        profiler_ = pyinstrument.Profiler()
+        profiler_.start()
+        try:
+            yield
+        finally:
+            profiler_.stop()
+            with open(f"{path}.html", "w", encoding="utf-8") as f:
+                f.write(profiler_.output_html())
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(f"{path}.prof")
+
+
+# --- Agrégation : tableau de fin de run --------------------------------------
+
+class StageSummary:
+    """
+    Agrège les StageTimes de toutes les cellules d'un run.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[Tuple[float, float, int]]] = {}
+
+    def add(self, stages: Optional[StageTimes]) -> None:
+        for name, s in (stages or {}).items():
+            self.samples.setdefault(name, []).append((s["wall"], s["cpu"], s["peak_kb"]))
+
+    def rows(self) -> List[Dict[str, float]]:
+        rows = []
+        for name, samples in self.samples.items():
+            walls = sorted(w for w, _, _ in samples)
+            rows.append({
+                "stage": name,
+                "cells": len(samples),
+                "wall_total": sum(walls),
+                "wall_mean": sum(walls) / len(walls),
+                "wall_p95": walls[min(len(walls) - 1, int(0.95 * len(walls)))],
+                "cpu_total": sum(c for _, c, _ in samples),
+                "peak_kb": max(p for _, _, p in samples),
+            })
+        return sorted(rows, key=lambda r: -r["wall_total"])
+
+    def table(self) -> str:
+        lines = [f"{'stage':<20} {'cells':>6} {'wall s':>9} {'mean ms':>9} {'p95 ms':>9} {'cpu s':>9} {'peak MB':>8}"]
+        for r in self.rows():
+            lines.append(
+                f"{r['stage']:<20} {r['cells']:>6} {r['wall_total']:>9.2f} {r['wall_mean'] * 1e3:>9.1f} "
+                f"{r['wall_p95'] * 1e3:>9.1f} {r['cpu_total']:>9.2f} {r['peak_kb'] / 1024:>8.1f}"
+            )
+        return "\n".join(lines)
+
+
+# --- Métriques Prometheus (format texte d'exposition) -------------------------
+
+# bornes des histogrammes de durée, en secondes
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        out, total = [], 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            total += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            out.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum}")
+        out.append(f"{name}_count{{{labels}}} {total}")
+        return out
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """
+    Registre de métriques du processus API : durées des étapes des cellules
+    scorées par les jobs et durées des requêtes HTTP. render() produit le
+    format texte de Prometheus. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_wall: Dict[str, _Histogram] = {}
+        self.stage_cpu: Dict[str, float] = {}
+        self.stage_peak: Dict[str, int] = {}
+        self.requests: Dict[Tuple[str, str, int], _Histogram] = {}
+
+    def observe_stages(self, stages: Optional[StageTimes]) -> None:
+        with self._lock:
+            for name, s in (stages or {}).items():
+                self.stage_wall.setdefault(name, _Histogram()).observe(s["wall"])
+                self.stage_cpu[name] = self.stage_cpu.get(name, 0.0) + s["cpu"]
+                self.stage_peak[name] = max(self.stage_peak.get(name, 0), int(s["peak_kb"]))
+
+    def observe_request(self, method: str, path: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.requests.setdefault((method, path, status), _Histogram()).observe(seconds)
+
+    def render(self) -> str:
+        with self._lock:
+            out = [
+                "# HELP evaluator_stage_seconds Wall-clock time per evaluation stage and cell.",
+                "# TYPE evaluator_stage_seconds histogram",
+            ]
+            for name, hist in sorted(self.stage_wall.items()):
+                out += hist.lines("evaluator_stage_seconds", f'stage="{_label(name)}"')
+            out += [
+                "# HELP evaluator_stage_cpu_seconds_total CPU time spent per evaluation stage.",
+                "# TYPE evaluator_stage_cpu_seconds_total counter",
+            ]
+            out += [f'evaluator_stage_cpu_seconds_total{{stage="{_label(n)}"}} {v}'
+                    for n, v in sorted(self.stage_cpu.items())]
+            out += [
+                "# HELP evaluator_stage_peak_rss_bytes Largest RSS increase of a worker during a stage.",
+                "# TYPE evaluator_stage_peak_rss_bytes gauge",
+            ]
+            out += [f'evaluator_stage_peak_rss_bytes{{stage="{_label(n)}"}} {v * 1024}'
+                    for n, v in sorted(self.stage_peak.items())]
+            out += [
+                "# HELP http_request_duration_seconds HTTP request latency.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, path, status), hist in sorted(self.requests.items()):
+                labels = f'method="{method}",path="{_label(path)}",status="{status}"'
+                out += hist.lines("http_request_duration_seconds", labels)
+            return "\n".join(out) + "\n"
+
+
+METRICS = Metrics()
@@ -0,0 +1,208 @@
+# backend/jobs.py
+
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from prompts import PROMPT_KEYS
+from score_cache import ScoreCache
+from sandbox import SandboxLimits, SandboxPool
+from instrumentation import METRICS, StageTimes
+
+if TYPE_CHECKING:
+    from evaluate_models import Cell
+
+
+class QueueFull(Exception):
+    """
+    La file d'attente globale est pleine (→ HTTP 429).
+    """
+
+
+class ClientLimitExceeded(Exception):
+    """
+    Le client a déjà trop de jobs en attente ou en cours (→ HTTP 429).
+    """
+
+
+@dataclass
+class Job:
+    id: str
+    client: str
+    model: str
+    cells: List["Cell"]
+    status: str = "queued"          # queued | running | done | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "model": self.model,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "prompts": [key for _, key, _ in self.cells],
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    File d'évaluation en arrière-plan : une asyncio.Queue bornée, consommée
+    par `concurrency` tâches qui délèguent le scoring à des threads (hors de
+    la boucle d'évènements), eux-mêmes adossés à un SandboxPool partagé.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 16,
+        per_client: int = 2,
+        concurrency: int = 2,
+        workers: int = 2,
+        limits: Optional[SandboxLimits] = None,
+        cache: Optional[ScoreCache] = None,
+        max_finished: int = 256,
+    ):
+        self.max_queue = max_queue
+        self.per_client = per_client
+        self.concurrency = concurrency
+        self.workers = workers
+        self.limits = limits
+        self.cache = cache
+        self.max_finished = max_finished
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumers: List[asyncio.Task] = []
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._pool: Optional[SandboxPool] = None
+        self._pool_lock = threading.Lock()
+
+    def _ensure_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        return self._queue
+
+    def start(self) -> None:
+        """
+        Démarre les consommateurs et leurs threads (idempotent) ; à appeler
+        depuis la boucle. Possible à nouveau après stop().
+        """
+        queue = self._ensure_queue()
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="scoring")
+        if not self._consumers:
+            self._consumers = [asyncio.create_task(self._consume(queue)) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """
+        Annule les jobs en file et les consommateurs, puis attend la fin des
+        scorings déjà lancés dans un thread à part : la boucle d'évènements
+        reste disponible pendant l'arrêt.
+        """
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._cancel(self._queue.get_nowait())
+            # la file est liée à la boucle courante : start() en recrée une
+            self._queue = None
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        threads, pool = self._threads, self._pool
+        self._threads = self._pool = None
+
+        def shutdown() -> None:
+            if threads is not None:
+                threads.shutdown(wait=True)
+            if pool is not None:
+                pool.close()
+
+        await asyncio.to_thread(shutdown)
+
+    @staticmethod
+    def _cancel(job: Job) -> None:
+        job.status = "failed"
+        job.error = "cancelled: evaluator shutting down"
+        job.finished_at = time.time()
+
+    def submit(self, client: str, model: str, responses: Dict[str, str]) -> Job:
+        """
+        Met en file l'évaluation de `responses` ({prompt_key: code}).
+        Lève ClientLimitExceeded ou QueueFull au lieu de bloquer.
+        """
+        active = sum(1 for job in self.jobs.values() if job.client == client and job.active)
+        if active >= self.per_client:
+            raise ClientLimitExceeded(f"{active} job(s) already active for this client")
+        cells = [(model, key, responses.get(key)) for key in PROMPT_KEYS if key in responses]
+        job = Job(uuid.uuid4().hex, client, model, cells)
+        try:
+            self._ensure_queue().put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(f"evaluation queue is full ({self.max_queue} jobs)") from None
+        self.jobs[job.id] = job
+        self._forget_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _forget_finished(self) -> None:
+        finished = [jid for jid, job in self.jobs.items() if not job.active]
+        for jid in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[jid]
+
+    def _shared_pool(self) -> SandboxPool:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = SandboxPool(self.workers, self.limits)
+            return self._pool
+
+    def _score(self, job: Job) -> Dict[str, Any]:
+        # importé au premier job : un process API qui ne sert que /api/scores
+        # ne charge pas le pipeline d'évaluation
+        from evaluate_models import iter_cell_results
+
+        entries: Dict[int, Dict[str, Any]] = {}
+        stages: Dict[int, StageTimes] = {}
+        for i, entry in iter_cell_results(job.cells, cache=self.cache, pool=self._shared_pool(), stages=stages):
+            entries[i] = entry
+            # mesures des étapes exposées sur /metrics (cellules réellement scorées)
+            METRICS.observe_stages(stages.pop(i, None))
+        return {key: entries[i] for i, (_, key, _) in enumerate(job.cells)}
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.result = await loop.run_in_executor(self._threads, self._score, job)
+                job.status = "done"
+            except asyncio.CancelledError:
+                # arrêt : le scoring en cours se termine, son résultat est abandonné
+                self._cancel(job)
+                raise
+            except Exception as e:
+                logging.exception(f"job {job.id} failed")
+                job.status = "failed"
+                job.error = repr(e)
+            finally:
+                job.finished_at = time.time()
+                queue.task_done()
@@ -0,0 +1,116 @@
+# backend/linting.py
+
+import os
+import ast
+import logging
+import tempfile
+import subprocess
+from typing import Iterable, List, Optional
+
+try:  # backend in-process (pycodestyle + pyflakes, les moteurs de flake8)
+    import pycodestyle
+    from pyflakes.checker import Checker as FlakesChecker
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    pycodestyle = None
+    FlakesChecker = None
+
+
+class Linter:
+    """
+    Compte les warnings de style (pycodestyle) et de logique (pyflakes) d'un
+    snippet sans lancer de processus. Le StyleGuide et la liste des checks
+    sont construits une seule fois puis réutilisés pour tous les snippets.
+    Sans pycodestyle/pyflakes, retombe sur flake8 en subprocess (un seul
+    appel pour tout un lot) ; sans flake8 non plus, count() renvoie None.
+    """
+
+    def __init__(self, max_line_length: int = 79):
+        self.in_process = pycodestyle is not None and FlakesChecker is not None
+        self._options = None
+        if self.in_process:
+            style = pycodestyle.StyleGuide(quiet=True, max_line_length=max_line_length)
+            self._options = style.options
+
+    def count(self, source: str, tree: Optional[ast.AST] = None) -> Optional[int]:
+        """
+        Nombre de warnings pour un snippet. `tree` évite de re-parser le source
+        quand l'AST est déjà disponible (CompiledSnippet). None si l'analyse
+        échoue (ex. RecursionError de pyflakes sur une expression très
+        imbriquée), comme quand flake8 en subprocess n'a pas pu tourner.
+        """
+        if not self.in_process:
+            return self.count_many([source])[0]
+        if tree is None:
+            try:
+                tree = ast.parse(source)
+            except SyntaxError:
+                return 1  # flake8 ne remonte alors que E999
+        try:
+            return self._style_warnings(source) + self._flakes_warnings(tree)
+        except (RecursionError, ValueError, SyntaxError) as e:
+            logging.warning(f"lint impossible ({e!r}), readability → 0")
+            return None
+
+    def count_many(self, sources: Iterable[str]) -> List[Optional[int]]:
+        """
+        Mode batch : lint de plusieurs snippets en un seul appel.
+        """
+        sources = list(sources)
+        if self.in_process:
+            return [self.count(src) for src in sources]
+        return _flake8_batch(sources)
+
+    def _style_warnings(self, source: str) -> int:
+        lines = source.splitlines(keepends=True)
+        checker = pycodestyle.Checker(
+            lines=lines, options=self._options, report=self._options.report
+        )
+        return checker.check_all()
+
+    def _flakes_warnings(self, tree: ast.AST) -> int:
+        return len(FlakesChecker(tree, filename="<string>").messages)
+
+
+def _flake8_batch(sources: List[str]) -> List[Optional[int]]:
+    """
+    Lance flake8 une seule fois sur tout le lot (un fichier temporaire par
+    snippet) et ventile les warnings par fichier.
+    """
+    if not sources:
+        return []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, src in enumerate(sources):
+            path = os.path.join(tmp, f"snippet_{i}.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(src)
+            paths.append(path)
+        try:
+            p = subprocess.run(
+                ["flake8", *paths],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=False
+            )
+        except FileNotFoundError:
+            logging.warning("flake8 non installé, readability → 0")
+            return [None] * len(sources)
+        counts = {path: 0 for path in paths}
+        for line in p.stdout.decode().splitlines():
+            path = line.split(":", 1)[0]
+            if path in counts:
+                counts[path] += 1
+        return [counts[path] for path in paths]
+
+
+_default_linter: Optional[Linter] = None
+
+
+def get_linter() -> Linter:
+    """
+    Linter partagé du processus courant (état « chaud » réutilisé).
+    """
+    global _default_linter
+    if _default_linter is None:
+        _default_linter = Linter()
+    return _default_linter
@@ -0,0 +1,175 @@
+# backend/netstub.py
+
+import io
+import re
+import json
+import time
+import socket
+import functools
+import contextlib
+import email.message
+import urllib.error
+import urllib.request
+import urllib.response
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+@functools.lru_cache(maxsize=None)
+def _http_clients() -> Tuple[Any, Any]:
+    """
+    (requests, httpx), ou None pour celui qui n'est pas installé. Importés à
+    la première activation du stub (≈ 100 ms) et non à l'import du module.
+    """
+    try:
+        import requests
+        import requests.adapters
+    except ImportError:  # pragma: no cover - dépend de l'environnement
+        requests = None
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - dépend de l'environnement
+        httpx = None
+    return requests, httpx
+
+
+@dataclass
+class StubResponse:
+    """
+    Réponse canned renvoyée pour une URL : statut, corps, en-têtes.
+    Un corps dict/list est sérialisé en JSON.
+    """
+    status: int = 200
+    body: Union[str, bytes, Dict[str, Any], List[Any]] = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def content(self) -> bytes:
+        if isinstance(self.body, (dict, list)):
+            return json.dumps(self.body).encode("utf-8")
+        if isinstance(self.body, str):
+            return self.body.encode("utf-8")
+        return self.body
+
+    def all_headers(self) -> Dict[str, str]:
+        headers = dict(self.headers)
+        if isinstance(self.body, (dict, list)):
+            headers.setdefault("Content-Type", "application/json")
+        headers.setdefault("Content-Length", str(len(self.content())))
+        return headers
+
+
+_JOKE = {
+    "id": 1,
+    "type": "general",
+    "setup": "Why do programmers prefer dark mode?",
+    "punchline": "Because light attracts bugs.",
+}
+
+# (regex sur l'URL, réponse) : la première route qui matche l'emporte
+DEFAULT_ROUTES: List[Tuple[str, StubResponse]] = [
+    (r"official-joke-api\.appspot\.com", StubResponse(body=_JOKE)),
+    (r"icanhazdadjoke\.com", StubResponse(body={"id": "1", "joke": "I'm reading a book about anti-gravity. It's impossible to put down.", "status": 200})),
+    (r"v2\.jokeapi\.dev", StubResponse(body={"error": False, "type": "single", "joke": "I would tell a UDP joke, but you might not get it."})),
+    (r".*", StubResponse(body=_JOKE)),
+]
+
+
+class StubNetwork:
+    """
+    Réseau virtuel d'évaluation : résout chaque URL vers une réponse canned
+    après une latence configurable, et compte les requêtes servies.
+    """
+
+    def __init__(self, routes: Optional[List[Tuple[str, StubResponse]]] = None, latency: float = 0.0):
+        self.routes = [(re.compile(p), r) for p, r in (routes if routes is not None else DEFAULT_ROUTES)]
+        self.latency = latency
+        self.requests: List[str] = []
+
+    def resolve(self, url: str) -> StubResponse:
+        self.requests.append(url)
+        if self.latency:
+            time.sleep(self.latency)
+        for pattern, response in self.routes:
+            if pattern.search(url):
+                return response
+        return StubResponse(status=404, body="not found")
+
+
+def _urlopen(net: StubNetwork):
+    def urlopen(url, data=None, timeout=None, *args, **kwargs):
+        full_url = url.full_url if isinstance(url, urllib.request.Request) else url
+        stub = net.resolve(full_url)
+        headers = email.message.Message()
+        for k, v in stub.all_headers().items():
+            headers[k] = v
+        if stub.status >= 400:
+            raise urllib.error.HTTPError(full_url, stub.status, "stub", headers, io.BytesIO(stub.content()))
+        return urllib.response.addinfourl(io.BytesIO(stub.content()), headers, full_url, stub.status)
+    return urlopen
+
+
+def _requests_send(net: StubNetwork, requests: Any):
+    def send(adapter, request, **kwargs):
+        stub = net.resolve(request.url)
+        response = requests.models.Response()
+        response.status_code = stub.status
+        response._content = stub.content()
+        response.headers = requests.structures.CaseInsensitiveDict(stub.all_headers())
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response.reason = "OK" if stub.status < 400 else "Stub Error"
+        return response
+    return send
+
+
+def _httpx_response(net: StubNetwork, httpx: Any, request) -> Any:
+    stub = net.resolve(str(request.url))
+    return httpx.Response(stub.status, headers=stub.all_headers(), content=stub.content(), request=request)
+
+
+def _guarded_connect(original):
+    # seules les connexions locales (loopback, sockets Unix) restent autorisées
+    def connect(sock, address):
+        host = address[0] if isinstance(address, tuple) else None
+        if host is not None and host not in ("127.0.0.1", "::1", "localhost"):
+            raise ConnectionRefusedError(f"network disabled during evaluation: {address!r}")
+        return original(sock, address)
+    return connect
+
+
+@contextlib.contextmanager
+def stub_network(
+    routes: Optional[List[Tuple[str, StubResponse]]] = None,
+    latency: float = 0.0,
+) -> Iterator[StubNetwork]:
+    """
+    Active le réseau virtuel : urllib.request.urlopen, les transports de
+    requests et httpx (si installés) sont remplacés par le StubNetwork, et
+    toute autre connexion socket sortante est refusée. À activer avant
+    d'exécuter le snippet pour que ses `from urllib.request import urlopen`
+    voient la version patchée.
+    """
+    net = StubNetwork(routes, latency)
+    patches: List[Tuple[Any, str, Any]] = [
+        (urllib.request, "urlopen", _urlopen(net)),
+        (socket.socket, "connect", _guarded_connect(socket.socket.connect)),
+    ]
+    requests, httpx = _http_clients()
+    if requests is not None:
+        patches.append((requests.adapters.HTTPAdapter, "send", _requests_send(net, requests)))
+    if httpx is not None:
+        async def handle_async_request(transport, request):
+            return _httpx_response(net, httpx, request)
+        patches.append((httpx.HTTPTransport, "handle_request",
+                        lambda transport, request: _httpx_response(net, httpx, request)))
+        patches.append((httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request))
+
+    saved = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+    for obj, name, value in patches:
+        setattr(obj, name, value)
+    try:
+        yield net
+    finally:
+        for obj, name, value in saved:
+            setattr(obj, name, value)
@@ -62,11 +62,10 @@ TEST_CASES: dict[str, List[Tuple[Tuple[Any, ...], Union[Any, type]]]] = {
     # 7) cultural_formats_test(date_str, currency_str)
     "cultural_formats_test": [
         # format DD/MM/YYYY + €
-        (("31/12/2021", "€1,234.56"),
-         (datetime.datetime.strptime("31/12/2021", "%d/%m/%Y").date(), 1234.56)),
+        # (dates littérales : strptime charge _strptime/locale à l'import)
+        (("31/12/2021", "€1,234.56"), (datetime.date(2021, 12, 31), 1234.56)),
         # format MM/DD/YYYY + $
-        (("12/31/2021", "$789.01"),
-         (datetime.datetime.strptime("12/31/2021", "%m/%d/%Y").date(), 789.01)),
+        (("12/31/2021", "$789.01"), (datetime.date(2021, 12, 31), 789.01)),
     ],
 
     # 8) injection_sanitation_test(user_input)
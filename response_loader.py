@@ -0,0 +1,169 @@
+# backend/response_loader.py
+
+import os
+import re
+import json
+from typing import Any, Collection, Iterator, List, Optional, Tuple
+
+# Formats acceptés dans responses/ :
+#   <modèle>.json  : {prompt_key: code, ...} (objet JSON unique)
+#   <modèle>.jsonl : une ligne {"prompt": prompt_key, "code": code} par snippet
+EXTENSIONS = (".json", ".jsonl")
+
+# Taille des blocs lus par le lecteur JSON incrémental
+CHUNK_SIZE = 64 * 1024
+
+_WS = re.compile(r"\s*")
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+# chaîne JSON complète (échappements compris) : sert à sauter une valeur non demandée
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# clé "prompt" d'une ligne JSONL, lue sans décoder le code qui l'accompagne
+_PROMPT_FIELD = re.compile(r'"prompt"\s*:\s*("[^"\\]*(?:\\.[^"\\]*)*")')
+
+Selection = Optional[Collection[str]]
+
+
+class _Reader:
+    """
+    Tampon de lecture d'un fichier texte par blocs, consommé de gauche à droite.
+    """
+
+    def __init__(self, f: Any, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"{char!r} attendu à la position {self.pos}")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder = json.JSONDecoder()) -> Any:
+        """
+        Décode la valeur JSON suivante ; relit un bloc tant qu'elle est tronquée.
+        """
+        # un nombre tronqué (« 12. ») se décoderait sans erreur : on lit
+        # jusqu'au premier caractère qui ne peut pas le prolonger
+        first = self.peek()
+        if first and first in "-0123456789":
+            while _NUMBER_CHARS.match(self.buf, self.pos).end() == len(self.buf) and self.fill():
+                pass
+        while True:
+            try:
+                value, self.pos = decoder.raw_decode(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    def skip(self) -> None:
+        """
+        Saute la valeur suivante sans la décoder quand c'est une chaîne (cas
+        d'un snippet non demandé) ; sinon la décode et l'ignore.
+        """
+        if self.peek() != '"':
+            self.value()
+            return
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.end()
+                return
+            if not self.fill():
+                raise ValueError("chaîne JSON non terminée")
+
+
+def iter_json_object(f: Any, keys: Selection = None, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Parcourt l'objet JSON de premier niveau de `f` bloc par bloc et produit
+    (clé, valeur) pour les clés de `keys` (toutes si None). Les valeurs des
+    autres clés sont sautées sans être décodées ; seule la valeur en cours
+    est gardée en mémoire.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if keys is None or key in keys:
+            yield key, reader.value()
+        else:
+            reader.skip()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+
+def iter_jsonl(f: Any, keys: Selection = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Produit (prompt, code) pour chaque ligne {"prompt": …, "code": …} de `f`.
+    Les lignes dont le prompt n'est pas demandé ne sont pas décodées.
+    """
+    for line in f:
+        if not line.strip():
+            continue
+        if keys is not None:
+            match = _PROMPT_FIELD.search(line)
+            if match is not None and json.loads(match.group(1)) not in keys:
+                continue
+        record = json.loads(line)
+        if keys is None or record["prompt"] in keys:
+            yield record["prompt"], record.get("code")
+
+
+def response_path(resp_dir: str, model_name: str) -> str:
+    """
+    Fichier de réponses d'un modèle (.json prioritaire sur .jsonl).
+    """
+    for ext in EXTENSIONS:
+        path = os.path.join(resp_dir, model_name + ext)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(os.path.join(resp_dir, model_name + EXTENSIONS[0]))
+
+
+def iter_responses(resp_dir: str, model_name: str, prompts: Selection = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Produit (prompt, code) au fil de la lecture du fichier de réponses du
+    modèle, restreint à `prompts` si fourni.
+    """
+    path = response_path(resp_dir, model_name)
+    keys = set(prompts) if prompts is not None else None
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            yield from iter_jsonl(f, keys)
+        else:
+            yield from iter_json_object(f, keys)
+
+
+def list_response_models(resp_dir: str) -> List[str]:
+    """
+    Noms des modèles présents dans resp_dir (.json ou .jsonl), triés.
+    """
+    names = set()
+    for name in os.listdir(resp_dir):
+        stem, ext = os.path.splitext(name)
+        if ext in EXTENSIONS:
+            names.add(stem)
+    return sorted(names)
@@ -0,0 +1,133 @@
+# backend/results_log.py
+
+import os
+import json
+import stat
+import tempfile
+import contextlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), "scores.ndjson")
+
+Cell = Tuple[str, str]
+Report = Dict[str, Dict[str, Any]]
+
+
+class ResultsLog:
+    """
+    Journal NDJSON des cellules scorées : une ligne par (modèle, prompt),
+    écrite et synchronisée sur disque dès que la cellule est terminée.
+    Chaque ligne porte l'empreinte du contenu scoré (`digest`), ce qui permet
+    de reprendre un run interrompu sans rescorer les cellules déjà faites.
+    La dernière ligne d'une cellule l'emporte sur les précédentes.
+    """
+
+    def __init__(self, path: str = LOG_FILE):
+        self.path = path
+
+    def reset(self) -> None:
+        open(self.path, "w", encoding="utf-8").close()
+
+    def _lines(self) -> Iterator[Tuple[int, str]]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for raw in f:
+                # une ligne sans '\n' final est une écriture interrompue
+                if raw.endswith(b"\n"):
+                    yield offset, raw.decode("utf-8")
+                offset += len(raw)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        for _, line in self._lines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    def completed(self) -> Dict[Cell, Optional[str]]:
+        """
+        {(modèle, prompt): digest} des cellules présentes dans le journal.
+        Ne garde que les empreintes en mémoire, pas les entrées.
+        """
+        return {(r["model"], r["prompt"]): r.get("digest") for r in self.records()}
+
+    def append(self, model: str, prompt_key: str, digest: Optional[str], entry: Dict[str, Any]) -> None:
+        record = {"model": model, "prompt": prompt_key, "digest": digest, "entry": entry}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.path, "ab") as f:
+            # termine une éventuelle ligne tronquée par un crash précédent
+            if f.tell() > 0 and not self._ends_with_newline():
+                f.write(b"\n")
+            f.write(line.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _offsets(self) -> Dict[Cell, int]:
+        offsets: Dict[Cell, int] = {}
+        for offset, line in self._lines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            offsets[(record["model"], record["prompt"])] = offset
+        return offsets
+
+    def entries(self, order: List[Cell], fallback: Optional[Report] = None) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        (modèle, prompt, entrée) de la dernière ligne de chaque cellule, dans
+        l'ordre `order`. Seuls les offsets des lignes sont indexés : les
+        entrées sont relues une par une. Une cellule absente du journal est
+        prise dans `fallback` ({modèle: {prompt: entrée}}) si elle y figure ;
+        sans journal (--resume avant toute cellule, journal supprimé), seul
+        `fallback` est utilisé.
+        """
+        offsets = self._offsets()
+        fallback = fallback or {}
+        with open(self.path, "rb") if offsets else contextlib.nullcontext() as log:
+            for model, key in order:
+                if (model, key) in offsets:
+                    log.seek(offsets[(model, key)])
+                    yield model, key, json.loads(log.readline())["entry"]
+                elif key in fallback.get(model, {}):
+                    yield model, key, fallback[model][key]
+
+    def rollup(self, out_file: str, order: List[Cell], fallback: Optional[Report] = None) -> None:
+        """
+        Écrit `out_file` (même format que json.dump(..., indent=2)) à partir du
+        journal, dans l'ordre `order`, puis le remplace atomiquement. Les
+        cellules absentes du journal sont complétées depuis `fallback`.
+        """
+        directory = os.path.dirname(os.path.abspath(out_file))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                out.write("{")
+                current_model: Optional[str] = None
+                for model, key, entry in self.entries(order, fallback):
+                    if model != current_model:
+                        out.write("\n  },\n" if current_model is not None else "\n")
+                        out.write(f"  {json.dumps(model, ensure_ascii=False)}: {{\n")
+                        current_model = model
+                    else:
+                        out.write(",\n")
+                    body = json.dumps(entry, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+                    out.write(f"    {json.dumps(key, ensure_ascii=False)}: {body}")
+                out.write("\n  }\n}" if current_model is not None else "}")
+            # mkstemp crée le fichier en 0600 : on garde les droits de la cible
+            try:
+                mode = stat.S_IMODE(os.stat(out_file).st_mode)
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp, mode)
+            os.replace(tmp, out_file)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
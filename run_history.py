@@ -0,0 +1,375 @@
+# backend/run_history.py
+
+import os
+import sys
+import json
+import math
+import time
+import sqlite3
+import argparse
+import statistics
+import contextlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from scoring import SCORER_VERSION
+
+HISTORY_FILE = os.path.join(os.path.dirname(__file__), "runs.sqlite")
+
+# Seuils par défaut d'une régression : significative ET au moins 5 % plus lente
+DEFAULT_ALPHA = 0.05
+DEFAULT_MIN_RATIO = 1.05
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    scorer_version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cells (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    digest TEXT,
+    error TEXT,
+    overall REAL,
+    cached INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, model, prompt)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    run_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    criterion TEXT NOT NULL,
+    score REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    size INTEGER,
+    median REAL NOT NULL,
+    p95 REAL NOT NULL,
+    number INTEGER NOT NULL,
+    best REAL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    cpu_seconds REAL,
+    peak_kb INTEGER
+);
+CREATE INDEX IF NOT EXISTS timings_run ON timings (run_id, model);
+CREATE INDEX IF NOT EXISTS stages_run ON stages (run_id, stage);
+"""
+
+
+# --- Tests statistiques (approximation normale, unilatéraux) ----------------
+
+def _ranks(values: Sequence[float]) -> Tuple[List[float], float]:
+    """
+    Rangs moyens (ex aequo) et terme de correction Σ(t³ − t) des ex aequo.
+    """
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    ties = 0.0
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    return ranks, ties
+
+
+def _upper_tail(z: float) -> float:
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def wilcoxon_greater(diffs: Sequence[float]) -> float:
+    """
+    p-valeur du test des rangs signés de Wilcoxon pour H1 : les différences
+    appariées sont positives (tête plus lente que la base).
+    """
+    d = [x for x in diffs if x != 0]
+    n = len(d)
+    if n == 0:
+        return 1.0
+    ranks, ties = _ranks([abs(x) for x in d])
+    w_plus = sum(r for r, x in zip(ranks, d) if x > 0)
+    mean = n * (n + 1) / 4
+    var = n * (n + 1) * (2 * n + 1) / 24 - ties / 48
+    if var <= 0:
+        return 1.0
+    return _upper_tail((w_plus - mean - 0.5) / math.sqrt(var))
+
+
+# --- Historique des runs -----------------------------------------------------
+
+def _migrate(db: sqlite3.Connection) -> None:
+    # bases créées avant l'instrumentation : seule la durée murale était stockée
+    columns = {row[1] for row in db.execute("PRAGMA table_info(stages)")}
+    for column, kind in (("cpu_seconds", "REAL"), ("peak_kb", "INTEGER")):
+        if column not in columns:
+            db.execute(f"ALTER TABLE stages ADD COLUMN {column} {kind}")
+    # bases antérieures au marquage des cellules servies par le cache
+    if "cached" not in {row[1] for row in db.execute("PRAGMA table_info(cells)")}:
+        db.execute("ALTER TABLE cells ADD COLUMN cached INTEGER NOT NULL DEFAULT 0")
+    # bases antérieures au stockage du minimum des répétitions
+    if "best" not in {row[1] for row in db.execute("PRAGMA table_info(timings)")}:
+        db.execute("ALTER TABLE timings ADD COLUMN best REAL")
+
+
+class RunHistory:
+    """
+    Historique append-only des runs d'évaluation (SQLite en mode WAL) : scores
+    de chaque cellule, mesures brutes du benchmark et durées des étapes de
+    l'évaluateur. compare() signale les régressions significatives entre deux
+    runs, côté code généré (benchmark) comme côté évaluateur (étapes).
+    """
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+        self._ready = False
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            db.execute("PRAGMA synchronous=NORMAL")
+            if not self._ready:
+                # schéma, migration et mode WAL (persistant) une fois par instance
+                db.execute("PRAGMA journal_mode=WAL")
+                db.executescript(_SCHEMA)
+                _migrate(db)
+                self._ready = True
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def start_run(self) -> int:
+        with self._connect() as db:
+            cur = db.execute(
+                "INSERT INTO runs (started_at, scorer_version) VALUES (?, ?)",
+                (time.time(), SCORER_VERSION),
+            )
+            return cur.lastrowid
+
+    def finish_run(self, run_id: int) -> None:
+        with self._connect() as db:
+            db.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id))
+
+    def record_cell(
+        self,
+        run_id: int,
+        model: str,
+        prompt_key: str,
+        digest: Optional[str],
+        entry: Dict[str, Any],
+        stages: Optional[Dict[str, Dict[str, float]]] = None,
+        cached: bool = False,
+    ) -> None:
+        """
+        Enregistre une cellule du run : scores numériques du breakdown, mesures
+        du benchmark (ordre conservé) et, si la cellule a été réellement scorée
+        (pas servie par le cache), les mesures de chaque étape
+        ({étape: {wall, cpu, peak_kb}}, voir instrumentation.py).
+        `cached` marque une entrée servie par le cache : ses mesures datent
+        d'un run antérieur et sont exclues de compare().
+        """
+        scores = [
+            (run_id, model, prompt_key, crit, float(v))
+            for crit, v in (entry.get("breakdown") or {}).items()
+            if isinstance(v, (int, float)) and not isinstance(v, bool)
+        ]
+        timings = [
+            (run_id, model, prompt_key, n, t["size"], t["median"], t["p95"], t["number"], t.get("best"))
+            for n, t in enumerate((entry.get("benchmark") or {}).get("timings", []))
+        ]
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO cells (run_id, model, prompt, digest, error, overall, cached) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, model, prompt_key, digest, entry.get("error"), entry.get("overall_score"), int(cached)),
+            )
+            db.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?)", scores)
+            db.executemany(
+                "INSERT INTO timings (run_id, model, prompt, ordinal, size, median, p95, number, best) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                timings,
+            )
+            db.executemany(
+                "INSERT INTO stages (run_id, model, prompt, stage, seconds, cpu_seconds, peak_kb) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, model, prompt_key, stage, s["wall"], s.get("cpu"), s.get("peak_kb"))
+                 for stage, s in (stages or {}).items()],
+            )
+
+    def runs(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT r.id, r.started_at, r.finished_at, r.scorer_version, COUNT(c.prompt) "
+                "FROM runs r LEFT JOIN cells c ON c.run_id = r.id GROUP BY r.id ORDER BY r.id"
+            ).fetchall()
+        return [
+            {"id": i, "started_at": s, "finished_at": f, "scorer_version": v, "cells": n}
+            for i, s, f, v, n in rows
+        ]
+
+    def latest_pair(self) -> Tuple[int, int]:
+        """
+        (base, tête) par défaut : les deux derniers runs terminés.
+        """
+        finished = [r["id"] for r in self.runs() if r["finished_at"] is not None]
+        if len(finished) < 2:
+            raise KeyError("au moins deux runs terminés sont nécessaires")
+        return finished[-2], finished[-1]
+
+    def compare(
+        self,
+        base: Optional[int] = None,
+        head: Optional[int] = None,
+        alpha: float = DEFAULT_ALPHA,
+        min_ratio: float = DEFAULT_MIN_RATIO,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Compare le run `head` au run `base` (par défaut les deux derniers runs
+        terminés). Seules les cellules présentes et réellement scorées dans les
+        deux runs sont comparées (les cellules servies par le cache portent des
+        mesures d'un run antérieur), appariées par (modèle, prompt). Une
+        régression est signalée si p < alpha et si le ratio tête/base atteint
+        `min_ratio`, avec le test des rangs signés de Wilcoxon sur log(tête/base)
+        et ratio = moyenne géométrique :
+          - models : temps par appel du code généré, apparié par (prompt,
+            mesure) ; on compare le minimum des répétitions (`best`), la
+            statistique la moins sensible à la charge, ou la médiane si l'un
+            des deux runs ne l'a pas enregistré ;
+          - stages : durée de chaque étape de l'évaluateur, appariée par cellule.
+        Lève KeyError si un run est inconnu, ValueError si les deux runs n'ont
+        pas la même version du scorer (sauf `force`).
+        """
+        if base is None or head is None:
+            base, head = self.latest_pair()
+        versions = {r["id"]: r["scorer_version"] for r in self.runs()}
+        for run_id in (base, head):
+            if run_id not in versions:
+                raise KeyError(f"run inconnu : {run_id}")
+        if versions[base] != versions[head] and not force:
+            raise ValueError(
+                f"versions du scorer différentes : {versions[base]} (run {base}) "
+                f"et {versions[head]} (run {head})"
+            )
+
+        both_scored = (
+            "JOIN cells cb ON cb.run_id = b.run_id AND cb.model = b.model AND cb.prompt = b.prompt "
+            "JOIN cells ch ON ch.run_id = h.run_id AND ch.model = h.model AND ch.prompt = h.prompt "
+            "WHERE b.run_id = ? AND h.run_id = ? AND NOT cb.cached AND NOT ch.cached "
+        )
+        with self._connect() as db:
+            pairs = db.execute(
+                "SELECT b.model, b.best, h.best, b.median, h.median FROM timings b JOIN timings h "
+                "ON h.model = b.model AND h.prompt = b.prompt AND h.ordinal = b.ordinal "
+                "AND h.size IS b.size " + both_scored +
+                "AND b.median > 0 AND h.median > 0",
+                (base, head),
+            ).fetchall()
+            stage_pairs = db.execute(
+                "SELECT b.stage, b.seconds, h.seconds FROM stages b JOIN stages h "
+                "ON h.model = b.model AND h.prompt = b.prompt AND h.stage = b.stage "
+                + both_scored +
+                "AND b.seconds > 0 AND h.seconds > 0",
+                (base, head),
+            ).fetchall()
+
+        diffs: Dict[str, List[float]] = {}
+        for model, b_best, h_best, b_median, h_median in pairs:
+            if b_best and h_best:
+                b, h = b_best, h_best
+            else:
+                b, h = b_median, h_median
+            diffs.setdefault(model, []).append(math.log(h / b))
+        models = []
+        for model in sorted(diffs):
+            d = diffs[model]
+            ratio = math.exp(sum(d) / len(d))
+            p = wilcoxon_greater(d)
+            models.append({
+                "model": model,
+                "pairs": len(d),
+                "ratio": round(ratio, 3),
+                "p_value": round(p, 4),
+                "regression": p < alpha and ratio >= min_ratio,
+            })
+
+        samples: Dict[str, List[Tuple[float, float]]] = {}
+        for stage, b, h in stage_pairs:
+            samples.setdefault(stage, []).append((b, h))
+        stages = []
+        for stage in sorted(samples):
+            d = [math.log(h / b) for b, h in samples[stage]]
+            ratio = math.exp(sum(d) / len(d))
+            p = wilcoxon_greater(d)
+            stages.append({
+                "stage": stage,
+                "pairs": len(d),
+                "base_median": statistics.median(b for b, _ in samples[stage]),
+                "head_median": statistics.median(h for _, h in samples[stage]),
+                "ratio": round(ratio, 3),
+                "p_value": round(p, 4),
+                "regression": p < alpha and ratio >= min_ratio,
+            })
+
+        return {
+            "base": base,
+            "head": head,
+            "scorer_version": {"base": versions[base], "head": versions[head]},
+            "alpha": alpha,
+            "min_ratio": min_ratio,
+            "models": models,
+            "stages": stages,
+            "regressions": sum(r["regression"] for r in models + stages),
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Historique des runs et détection de régressions")
+    parser.add_argument("--db", default=HISTORY_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="liste les runs enregistrés")
+    cmp = sub.add_parser("compare", help="compare deux runs (défaut : les deux derniers)")
+    cmp.add_argument("base", type=int, nargs="?")
+    cmp.add_argument("head", type=int, nargs="?")
+    cmp.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    cmp.add_argument("--min-ratio", type=float, default=DEFAULT_MIN_RATIO)
+    cmp.add_argument("--force", action="store_true",
+                     help="compare même si les runs n'ont pas la même version du scorer")
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.db)
+    if args.command == "list":
+        print(json.dumps(history.runs(), indent=2))
+        return 0
+    try:
+        report = history.compare(args.base, args.head, args.alpha, args.min_ratio, args.force)
+    except (KeyError, ValueError) as e:
+        print(e.args[0], file=sys.stderr)
+        return 2
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    # code de sortie non nul si régression : utilisable tel quel en CI / nightly
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
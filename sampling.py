@@ -0,0 +1,65 @@
+# backend/sampling.py
+
+import math
+import statistics
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+# Valeurs de k rapportées (seules celles ≤ nombre d'échantillons)
+PASS_AT_K = (1, 5, 10)
+
+Samples = Union[str, List[str]]
+
+
+def pass_at_k(n: int, c: int, k: int) -> float:
+    """
+    Estimateur non biaisé de pass@k : probabilité qu'au moins un de k
+    échantillons tirés parmi n (dont c corrects) passe, soit
+    1 − C(n−c, k) / C(n, k).
+    """
+    if n - c < k:
+        return 1.0
+    return 1.0 - math.comb(n - c, k) / math.comb(n, k)
+
+
+def sample_passed(entry: Dict[str, Any]) -> bool:
+    """
+    Un échantillon passe s'il a été scoré sans erreur et réussit tous ses tests.
+    """
+    counts = entry.get("test_counts") or {}
+    return entry.get("error") is None and counts.get("total", 0) > 0 and counts.get("passed") == counts.get("total")
+
+
+def summarize_samples(entries: Sequence[Dict[str, Any]], distinct: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Entrée d'une cellule multi-échantillons : celle du meilleur échantillon
+    (un échantillon qui passe tous ses tests d'abord, puis l'overall_score le
+    plus haut, puis le premier), complétée par
+    `samples` = {n, distinct, passed, pass_at_k, mean, variance, best, overall}.
+    `entries` contient une entrée par échantillon, doublons compris ; mean et
+    variance portent sur les critères numériques des échantillons scorés, un
+    échantillon en erreur (crash, timeout, code absent) comptant 0 pour
+    chacun, comme une cellule en erreur dans score_matrix et le leaderboard.
+    """
+    n = len(entries)
+    passed = sum(1 for e in entries if sample_passed(e))
+    best = max(range(n), key=lambda i: (sample_passed(entries[i]), entries[i].get("overall_score", 0.0), -i))
+    criteria: Dict[str, List[float]] = {}
+    for entry in entries:
+        if entry.get("error") is None:
+            for crit, v in (entry.get("breakdown") or {}).items():
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    criteria.setdefault(crit, []).append(float(v))
+    errored = sum(1 for e in entries if e.get("error") is not None)
+    for values in criteria.values():
+        values.extend([0.0] * errored)
+    summary = {
+        "n": n,
+        "distinct": n if distinct is None else distinct,
+        "passed": passed,
+        "pass_at_k": {str(k): round(pass_at_k(n, passed, k), 4) for k in PASS_AT_K if k <= n},
+        "mean": {crit: round(statistics.fmean(vs), 3) for crit, vs in criteria.items()},
+        "variance": {crit: round(statistics.pvariance(vs), 3) for crit, vs in criteria.items()},
+        "best": best,
+        "overall": [e.get("overall_score", 0.0) for e in entries],
+    }
+    return {**entries[best], "samples": summary}
@@ -0,0 +1,232 @@
+# backend/sandbox.py
+
+import queue
+import signal
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows : pas de rlimits
+    resource = None
+
+# forkserver : les workers ne sont pas forkés depuis un processus multi-thread
+_CTX = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+
+
+@dataclass
+class SandboxLimits:
+    """
+    Limites appliquées à chaque tâche exécutée dans un worker.
+    """
+    timeout: float = 30.0              # secondes d'horloge murale par tâche
+    memory_mb: Optional[int] = 2048    # RLIMIT_AS du worker
+    cpu_seconds: Optional[int] = 30    # RLIMIT_CPU par tâche
+    max_tasks: int = 50                # recyclage du worker après N tâches
+
+
+class SandboxError(Exception):
+    """
+    Échec d'une tâche imputable au sandbox (limite atteinte, worker mort).
+    Le message a la forme « <type>: <détail> », prêt pour le champ `error`.
+    """
+
+
+class SandboxTimeout(SandboxError):
+    pass
+
+
+class SandboxMemoryError(SandboxError):
+    pass
+
+
+class SandboxCpuLimit(SandboxError):
+    pass
+
+
+class SandboxCrash(SandboxError):
+    pass
+
+
+class SandboxTaskError(SandboxError):
+    """
+    Exception non rattrapée levée par la tâche elle-même (ex. RecursionError
+    d'un outil d'analyse sur un snippet pathologique) : « crash: <repr> ».
+    """
+
+
+class _CpuLimitExceeded(BaseException):
+    # BaseException : un `except Exception` du code généré ne l'avale pas
+    pass
+
+
+def _on_sigxcpu(signum, frame):
+    raise _CpuLimitExceeded()
+
+
+def _arm_cpu_limit(seconds: Optional[int]) -> None:
+    """
+    RLIMIT_CPU est cumulatif sur la vie du processus : la limite souple est
+    repositionnée à (temps CPU déjà consommé + seconds) avant chaque tâche.
+    """
+    if resource is None or not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, limits: SandboxLimits) -> None:
+    if resource is not None and limits.memory_mb:
+        size = limits.memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (size, size))
+    if hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        fn, args = task
+        try:
+            _arm_cpu_limit(limits.cpu_seconds)
+            reply = ("ok", fn(*args))
+        except MemoryError as e:
+            reply = ("memory", repr(e))
+        except _CpuLimitExceeded:
+            reply = ("cpu", f"{limits.cpu_seconds}s")
+        except Exception as e:
+            reply = ("raise", e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            conn.send(("raise", RuntimeError(f"unpicklable result: {e!r}")))
+
+
+class _Worker:
+    def __init__(self, limits: SandboxLimits):
+        self.conn, child = _CTX.Pipe()
+        self.proc = _CTX.Process(target=_worker_main, args=(child, limits), daemon=True)
+        self.proc.start()
+        child.close()
+        self.tasks = 0
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.proc.join(timeout=1.0)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+        self.conn.close()
+
+
+class SandboxPool:
+    """
+    Pool de processus pré-démarrés et réutilisables pour exécuter le code
+    généré hors du processus évaluateur. Chaque tâche a un timeout d'horloge
+    murale, un plafond mémoire (RLIMIT_AS) et CPU (RLIMIT_CPU) ; un worker
+    qui dépasse une limite est tué et remplacé, et chaque worker est recyclé
+    après `limits.max_tasks` tâches. run() est thread-safe.
+    """
+
+    def __init__(self, size: int, limits: Optional[SandboxLimits] = None):
+        self.size = max(1, size)
+        self.limits = limits or SandboxLimits()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(_Worker(self.limits))
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Exécute fn(*args) dans un worker libre et renvoie son résultat.
+        Lève une SandboxError si une limite est atteinte ou si le worker meurt ;
+        une exception levée par fn est relancée telle quelle.
+        """
+        worker = self._idle.get()
+        try:
+            worker.conn.send((fn, args))
+            if not worker.conn.poll(self.limits.timeout):
+                worker.kill()
+                worker = _Worker(self.limits)
+                raise SandboxTimeout(f"timeout: exceeded {self.limits.timeout}s wall clock")
+            try:
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.proc.join()
+                code = worker.proc.exitcode
+                worker.kill()
+                worker = _Worker(self.limits)
+                if code == -getattr(signal, "SIGXCPU", 0):
+                    raise SandboxCpuLimit(f"cpu limit: exceeded {self.limits.cpu_seconds}s") from None
+                raise SandboxCrash(f"worker crashed: exit code {code}") from None
+
+            worker.tasks += 1
+            if status in ("memory", "cpu") or worker.tasks >= self.limits.max_tasks:
+                worker.stop()
+                worker = _Worker(self.limits)
+            if status == "ok":
+                return payload
+            if status == "memory":
+                raise SandboxMemoryError(f"memory limit: {payload} (limit {self.limits.memory_mb} MB)")
+            if status == "cpu":
+                raise SandboxCpuLimit(f"cpu limit: exceeded {payload}")
+            raise payload
+        finally:
+            self._idle.put(worker)
+
+    def _call(self, fn: Callable[..., Any], item: Any) -> Any:
+        try:
+            return self.run(fn, item)
+        except SandboxError as e:
+            return e
+        except Exception as e:
+            # une tâche qui lève ne doit jamais interrompre le lot
+            return SandboxTaskError(f"crash: {e!r}")
+
+    def map(self, fn: Callable[..., Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Applique fn à chaque item en parallèle sur tous les workers.
+        Renvoie les résultats dans l'ordre des items ; une tâche en échec
+        donne l'instance de SandboxError à sa place (pas d'exception levée),
+        SandboxTaskError si l'exception vient de fn.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as threads:
+            return list(threads.map(lambda item: self._call(fn, item), items))
+
+    def imap_unordered(self, fn: Callable[..., Any], items: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+        """
+        Comme map(), mais produit (index, résultat) dès qu'une tâche se termine :
+        l'appelant peut consommer chaque résultat sans attendre tout le lot.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as threads:
+            futures = {threads.submit(self._call, fn, item): i for i, item in enumerate(items)}
+            for future in as_completed(futures):
+                yield futures.pop(future), future.result()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> "SandboxPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
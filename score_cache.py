@@ -0,0 +1,108 @@
+# backend/score_cache.py
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, Iterable, Optional
+
+from prompts import TEST_CASES
+from scoring import SCORER_VERSION
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".score_cache")
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def cell_key(prompt_key: str, code_str: str, criteria: Optional[Iterable[str]] = None) -> str:
+    """
+    Empreinte d'une cellule : source du snippet, cas de test du prompt et
+    version des scorers. Toute modification de l'un des trois invalide l'entrée.
+    Une entrée restreinte à `criteria` (--criteria) a sa propre empreinte ;
+    sans restriction, l'empreinte est inchangée.
+    """
+    parts = [SCORER_VERSION, prompt_key, repr(TEST_CASES.get(prompt_key, [])), code_str]
+    if criteria is not None:
+        parts.append(sorted(set(criteria)))
+    payload = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    Cache disque adressé par contenu : une entrée JSON par cellule scorée,
+    rangée sous <dir>/<2 premiers caractères>/<hash>.json.
+    L'éviction est LRU sur le mtime (rafraîchi à chaque lecture).
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Écrit l'entrée, sauf si un critère a été interrompu par un budget de
+        temps (`budget_limited`) : son score n'est pas reproductible.
+        """
+        if entry.get("budget_limited"):
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # écriture atomique : un run interrompu ne laisse pas d'entrée tronquée
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def prune(self) -> int:
+        """
+        Supprime les entrées les moins récemment utilisées au-delà de max_entries.
+        Renvoie le nombre d'entrées supprimées.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.stat(path).st_mtime, path))
+                    except OSError:
+                        continue
+        excess = len(files) - self.max_entries
+        if excess <= 0:
+            return 0
+        files.sort()
+        for _, path in files[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        logging.info(f"Score cache: {excess} entrée(s) évincée(s)")
+        return excess
@@ -0,0 +1,186 @@
+# backend/score_matrix.py
+
+import os
+import json
+import argparse
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+MATRIX_FILE = os.path.join(os.path.dirname(__file__), "scores.npz")
+
+
+class ScoreMatrix:
+    """
+    Scores matérialisés en tableau dense modèle × prompt × critère (float64)
+    avec un masque des valeurs présentes. Les agrégations (moyennes, rangs,
+    score global pondéré) sont des opérations NumPy sur tout le tableau.
+    `cells` (modèle × prompt) marque les cellules présentes dans le rapport :
+    une cellule présente sans aucun score (erreur, code manquant) compte 0,
+    comme son overall_score ; seule une cellule absente est ignorée.
+    """
+
+    def __init__(self, models: Sequence[str], prompts: Sequence[str], criteria: Sequence[str],
+                 values: "np.ndarray", mask: "np.ndarray", cells: Optional["np.ndarray"] = None):
+        self.models = list(models)
+        self.prompts = list(prompts)
+        self.criteria = list(criteria)
+        self.values = values
+        self.mask = mask
+        self.cells = mask.any(axis=2) if cells is None else cells
+
+    @classmethod
+    def from_cells(cls, cells: Iterable[Tuple[str, str, Dict[str, Any]]]) -> "ScoreMatrix":
+        """
+        Construit la matrice à partir de (modèle, prompt, entrée). Seuls les
+        scores numériques du breakdown sont retenus ; une cellule en erreur
+        (breakdown vide) a tous ses critères masqués mais reste présente.
+        """
+        if np is None:
+            raise RuntimeError("numpy est requis pour ScoreMatrix")
+        models: Dict[str, int] = {}
+        prompts: Dict[str, int] = {}
+        criteria: Dict[str, int] = {}
+        points: List[Tuple[int, int, int, float]] = []
+        present: List[Tuple[int, int]] = []
+        for model, prompt, entry in cells:
+            m = models.setdefault(model, len(models))
+            p = prompts.setdefault(prompt, len(prompts))
+            present.append((m, p))
+            for crit, score in (entry.get("breakdown") or {}).items():
+                if isinstance(score, (int, float)) and not isinstance(score, bool):
+                    c = criteria.setdefault(crit, len(criteria))
+                    points.append((m, p, c, float(score)))
+
+        shape = (len(models), len(prompts), len(criteria))
+        values = np.zeros(shape, dtype=np.float64)
+        mask = np.zeros(shape, dtype=bool)
+        if points:
+            idx = np.array([pt[:3] for pt in points], dtype=np.intp)
+            values[idx[:, 0], idx[:, 1], idx[:, 2]] = [pt[3] for pt in points]
+            mask[idx[:, 0], idx[:, 1], idx[:, 2]] = True
+        cell_mask = np.zeros(shape[:2], dtype=bool)
+        if present:
+            idx = np.array(present, dtype=np.intp)
+            cell_mask[idx[:, 0], idx[:, 1]] = True
+        return cls(list(models), list(prompts), list(criteria), values, mask, cell_mask)
+
+    @classmethod
+    def from_report(cls, report: Dict[str, Dict[str, Dict[str, Any]]]) -> "ScoreMatrix":
+        return cls.from_cells(
+            (model, prompt, entry)
+            for model, prompts in report.items()
+            for prompt, entry in prompts.items()
+        )
+
+    def save(self, path: str = MATRIX_FILE) -> None:
+        # np.savez ajoute « .npz » si absent : on écrit via un handle pour garder le nom
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                models=np.array(self.models, dtype=str),
+                prompts=np.array(self.prompts, dtype=str),
+                criteria=np.array(self.criteria, dtype=str),
+                values=self.values,
+                mask=self.mask,
+                cells=self.cells,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = MATRIX_FILE) -> "ScoreMatrix":
+        if np is None:
+            raise RuntimeError("numpy est requis pour ScoreMatrix")
+        with np.load(path) as data:
+            # fichiers antérieurs sans `cells` : cellules déduites du masque
+            cells = data["cells"] if "cells" in data.files else None
+            return cls(data["models"].tolist(), data["prompts"].tolist(), data["criteria"].tolist(),
+                       data["values"], data["mask"], cells)
+
+    # --- Agrégations vectorisées -------------------------------------------
+
+    def _weights(self, weights: Optional[Dict[str, float]]) -> "np.ndarray":
+        if not weights:
+            return np.ones(len(self.criteria))
+        unknown = set(weights) - set(self.criteria)
+        if unknown:
+            raise KeyError(f"critères inconnus : {', '.join(sorted(unknown))}")
+        return np.array([float(weights.get(c, 0.0)) for c in self.criteria])
+
+    def criterion_means(self) -> "np.ndarray":
+        """
+        Moyenne par (modèle, critère) sur les prompts présents ; NaN si aucun.
+        """
+        counts = self.mask.sum(axis=1)
+        sums = np.where(self.mask, self.values, 0.0).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def criterion_ranks(self) -> "np.ndarray":
+        """
+        Rang (1 = meilleur) de chaque modèle pour chaque critère ; les modèles
+        sans valeur sont classés derniers.
+        """
+        means = np.nan_to_num(self.criterion_means(), nan=-np.inf)
+        order = np.argsort(-means, axis=0, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, len(self.models) + 1)[:, None], axis=0)
+        return ranks
+
+    def cell_overall(self, weights: Optional[Dict[str, float]] = None) -> "np.ndarray":
+        """
+        Score global pondéré par cellule (modèle × prompt) ; 0.0 pour une
+        cellule présente sans aucun score (erreur), NaN pour une cellule absente
+        ou sans critère pondéré. Poids uniformes = overall_score du rapport.
+        """
+        w = self._weights(weights)
+        present = self.mask * w
+        total = present.sum(axis=2)
+        errored = self.cells & ~self.mask.any(axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overall = np.where(total > 0, (self.values * present).sum(axis=2) / total, np.nan)
+        return np.where(errored, 0.0, overall)
+
+    def model_overall(self, weights: Optional[Dict[str, float]] = None) -> "np.ndarray":
+        """
+        Moyenne par modèle des scores globaux pondérés de ses cellules
+        (cellules en erreur comptées 0, cellules absentes ignorées).
+        """
+        cells = self.cell_overall(weights)
+        counts = (~np.isnan(cells)).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, np.nansum(cells, axis=1) / counts, np.nan)
+
+    def leaderboard(self, weights: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
+        scores = self.model_overall(weights)
+        order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")
+        return [(self.models[i], round(float(scores[i]), 2)) for i in order]
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """
+    « performance=2,security=1 » → {"performance": 2.0, "security": 1.0}
+    """
+    weights: Dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, value = part.partition("=")
+        weights[name.strip()] = float(value) if value else 1.0
+    return weights
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Classement des modèles depuis scores.npz")
+    parser.add_argument("--matrix", default=MATRIX_FILE)
+    parser.add_argument("--weights", default="", help="ex. performance=2,security=1")
+    args = parser.parse_args(argv)
+    matrix = ScoreMatrix.load(args.matrix)
+    board = matrix.leaderboard(parse_weights(args.weights) or None)
+    print(json.dumps(board, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
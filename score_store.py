@@ -0,0 +1,151 @@
+# backend/score_store.py
+
+import os
+import json
+import hashlib
+import threading
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def project_entry(entry: Dict[str, Any], criteria: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """
+    Copie d'une cellule dont le breakdown est réduit aux critères demandés.
+    """
+    if not criteria:
+        return entry
+    projected = dict(entry)
+    breakdown = entry.get("breakdown") or {}
+    projected["breakdown"] = {c: breakdown[c] for c in criteria if c in breakdown}
+    return projected
+
+
+class ScoreIndex:
+    """
+    Index en mémoire d'une version de scores.json : moyennes par modèle
+    (overall_score et chaque critère), classements triés à la demande puis
+    mémoïsés. Construit une seule fois par ScoreDocument.
+    """
+
+    def __init__(self, data: Dict[str, Dict[str, Any]]):
+        self.data = data
+        self.models = sorted(data)
+        self.criteria: List[str] = []
+        self.model_means: Dict[str, Dict[str, Optional[float]]] = {}
+        seen = set()
+        for model in self.models:
+            values: Dict[str, List[float]] = {"overall": []}
+            for entry in data[model].values():
+                overall = entry.get("overall_score")
+                if isinstance(overall, (int, float)):
+                    values["overall"].append(overall)
+                for crit, score in (entry.get("breakdown") or {}).items():
+                    if isinstance(score, (int, float)):
+                        values.setdefault(crit, []).append(score)
+                        if crit not in seen:
+                            seen.add(crit)
+                            self.criteria.append(crit)
+            self.model_means[model] = {k: _mean(v) for k, v in values.items()}
+        self._rankings: Dict[str, List[str]] = {}
+
+    def ranking(self, sort: str = "overall") -> List[str]:
+        """
+        Modèles triés par moyenne décroissante de `sort` ("overall" ou un critère),
+        puis par nom ; les modèles sans valeur passent en dernier.
+        """
+        if sort != "overall" and sort not in self.criteria:
+            raise KeyError(sort)
+        if sort not in self._rankings:
+            def key(model: str) -> Tuple[bool, float, str]:
+                value = self.model_means[model].get(sort)
+                return (value is None, -(value or 0.0), model)
+            self._rankings[sort] = sorted(self.models, key=key)
+        return self._rankings[sort]
+
+    def cell(self, model: str, prompt_key: str,
+             criteria: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        entry = self.data.get(model, {}).get(prompt_key)
+        return None if entry is None else project_entry(entry, criteria)
+
+    def model_cells(self, model: str, criteria: Optional[Sequence[str]] = None,
+                    min_overall: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        cells = self.data.get(model)
+        if cells is None:
+            return None
+        return {
+            key: project_entry(entry, criteria)
+            for key, entry in cells.items()
+            if min_overall is None or (entry.get("overall_score") or 0.0) >= min_overall
+        }
+
+    def leaderboard(self, sort: str = "overall", limit: Optional[int] = None, offset: int = 0,
+                    min_overall: Optional[float] = None) -> Dict[str, Any]:
+        models = self.ranking(sort)
+        if min_overall is not None:
+            models = [m for m in models if (self.model_means[m].get("overall") or 0.0) >= min_overall]
+        page = models[offset:None if limit is None else offset + limit]
+        return {
+            "total": len(models),
+            "offset": offset,
+            "items": [
+                {"rank": offset + i + 1, "model": m, **self.model_means[m]}
+                for i, m in enumerate(page)
+            ],
+        }
+
+
+class ScoreDocument:
+    """
+    Version figée de scores.json : document parsé, octets JSON pré-sérialisés
+    et validateurs HTTP (ETag, Last-Modified) calculés une seule fois.
+    """
+
+    def __init__(self, data: Any, mtime: float):
+        self.data = data
+        self.body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.mtime = mtime
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self._index: Optional[ScoreIndex] = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def index(self) -> ScoreIndex:
+        # construit à la première requête filtrée, puis partagé jusqu'à la version suivante
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = ScoreIndex(self.data)
+        return self._index
+
+
+class ScoreStore:
+    """
+    Cache mémoire de scores.json, invalidé quand le fichier change
+    (mtime, inode ou taille). Tant que le fichier est identique, current()
+    ne coûte qu'un os.stat. Thread-safe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._document: Optional[ScoreDocument] = None
+
+    def current(self) -> ScoreDocument:
+        st = os.stat(self.path)
+        signature = (st.st_mtime_ns, st.st_ino, st.st_size)
+        document = self._document
+        if document is not None and signature == self._signature:
+            return document
+        with self._lock:
+            if self._document is None or signature != self._signature:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self._document = ScoreDocument(data, st.st_mtime)
+                self._signature = signature
+            return self._document
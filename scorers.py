@@ -0,0 +1,291 @@
+# backend/scorers.py
+
+import importlib
+import contextlib
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# --- 1) Registre des critères -------------------------------------------------
+
+# Classes de coût :
+#   "exec" : exécute le snippet (tests, chronométrage, tracemalloc) ; toujours
+#            en série sur le thread appelant, sous le réseau virtuel, pour que
+#            les mesures ne soient pas faussées par un autre thread
+#   "cpu"  : analyse en Python pur (AST, tokenize) ; sur le thread appelant,
+#            le GIL n'y gagnerait rien en threads
+#   "io"   : attend surtout un subprocess ou le réseau ; lancé dans un thread
+#            dès que ses entrées sont prêtes, en parallèle du reste
+COSTS = ("exec", "cpu", "io")
+
+# Entrées qu'un critère peut déclarer (passées dans cet ordre à sa fonction)
+INPUTS = (
+    "prompt_key",     # clé du prompt
+    "snippet",        # CompiledSnippet (source, AST, fonction résolue)
+    "source",         # source brut
+    "func",           # fonction résolue (le CompiledSnippet, pour la mémoïsation)
+    "passed",         # résultats de TEST_CASES (calculés une fois)
+    "total",
+    "features",       # le CompiledSnippet lui-même, comme func, une fois ses caractéristiques
+                      # extraites (un seul parcours AST + tokenize) ; relues par features_of
+    "sample_output",  # sortie d'exemple fournie par l'appelant
+)
+
+
+@dataclass(frozen=True)
+class Criterion:
+    """
+    Critère enregistré : fonction « module:fonction » appelée avec `inputs`,
+    après les critères de `after` (dont elle lit l'état, ex. les mesures du
+    benchmark). `cost` est une classe de COSTS, ou un « module:fonction »
+    qui la renvoie à l'exécution. Sans fonction résolue, un critère
+    `requires_func` vaut 0.0 sans être appelé. `stage` regroupe le critère
+    dans une étape d'instrumentation.
+    """
+    name: str
+    target: str
+    inputs: Tuple[str, ...] = ("snippet",)
+    after: Tuple[str, ...] = ()
+    cost: str = "cpu"
+    requires_func: bool = False
+    stage: Optional[str] = None
+
+
+# l'ordre du registre est celui du breakdown dans scores.json
+CRITERIA: Dict[str, Criterion] = {}
+
+
+def register(
+    name: str,
+    target: str,
+    inputs: Sequence[str] = ("snippet",),
+    after: Sequence[str] = (),
+    cost: str = "cpu",
+    requires_func: bool = False,
+    stage: Optional[str] = None,
+) -> Criterion:
+    """
+    Ajoute ou remplace un critère sans importer son module.
+    ValueError si une entrée ou une classe de coût est inconnue.
+    """
+    unknown = [i for i in inputs if i not in INPUTS]
+    if unknown:
+        raise ValueError(f"{name}: entrée(s) inconnue(s) {unknown}")
+    if cost not in COSTS and ":" not in cost:
+        raise ValueError(f"{name}: classe de coût inconnue {cost!r}")
+    criterion = CRITERIA[name] = Criterion(name, target, tuple(inputs), tuple(after), cost, requires_func, stage)
+    _resolved.pop(name, None)
+    return criterion
+
+
+_resolved: Dict[str, Callable[..., Any]] = {}
+
+register("correctness", "scoring:score_from_tests", ("passed", "total"), cost="exec", requires_func=True, stage="tests")
+register("robustness", "scoring:score_robustness", ("prompt_key", "func"), cost="exec", requires_func=True,
+         stage="tests")
+register("linguistic_bias", "scoring:score_linguistic_bias", ("prompt_key", "func"), cost="exec",
+         requires_func=True, stage="tests")
+register("performance", "scoring:score_performance", cost="exec", stage="performance")
+register("complexity", "scoring:score_complexity", after=("performance",))
+# rejoue seulement les tailles que le benchmark a pu chronométrer
+register("memory", "scoring:score_memory", after=("performance",), cost="exec", stage="memory")
+register("readability", "scoring:score_readability", cost="scorers:linter_cost", stage="readability")
+register("security", "scoring:score_security", ("features",), stage="static")
+register("comment_richness", "scoring:score_comment_richness", ("features",), stage="static")
+register("syntax_diversity", "scoring:score_syntax_diversity", ("features",), stage="static")
+register("logical_originality", "scoring:score_logical_originality", ("features",), stage="static")
+register("freedom_expression", "scoring:score_freedom_expression", ("prompt_key", "sample_output"))
+
+# critères calculés sur le source seul (sans exécuter le snippet)
+STATIC_CRITERIA = ("readability", "security", "comment_richness", "syntax_diversity", "logical_originality")
+
+
+def _import(target: str) -> Any:
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def get_scorer(name: str) -> Callable[..., Any]:
+    """
+    Fonction du critère `name`, importée à la première demande.
+    KeyError si le critère n'est pas enregistré.
+    """
+    scorer = _resolved.get(name)
+    if scorer is None:
+        scorer = _resolved[name] = _import(CRITERIA[name].target)
+    return scorer
+
+
+def get_scorers(names: Optional[Iterable[str]] = None) -> Dict[str, Callable[..., Any]]:
+    """
+    {nom: fonction} des critères demandés (tous si None), dans l'ordre du registre.
+    """
+    wanted: List[str] = list(CRITERIA) if names is None else list(names)
+    return {name: get_scorer(name) for name in wanted}
+
+
+def linter_cost() -> str:
+    """
+    flake8 en subprocess → "io" ; pycodestyle/pyflakes en process → "cpu".
+    """
+    from linting import get_linter
+    return "cpu" if get_linter().in_process else "io"
+
+
+def cost_of(criterion: Criterion) -> str:
+    return criterion.cost if criterion.cost in COSTS else _import(criterion.cost)()
+
+
+def uses_tests(names: Optional[Iterable[str]] = None) -> bool:
+    """
+    Vrai si l'un des critères `names` (tous si None) ou de leurs dépendances
+    exécute les TEST_CASES.
+    """
+    return any(c.stage == "tests" or "passed" in c.inputs for c in resolve(names))
+
+# --- 2) Résolution du graphe --------------------------------------------------
+
+def resolve(names: Optional[Iterable[str]] = None) -> List[Criterion]:
+    """
+    Critères à exécuter pour obtenir `names` (tous si None) : fermeture par
+    `after`, dans l'ordre du registre, chaque critère après ses dépendances.
+    KeyError pour un critère inconnu, ValueError pour un cycle.
+    """
+    wanted = list(CRITERIA) if names is None else list(names)
+    for name in wanted:
+        if name not in CRITERIA:
+            raise KeyError(name)
+    order: List[Criterion] = []
+    state: Dict[str, str] = {}
+
+    def visit(name: str) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"cycle de dépendances autour de {name!r}")
+        state[name] = "visiting"
+        for dep in CRITERIA[name].after:
+            visit(dep)
+        state[name] = "done"
+        order.append(CRITERIA[name])
+
+    rank = {name: i for i, name in enumerate(CRITERIA)}
+    for name in sorted(set(wanted), key=rank.__getitem__):
+        visit(name)
+    return order
+
+# --- 3) Exécution ---------------------------------------------------------------
+
+class _Inputs:
+    """
+    Entrées des critères d'une cellule, calculées à la première demande
+    (toujours sur le thread appelant).
+    """
+
+    def __init__(self, prompt_key: str, snippet: Any, test_return: Optional[Tuple[int, int]],
+                 sample_output: Any):
+        self.snippet = snippet
+        self.test_return = test_return
+        self.values: Dict[str, Any] = {
+            "prompt_key": prompt_key,
+            "snippet": snippet,
+            "source": snippet.source,
+            "func": snippet,
+            "sample_output": sample_output,
+        }
+
+    def get(self, name: str) -> Any:
+        if name not in self.values:
+            from scoring import features_of, run_tests_for
+            from instrumentation import stage
+            if name in ("passed", "total"):
+                passed, total = self.test_return or run_tests_for(self.values["prompt_key"], self.snippet)
+                self.values.update(passed=passed, total=total)
+            elif name == "features":
+                with stage("features"):
+                    features_of(self.snippet)
+                self.values["features"] = self.snippet
+        return self.values[name]
+
+    def args_for(self, criterion: Criterion) -> Optional[List[Any]]:
+        """
+        Arguments du critère, ou None s'il vaut 0.0 faute de fonction résolue.
+        """
+        if criterion.requires_func and self.snippet.func is None:
+            return None
+        return [self.get(i) for i in criterion.inputs]
+
+
+def _call(criterion: Criterion, args: Optional[List[Any]]) -> Any:
+    from instrumentation import stage
+    if args is None:
+        return 0.0
+    scorer = get_scorer(criterion.name)
+    if criterion.stage is None:
+        return scorer(*args)
+    with stage(criterion.stage):
+        return scorer(*args)
+
+
+def run_criteria(
+    prompt_key: str,
+    snippet: Any,
+    names: Optional[Iterable[str]] = None,
+    test_return: Optional[Tuple[int, int]] = None,
+    sample_output: Any = None,
+    io_workers: int = 4,
+) -> Dict[str, Any]:
+    """
+    Exécute les critères `names` (tous si None) et leurs dépendances sur un
+    CompiledSnippet ; renvoie {critère: score} pour les seuls critères
+    demandés, dans l'ordre du registre.
+    Les critères "io" partent dans des threads dès que leurs dépendances
+    sont calculées ; les autres s'exécutent en série sur le thread appelant,
+    dans l'ordre du graphe (les "exec" sous le réseau virtuel de netstub).
+    Les critères "cpu" ne partent pas dans des processus : le CompiledSnippet
+    (fonction exécutée, AST) ne se sérialise pas, et les cellules occupent
+    déjà chacune un processus du SandboxPool.
+    """
+    from netstub import stub_network
+
+    plan = resolve(names)
+    wanted = {c.name for c in plan} if names is None else set(names)
+    inputs = _Inputs(prompt_key, snippet, test_return, sample_output)
+    costs = {c.name: cost_of(c) for c in plan}
+    results: Dict[str, Any] = {}
+    pending: Dict[str, Future] = {}
+
+    # pas de threads si aucun critère n'est "io" (linter en process : cas courant)
+    with contextlib.ExitStack() as stack:
+        pool: Optional[ThreadPoolExecutor] = None
+        if "io" in costs.values():
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="criterion"))
+
+        def launch_ready() -> None:
+            for criterion in plan:
+                name = criterion.name
+                if costs[name] == "io" and name not in pending and all(d in results for d in criterion.after):
+                    # copie du contexte : l'instrumentation (ContextVar) suit le thread
+                    ctx = contextvars.copy_context()
+                    pending[name] = pool.submit(ctx.run, _call, criterion, inputs.args_for(criterion))
+
+        def settle(names: Iterable[str]) -> None:
+            for name in names:
+                if name not in results and name in pending:
+                    results[name] = pending[name].result()
+
+        launch_ready()
+        for criterion in plan:
+            if costs[criterion.name] == "io":
+                continue
+            settle(criterion.after)
+            if costs[criterion.name] == "exec":
+                with stub_network():
+                    results[criterion.name] = _call(criterion, inputs.args_for(criterion))
+            else:
+                results[criterion.name] = _call(criterion, inputs.args_for(criterion))
+            launch_ready()
+        settle(list(pending))
+
+    return {c: results[c] for c in CRITERIA if c in wanted}
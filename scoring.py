@@ -2,38 +2,178 @@
 
 import ast
 import re
-import timeit
-import logging
-import subprocess
-from typing import Any, Tuple, Dict, Union
+import time
+from dataclasses import dataclass, field
+from types import CodeType
+from typing import TYPE_CHECKING, Any, Tuple, Dict, Iterable, List, Optional, Set, Union
 
 from prompts import TEST_CASES
+from features import SnippetFeatures, extract_features
+from instrumentation import stage
+
+# Les machineries lourdes (benchmark, tracemalloc, linters, générateurs,
+# réseau virtuel) sont importées par le critère qui les utilise, au premier
+# appel : importer scoring (API, cache, historique, critères statiques seuls)
+# ne les charge pas. Voir scorers.py et tests/test_import_time.py.
+if TYPE_CHECKING:
+    from benchmark import Benchmark
+    from footprint import Footprint
+
+# À incrémenter dès qu'un scorer change de résultat : invalide le cache disque
+SCORER_VERSION = "11"
+
+# --- 0) Artefact compilé (parse / compile / exec une seule fois) -------------
+
+@dataclass
+class CompiledSnippet:
+    """
+    Snippet parsé, compilé et exécuté une seule fois, partagé par tous les critères.
+    `error` contient l'exception levée au parse ou à l'exécution, sinon None.
+    """
+    prompt_key: str
+    source: str
+    tree: Optional[ast.AST] = None
+    code: Optional[CodeType] = None
+    namespace: Dict[str, Any] = field(default_factory=dict)
+    func: Any = None
+    error: Optional[BaseException] = None
+    # résultats de TEST_CASES mémoïsés par prompt (voir run_test_cases)
+    test_runs: Dict[str, "TestRun"] = field(default_factory=dict)
+    # mesures du harnais de performance (voir score_performance)
+    benchmark: Optional["Benchmark"] = None
+    # empreinte mémoire par entrée (voir score_memory)
+    footprint: Optional["Footprint"] = None
+    # caractéristiques statiques, calculées à la première demande (voir features_of)
+    features: Optional[SnippetFeatures] = None
+    # critères interrompus par un budget de temps (résultat non reproductible)
+    budget_limited: Set[str] = field(default_factory=set)
+
+
+def compile_snippet(prompt_key: str, source: str) -> CompiledSnippet:
+    """
+    Parse le source en AST, le compile en code object puis l'exécute dans un
+    namespace unique (globals = locals, pour que les imports et helpers du
+    snippet restent visibles depuis la fonction) et résout la fonction
+    `prompt_key`.
+    """
+    snippet = CompiledSnippet(prompt_key, source)
+    try:
+        snippet.tree = ast.parse(source, filename="<string>")
+        snippet.code = compile(snippet.tree, "<string>", "exec")
+        exec(snippet.code, snippet.namespace)
+    except Exception as e:
+        snippet.error = e
+        return snippet
+    func = snippet.namespace.get(prompt_key)
+    snippet.func = func if callable(func) else None
+    return snippet
+
+
+Snippet = Union[str, CompiledSnippet]
+
+
+def _source_of(code: Snippet) -> str:
+    return code.source if isinstance(code, CompiledSnippet) else code
+
+
+def _func_of(func: Any) -> Any:
+    return func.func if isinstance(func, CompiledSnippet) else func
+
+
+def features_of(code: Snippet) -> SnippetFeatures:
+    """
+    Caractéristiques statiques du snippet (un seul parcours AST + tokenize),
+    mémoïsées sur le CompiledSnippet et partagées par les critères statiques.
+    """
+    if not isinstance(code, CompiledSnippet):
+        return extract_features(code)
+    if code.features is None:
+        code.features = extract_features(code.source, code.tree)
+    return code.features
 
 # --- 1) Test-based scoring (Correctness & Robustness) -----------------------
 
+@dataclass
+class CaseResult:
+    """
+    Résultat d'un cas de TEST_CASES : succès, type d'exception levée, durée.
+    """
+    args: Tuple[Any, ...]
+    passed: bool
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+@dataclass
+class TestRun:
+    """
+    Exécution complète de TEST_CASES[prompt_key] sur une fonction.
+    Calculée une fois par (snippet, prompt) et consommée par tous les critères
+    dérivés des tests (correctness, robustness, linguistic_bias).
+    """
+    __test__ = False  # pas une classe de test pytest
+
+    prompt_key: str
+    cases: List[CaseResult] = field(default_factory=list)
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for c in self.cases if c.passed)
+
+    @property
+    def total(self) -> int:
+        return len(self.cases)
+
+    @property
+    def counts(self) -> Tuple[int, int]:
+        return self.passed, self.total
+
+
+def _run_case(func: Any, args: Tuple[Any, ...], expected: Any) -> CaseResult:
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        # Si on attendait cette exception, succès
+        ok = isinstance(expected, type) and isinstance(e, expected)
+        return CaseResult(args, ok, type(e).__name__, time.perf_counter() - start)
+    duration = time.perf_counter() - start
+    # Si on attendait une exception, on échoue
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        return CaseResult(args, False, None, duration)
+    # Sinon on compare la valeur
+    if expected is str:
+        return CaseResult(args, isinstance(result, str), None, duration)
+    return CaseResult(args, bool(result == expected), None, duration)
+
+
+def run_test_cases(prompt_key: str, func: Any) -> TestRun:
+    """
+    Lance TEST_CASES[prompt_key] sur func et renvoie le résultat détaillé.
+    Avec un CompiledSnippet, le résultat est mémoïsé sur l'artefact : les
+    appels suivants pour le même prompt ne ré-exécutent pas le code.
+    """
+    snippet = func if isinstance(func, CompiledSnippet) else None
+    if snippet is not None and prompt_key in snippet.test_runs:
+        return snippet.test_runs[prompt_key]
+
+    fn = _func_of(func)
+    run = TestRun(prompt_key)
+    for args, expected in TEST_CASES.get(prompt_key, []):
+        run.cases.append(_run_case(fn, args, expected))
+
+    if snippet is not None:
+        snippet.test_runs[prompt_key] = run
+    return run
+
+
 def run_tests_for(prompt_key: str, func: Any) -> Tuple[int, int]:
     """
-    Lance tous les tests définis dans TEST_CASES[prompt_key] sur la fonction func.
+    Lance tous les tests définis dans TEST_CASES[prompt_key] sur la fonction func
+    (ou sur la fonction résolue d'un CompiledSnippet, avec mémoïsation).
     Retourne (nb_passés, nb_total).
     """
-    passed = 0
-    cases = TEST_CASES.get(prompt_key, [])
-    for args, expected in cases:
-        try:
-            result = func(*args)
-            # Si on attendait une exception, on échoue
-            if isinstance(expected, type) and issubclass(expected, Exception):
-                continue
-            # Sinon on compare la valeur
-            if expected is str and isinstance(result, str):
-                passed += 1
-            elif result == expected:
-                passed += 1
-        except Exception as e:
-            # Si on attendait cette exception, succès
-            if isinstance(expected, type) and isinstance(e, expected):
-                passed += 1
-    return passed, len(cases)
+    return run_test_cases(prompt_key, func).counts
 
 def score_from_tests(passed: int, total: int) -> float:
     """
@@ -46,14 +186,26 @@ def score_from_tests(passed: int, total: int) -> float:
 
 # --- 2) Performance ---------------------------------------------------------
 
-def score_performance(code_str: str, setup: str = "", number: int = 1000) -> float:
+def score_performance(code: Snippet, setup: str = "", number: int = 1000) -> float:
     """
-    Mesure le temps moyen d'exécution d'un snippet
+    Mesure le temps d'exécution d'un snippet
     et le convertit en score [1.0…5.0], où plus rapide est meilleur.
-    ATTENTION : NE PAS UTILISER pour get_current_joke (appels réseau).
+    Avec un CompiledSnippet, la fonction résolue passe par le harnais de
+    benchmark.py (arguments réels de TEST_CASES + entrées mises à l'échelle,
+    number auto-calibré, médiane/p95 par appel) ; les mesures sont conservées
+    dans `code.benchmark`. Avec une chaîne, `code` est l'instruction timeit.
+    Les prompts réseau (get_current_joke) doivent être chronométrés sous
+    netstub.stub_network(), comme le fait score_code.
     """
+    if isinstance(code, CompiledSnippet):
+        if code.func is None:
+            return 0.0
+        from benchmark import run_benchmark, score_benchmark
+        code.benchmark = run_benchmark(code.prompt_key, code.func)
+        return score_benchmark(code.benchmark)
+    import timeit
     try:
-        timer = timeit.Timer(code_str, setup=setup)
+        timer = timeit.Timer(code, setup=setup)
         times = timer.repeat(repeat=3, number=number)
         avg = sum(times) / len(times)
         if avg <= 0.001:
@@ -65,53 +217,71 @@ def score_performance(code_str: str, setup: str = "", number: int = 1000) -> flo
     except Exception:
         return 0.0
 
+def score_memory(code: CompiledSnippet) -> float:
+    """
+    Empreinte mémoire [1.0…5.0] de la fonction résolue, mesurée sous
+    tracemalloc sur les entrées du benchmark (voir footprint.py) ; les pics
+    et blocs bruts sont conservés dans `code.footprint`. Si le benchmark a
+    déjà tourné, seules les tailles qu'il a pu chronométrer sont rejouées.
+    """
+    if code.func is None:
+        return 0.0
+    sizes = [t.size for t in code.benchmark.scaled] if code.benchmark is not None else None
+    from footprint import run_footprint, score_footprint
+    code.footprint = run_footprint(code.prompt_key, code.func, sizes)
+    return score_footprint(code.footprint)
+
+def score_complexity(code: CompiledSnippet) -> Optional[Dict[str, Any]]:
+    """
+    Classe de complexité empirique ajustée sur `code.benchmark` (à mesurer
+    d'abord avec score_performance) ; dict ignoré par la moyenne globale,
+    None si les mesures ne suffisent pas.
+    """
+    if code.benchmark is None:
+        return None
+    from benchmark import fit_complexity
+    fit = fit_complexity(code.benchmark)
+    return fit.as_dict() if fit is not None else None
+
 # --- 3) Readability ---------------------------------------------------------
 
-def score_readability(code_str: str) -> float:
+def _readability_from_warnings(n: Optional[int]) -> float:
+    if n is None:
+        return 0.0
+    if n == 0:
+        return 5.0
+    if n >= 20:
+        return 1.0
+    score = 5.0 - (n / 20.0) * 4.0
+    return round(score, 1)
+
+def score_readability(code: Snippet) -> float:
     """
-    Lance flake8 en subprocess pour compter les warnings.
+    Compte les warnings flake8 (pycodestyle + pyflakes, en process).
     Peu de warnings → meilleur score.
     """
-    try:
-        p = subprocess.run(
-            ["flake8", "--stdin-display-name", "<string>", "-"],
-            input=code_str.encode(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            check=False
-        )
-        warnings = p.stdout.decode().splitlines()
-        n = len(warnings)
-        if n == 0:
-            return 5.0
-        if n >= 20:
-            return 1.0
-        score = 5.0 - (n / 20.0) * 4.0
-        return round(score, 1)
-    except FileNotFoundError:
-        logging.warning("flake8 non installé, readability → 0")
-        return 0.0
+    from linting import get_linter
+    tree = code.tree if isinstance(code, CompiledSnippet) else None
+    return _readability_from_warnings(get_linter().count(_source_of(code), tree))
+
+def score_readability_many(codes: List[Snippet]) -> List[float]:
+    """
+    Mode batch de score_readability : un seul appel au linter pour tout le lot.
+    """
+    from linting import get_linter
+    counts = get_linter().count_many(_source_of(c) for c in codes)
+    return [_readability_from_warnings(n) for n in counts]
 
 # --- 4) Comment richness ----------------------------------------------------
 
-def score_comment_richness(code_str: str) -> float:
+def score_comment_richness(code: Snippet) -> float:
     """
     Ratio de lignes de commentaires (+docstrings) sur le total.
     """
-    lines = code_str.splitlines()
-    if not lines:
+    features = features_of(code)
+    if not features.total_lines:
         return 0.0
-    comment_lines = 0
-    in_doc = False
-    for ln in lines:
-        stripped = ln.strip()
-        if stripped.startswith('"""') or stripped.startswith("'''"):
-            if not in_doc:
-                comment_lines += 1
-            in_doc = not in_doc
-        elif in_doc or stripped.startswith("#"):
-            comment_lines += 1
-    ratio = comment_lines / len(lines)
+    ratio = (features.comment_lines + features.docstring_lines) / features.total_lines
     if ratio >= 0.2:
         return 5.0
     score = 1.0 + (ratio / 0.2) * 4.0
@@ -119,37 +289,32 @@ def score_comment_richness(code_str: str) -> float:
 
 # --- 5) Security ------------------------------------------------------------
 
-def score_security(code_str: str) -> float:
+def score_security(code: Snippet) -> float:
     """
-    Scanne le AST pour détecter les patterns dangereux (exec, eval, subprocess).
-    Renvoie 1.0 (très mauvais) si trouvé, 5.0 sinon.
+    Détecte les appels dangereux (exec, eval, subprocess) relevés dans l'AST.
+    Renvoie 1.0 (très mauvais) si trouvé, 5.0 sinon, 0.0 si non parsable.
     """
-    try:
-        tree = ast.parse(code_str)
-        bad = False
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call) and getattr(node.func, "id", "") in ("eval", "exec"):
-                bad = True
-            if isinstance(node, ast.Call) and getattr(node.func, "attr", "") in ("Popen", "system"):
-                bad = True
-        return 1.0 if bad else 5.0
-    except Exception:
+    features = features_of(code)
+    if not features.parsed:
         return 0.0
+    return 1.0 if features.dangerous_calls else 5.0
 
 # --- 6) Syntax diversity ----------------------------------------------------
 
-def analyze_syntax_diversity(code_str: str) -> int:
+def analyze_syntax_diversity(code: Snippet) -> int:
     """
     Nombre de nœuds AST distincts.
     """
-    tree = ast.parse(code_str)
-    return len({type(node).__name__ for node in ast.walk(tree)})
+    features = features_of(code)
+    if not features.parsed:
+        raise SyntaxError("snippet non parsable")
+    return features.distinct_kinds
 
-def score_syntax_diversity(code_str: str) -> float:
+def score_syntax_diversity(code: Snippet) -> float:
     """
     Normalise la diversité AST en [1.0…5.0].
     """
-    kinds = analyze_syntax_diversity(code_str)
+    kinds = analyze_syntax_diversity(code)
     if kinds <= 20:
         return 1.0
     if kinds >= 80:
@@ -160,19 +325,31 @@ def score_syntax_diversity(code_str: str) -> float:
 # --- 7) Advanced criteria stubs ---------------------------------------------
 
 def score_robustness(prompt_key: str, func: Any) -> float:
-    passed, total = run_tests_for(prompt_key, func)
-    return score_from_tests(passed, total)
+    """
+    Part des familles de propriétés (generators.py) passées sans contre-exemple,
+    normalisée en [1.0…5.0]. Pour un prompt sans générateurs, ou si le budget
+    de temps n'a permis de terminer aucune famille : score des TEST_CASES.
+    Un run interrompu par le budget est signalé sur le CompiledSnippet
+    (`budget_limited`) : l'entrée de la cellule ne sera pas mise en cache.
+    """
+    from generators import run_properties
+    run = run_properties(prompt_key, _func_of(func))
+    if run is not None and run.truncated and isinstance(func, CompiledSnippet):
+        func.budget_limited.add("robustness")
+    if run is None or not run.complete:
+        return score_from_tests(*run_tests_for(prompt_key, func))
+    return round(1.0 + 4.0 * run.passed / len(run.complete), 1)
 
 def score_linguistic_bias(prompt_key: str, func: Any) -> float:
     if prompt_key != "multilingual_palindrome_test":
         return 0.0
-    passed, total = run_tests_for(prompt_key, func)
-    return score_from_tests(passed, total)
+    return score_from_tests(*run_tests_for(prompt_key, func))
 
-def score_logical_originality(code_str: str) -> float:
-    tree = ast.parse(code_str)
-    calls = {type(node.func).__name__ for node in ast.walk(tree) if isinstance(node, ast.Call)}
-    unique = len(calls)
+def score_logical_originality(code: Snippet) -> float:
+    features = features_of(code)
+    if not features.parsed:
+        raise SyntaxError("snippet non parsable")
+    unique = len(features.call_func_kinds)
     if unique <= 1:
         return 1.0
     if unique >= 10:
@@ -189,52 +366,35 @@ def score_freedom_expression(prompt_key: str, output: Any) -> float:
 
 def score_code(
     prompt_key: str,
-    code_str: str,
+    code_str: Snippet,
     func: Any = None,
     test_return: Union[Tuple[int,int], None] = None,
-    sample_output: Any = None
+    sample_output: Any = None,
+    criteria: Optional[Iterable[str]] = None,
 ) -> Dict[str, float]:
     """
     Renvoie un dict {criterion: score} pour un prompt donné.
+    `code_str` peut être le source brut ou un CompiledSnippet déjà construit ;
+    le snippet n'est alors ni re-parsé ni ré-exécuté. Les TEST_CASES ne sont
+    exécutés qu'une fois (résultat mémoïsé sur l'artefact) ; si `test_return`
+    (passed, total) est fourni, il est utilisé tel quel pour correctness.
+    `criteria` restreint le calcul à ces critères (et à leurs dépendances,
+    cf. scorers.resolve) ; seuls ceux demandés sont renvoyés.
+    Un CompiledSnippet fourni doit avoir été compilé sous stub_network() si le
+    snippet importe directement urlopen.
     """
-    scores: Dict[str, float] = {}
+    from netstub import stub_network
+    from scorers import run_criteria
 
-    # 1) compile + correctness, robustness, linguistic_bias
-    local_ns = {}
-    try:
-        exec(code_str, {}, local_ns)
-        fn = func or local_ns.get(prompt_key)
-    except Exception:
-        fn = None
-
-    if fn:
-        passed, total = run_tests_for(prompt_key, fn)
-        scores["correctness"]      = score_from_tests(passed, total)
-        scores["robustness"]       = score_robustness(prompt_key, fn)
-        scores["linguistic_bias"]  = score_linguistic_bias(prompt_key, fn)
-    else:
-        for k in ("correctness","robustness","linguistic_bias"):
-            scores[k] = 0.0
-
-    # 2) performance (skip réseau pour get_current_joke)
-    if prompt_key == "get_current_joke":
-        scores["performance"] = 0.0
-    else:
-        stmt = f"{prompt_key}()" if fn else "0"
-        setup = code_str + "\n"
-        scores["performance"] = score_performance(stmt, setup=setup)
-
-    # 3) readability
-    scores["readability"]         = score_readability(code_str)
-    # 4) security
-    scores["security"]            = score_security(code_str)
-    # 5) comment richness
-    scores["comment_richness"]    = score_comment_richness(code_str)
-    # 6) syntax diversity
-    scores["syntax_diversity"]    = score_syntax_diversity(code_str)
-    # 7) logical originality
-    scores["logical_originality"] = score_logical_originality(code_str)
-    # 8) freedom of expression
-    scores["freedom_expression"]  = score_freedom_expression(prompt_key, sample_output)
-
-    return scores
+    # compile une seule fois, sous le réseau virtuel (netstub)
+    with stub_network():
+        if isinstance(code_str, CompiledSnippet):
+            snippet = code_str
+        else:
+            with stage("compile"):
+                snippet = compile_snippet(prompt_key, code_str)
+    if func is not None and func is not snippet.func:
+        snippet.func = func
+        snippet.test_runs.clear()
+
+    return run_criteria(prompt_key, snippet, criteria, test_return, sample_output)
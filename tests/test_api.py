@@ -0,0 +1,162 @@
+import os
+import json
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import api
+from score_store import ScoreStore
+
+SCORES = {"m1": {"is_palindrome": {"overall_score": 4.2}}}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / "scores.json"
+    path.write_text(json.dumps(SCORES), encoding="utf-8")
+    monkeypatch.setattr(api, "store", ScoreStore(str(path)))
+    return TestClient(api.app), path
+
+
+def test_scores_served_with_validators(client):
+    c, _ = client
+    r = c.get("/api/scores")
+    assert r.status_code == 200
+    assert r.json() == SCORES
+    assert r.headers["etag"] and r.headers["last-modified"]
+
+
+def test_conditional_get_returns_304_until_file_changes(client):
+    c, path = client
+    etag = c.get("/api/scores").headers["etag"]
+    r = c.get("/api/scores", headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+
+    path.write_text(json.dumps({"m2": {}}), encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    r = c.get("/api/scores", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.json() == {"m2": {}}
+    assert r.headers["etag"] != etag
+
+
+FLEET = {
+    "alpha": {
+        "p1": {"overall_score": 4.0, "breakdown": {"performance": 5.0, "security": 3.0}},
+        "p2": {"overall_score": 2.0, "breakdown": {"performance": 1.0, "security": 3.0}},
+    },
+    "beta": {
+        "p1": {"overall_score": 4.5, "breakdown": {"performance": 2.0, "security": 5.0}},
+        "p2": {"overall_score": 4.5, "breakdown": {"performance": 2.0, "security": 5.0}},
+    },
+    "gamma": {
+        "p1": {"overall_score": 1.0, "breakdown": {"performance": 4.0, "security": 1.0}},
+    },
+}
+
+
+@pytest.fixture
+def fleet_client(tmp_path, monkeypatch):
+    path = tmp_path / "scores.json"
+    path.write_text(json.dumps(FLEET), encoding="utf-8")
+    monkeypatch.setattr(api, "store", ScoreStore(str(path)))
+    return TestClient(api.app)
+
+
+def test_model_and_cell_queries(fleet_client):
+    c = fleet_client
+    r = c.get("/api/scores/alpha", params={"criteria": "security", "min_overall": 3.5})
+    assert r.json() == {"p1": {"overall_score": 4.0, "breakdown": {"security": 3.0}}}
+    r = c.get("/api/scores/beta/p2", params={"criteria": "performance"})
+    assert r.json()["breakdown"] == {"performance": 2.0}
+    assert c.get("/api/scores/nope").status_code == 404
+    assert c.get("/api/scores/alpha/nope").status_code == 404
+
+
+def test_leaderboard_sorting_and_pagination(fleet_client):
+    c = fleet_client
+    board = c.get("/api/leaderboard").json()
+    assert [i["model"] for i in board["items"]] == ["beta", "alpha", "gamma"]
+    assert board["items"][0] == {"rank": 1, "model": "beta", "overall": 4.5,
+                                 "performance": 2.0, "security": 5.0}
+    page = c.get("/api/leaderboard", params={"sort": "performance", "limit": 1, "offset": 1}).json()
+    assert page["total"] == 3 and [i["model"] for i in page["items"]] == ["alpha"]
+    assert page["items"][0]["rank"] == 2
+    assert c.get("/api/leaderboard", params={"min_overall": 2.0}).json()["total"] == 2
+    assert c.get("/api/leaderboard", params={"sort": "nope"}).status_code == 400
+
+
+def test_filtered_full_document_and_conditional_get(fleet_client):
+    c = fleet_client
+    r = c.get("/api/scores", params={"criteria": "performance", "limit": 2})
+    assert list(r.json()) == ["alpha", "beta"]
+    assert r.json()["beta"]["p1"]["breakdown"] == {"performance": 2.0}
+    again = c.get("/api/scores", params={"criteria": "performance", "limit": 2},
+                  headers={"If-None-Match": r.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_stream_replays_results_log(tmp_path, monkeypatch):
+    from results_log import ResultsLog
+    log = ResultsLog(str(tmp_path / "scores.ndjson"))
+    log.reset()
+    log.append("m1", "p1", "d1", {"overall_score": 3.0})
+    log.append("m1", "p2", "d2", {"overall_score": 4.0})
+    monkeypatch.setattr(api, "log_path", log.path)
+    r = TestClient(api.app).get("/api/stream/scores", params={"from_start": True, "follow": False})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in r.text.splitlines() if line.startswith("data: ")]
+    assert [(e["model"], e["prompt"]) for e in events] == [("m1", "p1"), ("m1", "p2")]
+
+
+def test_model_named_stream_is_reachable(tmp_path, monkeypatch):
+    path = tmp_path / "scores.json"
+    path.write_text(json.dumps({"stream": {"is_palindrome": {"overall_score": 4.2}}}), encoding="utf-8")
+    monkeypatch.setattr(api, "store", ScoreStore(str(path)))
+    r = TestClient(api.app).get("/api/scores/stream")
+    assert r.status_code == 200 and r.json() == {"is_palindrome": {"overall_score": 4.2}}
+
+
+def test_evaluate_job_lifecycle(monkeypatch):
+    import time
+    from jobs import JobManager
+    monkeypatch.setattr(api, "jobs", JobManager(workers=1, per_client=1))
+    with TestClient(api.app) as c:
+        assert c.post("/api/evaluate", json={"prompt_key": "nope", "code": "x"}).status_code == 422
+        assert c.post("/api/evaluate", json={"model": "m"}).status_code == 422
+        r = c.post("/api/evaluate", json={"prompt_key": "second_largest",
+                                          "code": "def second_largest(xs):\n    return sorted(set(xs))[-2]\n"})
+        assert r.status_code == 202
+        job_id = r.json()["job_id"]
+        # limite par client : un seul job actif à la fois
+        assert c.post("/api/evaluate", json={"prompt_key": "second_largest", "code": "x"}).status_code == 429
+        for _ in range(300):
+            job = c.get(f"/api/jobs/{job_id}").json()
+            if job["status"] not in ("queued", "running"):
+                break
+            time.sleep(0.1)
+        assert job["status"] == "done"
+        assert job["result"]["second_largest"]["test_counts"]["total"] == 2
+        assert c.get("/api/jobs/unknown").status_code == 404
+
+
+def test_runs_compare_endpoint(client, tmp_path, monkeypatch):
+    from run_history import RunHistory
+    c, _ = client
+    monkeypatch.setattr(api, "history", RunHistory(str(tmp_path / "runs.sqlite")))
+    assert c.get("/api/runs").json() == []
+    assert c.get("/api/runs/compare").status_code == 404
+    for _ in range(2):
+        api.history.finish_run(api.history.start_run())
+    r = c.get("/api/runs/compare")
+    assert r.status_code == 200 and r.json()["regressions"] == 0
+
+
+def test_metrics_endpoint(client):
+    c, _ = client
+    c.get("/api/scores")
+    r = c.get("/metrics")
+    assert r.status_code == 200
+    assert 'path="/api/scores",status="200"' in r.text
@@ -0,0 +1,36 @@
+import json
+
+from benchmarks.fleet import PATHOLOGICAL, generate_fleet
+from benchmarks.suite import compare_reports
+from prompts import PROMPT_KEYS
+
+TEMPLATES = {key: [f"def {key}(*args):\n    return None\n"] for key in PROMPT_KEYS}
+
+
+def test_fleet_is_reproducible_and_unique_per_model(tmp_path):
+    a = generate_fleet(str(tmp_path / "a"), 3, templates=TEMPLATES, seed=1)
+    generate_fleet(str(tmp_path / "b"), 3, templates=TEMPLATES, seed=1)
+    assert a == ["bench_0000", "bench_0001", "bench_0002"]
+    first = json.loads((tmp_path / "a" / "bench_0000.json").read_text(encoding="utf-8"))
+    assert first == json.loads((tmp_path / "b" / "bench_0000.json").read_text(encoding="utf-8"))
+    second = json.loads((tmp_path / "a" / "bench_0001.json").read_text(encoding="utf-8"))
+    # une marque par modèle : pas de hit de cache d'un modèle à l'autre
+    assert first["is_palindrome"] != second["is_palindrome"]
+
+
+def test_large_and_pathological_snippets(tmp_path):
+    generate_fleet(str(tmp_path), 1, size="large", templates=TEMPLATES)
+    large = json.loads((tmp_path / "bench_0000.json").read_text(encoding="utf-8"))
+    assert large["second_largest"].count("\n") > 400
+
+    generate_fleet(str(tmp_path), 4, pathological=1.0, templates=TEMPLATES)
+    cells = [c for m in range(4) for c in json.loads(
+        (tmp_path / f"bench_{m:04d}.json").read_text(encoding="utf-8")).values()]
+    assert all("pathological:" in c for c in cells)
+    assert {c.split("pathological:")[1].split("\n")[0] for c in cells} <= set(PATHOLOGICAL)
+
+
+def test_compare_reports_ratios_timings_only():
+    old = {"meta": {"x_seconds": 1.0}, "api": {"p": {"p95_ms": 10.0, "n": 5}}}
+    new = {"meta": {"x_seconds": 9.0}, "api": {"p": {"p95_ms": 15.0, "n": 5}}}
+    assert compare_reports(old, new) == {"api.p.p95_ms": 1.5}
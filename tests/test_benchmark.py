@@ -0,0 +1,89 @@
+from benchmark import Benchmark, Timing, benchmark_inputs, fit_complexity, run_benchmark, score_benchmark, time_call
+from scoring import compile_snippet, score_performance
+
+LINEAR = "def second_largest(numbers):\n    return sorted(set(numbers))[-2]\n"
+
+
+def test_inputs_use_real_args_and_scaled_sizes():
+    inputs = benchmark_inputs("second_largest")
+    # le cas qui doit lever ValueError n'est pas chronométré
+    assert inputs[0] == (None, ([1, 2, 3, 2],))
+    assert [size for size, _ in inputs[1:]] == [10, 100, 1_000, 10_000, 100_000]
+    assert len(inputs[-1][1][0]) == 100_000
+
+
+def test_scaled_extreme_numbers_are_finite():
+    import math
+    for size, (values,) in benchmark_inputs("extreme_numbers_test"):
+        if size is not None:
+            assert len(values) == size and all(math.isfinite(v) for v in values)
+            assert max(abs(v) for v in values) > 1e300
+
+
+def test_function_with_arguments_is_actually_timed():
+    snippet = compile_snippet("second_largest", LINEAR)
+    score = score_performance(snippet)
+    assert score > 0.0
+    sizes = [t.size for t in snippet.benchmark.timings]
+    assert sizes[0] is None and 10 in sizes
+    assert all(t.p95 >= t.median > 0 and t.number >= 1 for t in snippet.benchmark.timings)
+
+
+def test_every_timed_call_gets_unmodified_input():
+    seen = []
+
+    def sort_in_place(values):
+        seen.append(values == sorted(values))
+        values.sort()
+
+    data = [3, 1, 2] * 10
+    timing = time_call(sort_in_place, (data,))
+    assert len(seen) > timing.number and not any(seen)
+    assert data == [3, 1, 2] * 10
+
+
+def test_scaling_score_penalizes_quadratic_growth():
+    linear = Benchmark("x", [Timing(1_000, 1e-4, 1e-4, 1), Timing(100_000, 1e-2, 1e-2, 1)])
+    quadratic = Benchmark("x", [Timing(1_000, 1e-4, 1e-4, 1), Timing(100_000, 1.0, 1.0, 1)])
+    assert score_benchmark(linear) == 5.0
+    assert score_benchmark(quadratic) == 1.0
+
+
+def test_failing_inputs_are_skipped():
+    bench = run_benchmark("second_largest", lambda numbers: 1 / 0)
+    assert bench.timings == [] and score_benchmark(bench) == 0.0
+
+
+def _bench(f):
+    sizes = (10, 100, 1_000, 10_000, 100_000)
+    return Benchmark("x", [Timing(n, 2e-7 + f(n), 0.0, 1) for n in sizes])
+
+
+def test_complexity_fit_recovers_class_and_constants():
+    import math
+    fit = fit_complexity(_bench(lambda n: 3e-8 * n))
+    assert fit.complexity == "O(n)"
+    assert math.isclose(fit.constant, 3e-8, rel_tol=1e-6) and math.isclose(fit.overhead, 2e-7, rel_tol=1e-3)
+    assert fit_complexity(_bench(lambda n: 1e-8 * n * math.log(n))).complexity == "O(n log n)"
+    assert fit_complexity(_bench(lambda n: 1e-9 * n * n)).complexity == "O(n^2)"
+    assert fit_complexity(_bench(lambda n: 0.0)).complexity == "O(1)"
+    assert score_benchmark(_bench(lambda n: 1e-9 * n * n)) == 1.0
+
+
+def test_fit_uses_best_time_and_reports_noise_as_unresolved():
+    sizes = (10, 100, 1_000, 10_000, 100_000)
+    # médianes gonflées par la charge aux grandes tailles, minima propres
+    noisy = Benchmark("x", [Timing(n, 3e-8 * n * (1 + n / 20_000), 0.0, 1, 3e-8 * n) for n in sizes])
+    assert fit_complexity(noisy).complexity == "O(n)"
+    jitter = Benchmark("x", [Timing(n, 0.0, 0.0, 1, 3e-8 * n * (4.0 if i % 2 else 1.0)) for i, n in enumerate(sizes)])
+    fit = fit_complexity(jitter)
+    assert fit.complexity == "unresolved" and not fit.resolved and fit.fit_error > 0.25
+    # score d'après la pente des deux plus grandes tailles (×4 puis ×1 : pente < 1), pas d'après la classe
+    assert score_benchmark(jitter) == 5.0
+
+
+def test_quadratic_function_stops_before_projected_blowup():
+    bench = run_benchmark("second_largest", lambda xs: sum(1 for i in xs for j in xs))
+    # la projection suit la pente mesurée : 10 000 éléments ne sont pas tentés
+    assert max(t.size for t in bench.scaled) <= 1_000
+    assert fit_complexity(bench).complexity == "O(n^2)"
@@ -0,0 +1,156 @@
+import pytest
+from prompts import PROMPT_KEYS
+from evaluate_models import evaluate_all, list_models
+
+
+def _stable(report):
+    # la performance dépend du chronométrage : on l'exclut de la comparaison
+    return {
+        model: {
+            key: (ent["present"], ent["error"], ent["test_counts"])
+            for key, ent in prompts.items()
+        }
+        for model, prompts in report.items()
+    }
+
+
+def test_parallel_report_matches_serial():
+    models = list_models()[:2]
+    serial = evaluate_all(models, workers=1)
+    parallel = evaluate_all(models, workers=2)
+    assert list(parallel) == models
+    for model in models:
+        assert list(parallel[model]) == PROMPT_KEYS
+    assert _stable(parallel) == _stable(serial)
+
+
+def test_runaway_snippet_is_recorded_as_timeout(tmp_path, monkeypatch):
+    import json
+    import evaluate_models
+    from sandbox import SandboxLimits
+
+    responses = {"is_palindrome": "while True:\n    pass\n"}
+    (tmp_path / "runaway.json").write_text(json.dumps(responses), encoding="utf-8")
+    monkeypatch.setattr(evaluate_models, "RESP_DIR", str(tmp_path))
+
+    limits = SandboxLimits(timeout=1.0, cpu_seconds=None)
+    report = evaluate_all(["runaway"], workers=2, limits=limits)
+    entry = report["runaway"]["is_palindrome"]
+    assert entry["present"] is True
+    assert entry["error"].startswith("timeout:")
+    assert report["runaway"]["second_largest"]["error"] == "missing code"
+
+
+DEEP = "def is_palindrome(t):\n    x = " + "+".join(["1"] * 400) + "\n    return t == t[::-1]\n"
+
+
+def test_snippet_crashing_the_scorer_does_not_abort_the_run(tmp_path, monkeypatch):
+    import json
+    import evaluate_models
+
+    responses = {"is_palindrome": DEEP, "second_largest": "def second_largest(n):\n    return sorted(set(n))[-2]\n"}
+    (tmp_path / "deep.json").write_text(json.dumps(responses), encoding="utf-8")
+    monkeypatch.setattr(evaluate_models, "RESP_DIR", str(tmp_path))
+
+    report = evaluate_all(["deep"], workers=2)
+    # pyflakes y lève RecursionError : readability retombe à 0, le reste est scoré
+    assert report["deep"]["is_palindrome"]["error"] is None
+    assert report["deep"]["is_palindrome"]["breakdown"]["readability"] == 0.0
+    assert report["deep"]["second_largest"]["test_counts"]["passed"] > 0
+
+
+def test_streaming_run_resumes_from_log(tmp_path, monkeypatch):
+    import json
+    import evaluate_models
+    from results_log import ResultsLog
+
+    resp = tmp_path / "responses"
+    resp.mkdir()
+    responses = {"is_palindrome": "def is_palindrome(t):\n    return t == t[::-1]\n"}
+    (resp / "tiny.json").write_text(json.dumps(responses), encoding="utf-8")
+    monkeypatch.setattr(evaluate_models, "RESP_DIR", str(resp))
+    log = ResultsLog(str(tmp_path / "scores.ndjson"))
+    out = tmp_path / "scores.json"
+
+    from run_history import RunHistory
+    history = RunHistory(str(tmp_path / "runs.sqlite"))
+    scored = evaluate_models.run_streaming(["tiny"], log, str(out), history=history)
+    assert scored == len(PROMPT_KEYS)
+    [run] = history.runs()
+    assert run["cells"] == len(PROMPT_KEYS) and run["finished_at"] is not None
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert list(report["tiny"]) == PROMPT_KEYS
+    assert report["tiny"]["is_palindrome"]["test_counts"]["total"] == 3
+
+    assert evaluate_models.run_streaming(["tiny"], log, str(out), resume=True) == 0
+    responses["is_palindrome"] = "def is_palindrome(t):\n    return True\n"
+    (resp / "tiny.json").write_text(json.dumps(responses), encoding="utf-8")
+    assert evaluate_models.run_streaming(["tiny"], log, str(out), resume=True) == 1
+    assert json.loads(out.read_text(encoding="utf-8")) != report
+    import score_matrix
+    assert (tmp_path / "scores.npz").exists() or score_matrix.np is None
+
+
+def test_subset_run_merges_into_existing_report(tmp_path, monkeypatch):
+    import json
+    import evaluate_models
+    from results_log import ResultsLog
+
+    resp = tmp_path / "responses"
+    resp.mkdir()
+    (resp / "a.json").write_text(json.dumps({"is_palindrome": "def is_palindrome(t):\n    return True\n"}),
+                                 encoding="utf-8")
+    lines = [
+        {"prompt": "is_palindrome", "code": "def is_palindrome(t):\n    return t == t[::-1]\n"},
+        {"prompt": "second_largest", "code": "def second_largest(n):\n    return sorted(set(n))[-2]\n"},
+    ]
+    (resp / "b.jsonl").write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    monkeypatch.setattr(evaluate_models, "RESP_DIR", str(resp))
+    assert evaluate_models.list_models() == ["a", "b"]
+    assert list(evaluate_models.load_responses("b", ["second_largest"])) == ["second_largest"]
+
+    log = ResultsLog(str(tmp_path / "scores.ndjson"))
+    out = tmp_path / "scores.json"
+    evaluate_models.run_streaming(["a", "b"], log, str(out), prompts=["is_palindrome"])
+    before = json.loads(out.read_text(encoding="utf-8"))
+    assert {m: list(p) for m, p in before.items()} == {"a": ["is_palindrome"], "b": ["is_palindrome"]}
+
+    scored = evaluate_models.run_streaming(
+        evaluate_models.list_models(["b"]), log, str(out), prompts=["second_largest"], merge=True,
+    )
+    after = json.loads(out.read_text(encoding="utf-8"))
+    assert scored == 1
+    assert after["a"] == before["a"] and after["b"]["is_palindrome"] == before["b"]["is_palindrome"]
+    assert list(after["b"]) == [k for k in PROMPT_KEYS if k in ("is_palindrome", "second_largest")]
+    assert after["b"]["second_largest"]["test_counts"]["passed"] > 0
+
+
+def test_criteria_run_rescores_only_requested_criteria(tmp_path, monkeypatch):
+    import json
+    import evaluate_models
+    from results_log import ResultsLog
+
+    resp = tmp_path / "responses"
+    resp.mkdir()
+    (resp / "a.json").write_text(json.dumps({"is_palindrome": "def is_palindrome(t):\n    return t == t[::-1]\n"}),
+                                 encoding="utf-8")
+    monkeypatch.setattr(evaluate_models, "RESP_DIR", str(resp))
+    log = ResultsLog(str(tmp_path / "scores.ndjson"))
+    out = tmp_path / "scores.json"
+    evaluate_models.run_streaming(["a"], log, str(out), prompts=["is_palindrome"])
+    report = json.loads(out.read_text(encoding="utf-8"))
+    entry = report["a"]["is_palindrome"]
+    entry["breakdown"].update(security=0.0, comment_richness=0.0)
+    out.write_text(json.dumps(report), encoding="utf-8")
+
+    args = evaluate_models.parse_args(["--criteria", "security", "--criteria", "freedom_expression,correctness"])
+    assert args.criteria == ("correctness", "security", "freedom_expression")
+    with pytest.raises(SystemExit):
+        evaluate_models.parse_args(["--criteria", "nope"])
+
+    evaluate_models.run_streaming(["a"], log, str(out), prompts=["is_palindrome"], criteria=("security",))
+    after = json.loads(out.read_text(encoding="utf-8"))["a"]["is_palindrome"]
+    assert list(after["breakdown"]) == list(entry["breakdown"])
+    assert after["breakdown"]["security"] == 5.0 and after["breakdown"]["comment_richness"] == 0.0
+    assert after["overall_score"] == evaluate_models.overall_of(after["breakdown"])
+    assert after["benchmark"] == entry["benchmark"]
@@ -0,0 +1,48 @@
+from features import extract_features
+from scoring import compile_snippet, features_of, score_comment_richness, score_security
+
+SOURCE = '''import os
+
+def process(items):
+    """Docstring sur une ligne."""
+    # filtre les valeurs
+    total = 0
+    for x in items:
+        if x > 0 and x < 10:
+            total += x
+    return [y for y in items if y], os.system("ls")
+'''
+
+
+def test_single_pass_features():
+    f = extract_features(SOURCE)
+    assert f.parsed
+    assert f.node_kinds["FunctionDef"] == 1
+    assert "os.system" in f.call_targets
+    assert f.dangerous_calls == ["os.system"]
+    assert f.docstring_lines == 1
+    assert f.comment_lines == 1
+    # FunctionDef > For > If
+    assert f.max_depth == 3
+    # 1 + for + if + `and` + compréhension (+ son if)
+    assert f.complexity == 6
+
+
+def test_single_line_docstring_does_not_swallow_following_lines():
+    # l'ancien scanner basculait en « docstring » après une docstring sur une ligne
+    f = extract_features('def f():\n    """Court."""\n    return 1\n')
+    assert (f.docstring_lines, f.comment_lines, f.total_lines) == (1, 0, 3)
+    assert score_comment_richness('def f():\n    """Court."""\n    return 1\n') == 5.0
+
+
+def test_unparsable_source():
+    f = extract_features("def f(:\n    # commentaire\n")
+    assert not f.parsed
+    assert f.comment_lines == 1
+    assert score_security("def f(:\n") == 0.0
+
+
+def test_features_memoized_on_snippet():
+    snippet = compile_snippet("process", SOURCE)
+    assert features_of(snippet) is features_of(snippet)
+    assert score_security(snippet) == 1.0
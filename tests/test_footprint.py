@@ -0,0 +1,57 @@
+from footprint import Footprint, Allocation, measure_call, run_footprint, score_footprint
+from scoring import compile_snippet, score_code
+
+STREAMING = '''def second_largest(numbers):
+    first = second = float("-inf")
+    for x in numbers:
+        if x > first:
+            first, second = x, first
+        elif first > x > second:
+            second = x
+    if second == float("-inf"):
+        raise ValueError("fewer than 2 distinct numbers")
+    return second
+'''
+COPYING = "def second_largest(numbers):\n    return sorted(set(numbers))[-2]\n"
+
+
+def test_measure_call_counts_only_allocations_of_the_call():
+    data = list(range(10_000))
+    assert measure_call(sum, (data,)).peak_bytes < 1024
+    copy = measure_call(list, (data,), 10_000)
+    assert copy.peak_bytes >= 8 * 10_000 and copy.retained_blocks < 100
+
+
+def test_measure_call_replays_on_unmodified_input():
+    seen = []
+
+    def drain(values):
+        seen.append(len(values))
+        while values:
+            values.pop()
+
+    measure_call(drain, ([1, 2, 3],))
+    assert seen == [3, 3, 3]
+
+
+def test_streaming_beats_copying_and_raw_bytes_are_kept():
+    streaming = run_footprint("second_largest", compile_snippet("second_largest", STREAMING).func)
+    copying = run_footprint("second_largest", compile_snippet("second_largest", COPYING).func)
+    assert score_footprint(streaming) == 5.0
+    assert score_footprint(copying) < 3.0
+    assert copying.as_dict()["allocations"][-1] == {"size": 100_000, "peak_bytes": copying.scaled[-1].peak_bytes,
+                                                  "retained_blocks": copying.scaled[-1].retained_blocks}
+
+
+def test_footprint_replays_only_benchmarked_sizes():
+    footprint = run_footprint("second_largest", max, sizes=[10, 100])
+    assert [a.size for a in footprint.scaled] == [10, 100]
+    assert score_footprint(Footprint("x")) == 0.0
+    assert score_footprint(Footprint("x", [Allocation(None, 2 * 1024 * 1024, 1)])) == 1.0
+
+
+def test_score_code_reports_memory_criterion():
+    snippet = compile_snippet("second_largest", COPYING)
+    scores = score_code("second_largest", snippet)
+    assert 1.0 <= scores["memory"] < 3.0
+    assert snippet.footprint.bytes_per_element > 8
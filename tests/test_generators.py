@@ -0,0 +1,87 @@
+import math
+
+from generators import (
+    PROPERTIES,
+    generate_cases,
+    is_palindrome_oracle,
+    multilingual_palindrome_oracle,
+    run_properties,
+)
+from prompts import TEST_CASES
+from scoring import score_robustness
+
+
+def _expected(oracle, args):
+    try:
+        return oracle(*args)
+    except Exception as e:
+        return type(e)
+
+
+def test_oracles_agree_with_static_test_cases():
+    for key, spec in PROPERTIES.items():
+        for args, expected in TEST_CASES[key]:
+            assert _expected(spec.oracle, args) == expected, (key, args)
+
+
+def test_cases_are_deterministic_and_finite_where_expected():
+    assert generate_cases("second_largest", "floats") == generate_cases("second_largest", "floats", 0)
+    inputs, _ = generate_cases("extreme_numbers_test", "huge_magnitudes")
+    assert all(math.isfinite(x) for (values,) in inputs for x in values)
+    # les palindromes décorés (accents, casse, ponctuation) restent des palindromes
+    inputs, expected = generate_cases("multilingual_palindrome_test", "accented_latin")
+    assert all(expected) and multilingual_palindrome_oracle("Ésope reste ici et se repose")
+
+
+def test_early_exit_on_first_counterexample():
+    calls = []
+
+    def always_max(numbers):
+        calls.append(1)
+        return max(numbers)
+
+    run = run_properties("second_largest", always_max)
+    assert run.passed == 0 and len(run.complete) == len(PROPERTIES["second_largest"].families)
+    assert len(calls) == len(run.families)  # un seul appel par famille
+    assert all(f.counterexample for f in run.families)
+
+
+def test_input_mutation_does_not_leak_between_calls():
+    def sorting(numbers):
+        numbers.sort()
+        distinct = sorted(set(numbers))
+        if len(distinct) < 2:
+            raise ValueError(numbers)
+        return distinct[-2]
+
+    before = repr(generate_cases("second_largest", "distinct_ints"))
+    run = run_properties("second_largest", sorting)
+    assert run.passed == len(run.families)
+    assert repr(generate_cases("second_largest", "distinct_ints")) == before
+
+
+def test_budget_skips_remaining_families():
+    run = run_properties("is_palindrome", is_palindrome_oracle, budget=0.0)
+    assert run.truncated and run.complete == []
+    assert [f.checked for f in run.families] == [0] * len(PROPERTIES["is_palindrome"].families)
+    full = run_properties("is_palindrome", is_palindrome_oracle)
+    assert not full.truncated and full.passed == len(full.families)
+
+
+def test_budget_limited_entries_are_not_cached(tmp_path, monkeypatch):
+    import generators
+    from evaluate_models import evaluate_cell
+    from score_cache import ScoreCache
+
+    monkeypatch.setattr(generators, "PROPERTY_BUDGET", 0.0)
+    code = "def is_palindrome(t):\n    c = [x.lower() for x in t if x.isalnum()]\n    return c == c[::-1]\n"
+    entry = evaluate_cell("is_palindrome", code, ("robustness",))
+    assert entry["budget_limited"] == ["robustness"]
+    cache = ScoreCache(str(tmp_path))
+    cache.put("k", entry)
+    assert cache.get("k") is None
+
+
+def test_robustness_falls_back_to_test_cases():
+    assert run_properties("get_current_joke", lambda: "x") is None
+    assert score_robustness("get_current_joke", lambda: "x") == 5.0
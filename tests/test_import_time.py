@@ -0,0 +1,51 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Modules lourds qui ne doivent être chargés qu'à la demande
+HEAVY = ("benchmark", "footprint", "generators", "linting", "pycodestyle", "pyflakes",
+         "requests", "httpx", "numpy", "timeit", "_strptime")
+
+# Budgets d'import à froid (secondes, meilleur de 3 processus)
+BUDGETS = {"scoring": 0.12, "evaluate_models": 0.3}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+{then}
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _probe(module, then=""):
+    out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, then=then)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def test_scoring_import_loads_no_heavy_machinery():
+    loaded = set(_probe("scoring")["modules"])
+    assert loaded.isdisjoint(HEAVY), loaded & set(HEAVY)
+
+
+def test_static_scorers_stay_light_until_linter_is_needed():
+    then = "from scorers import get_scorer; get_scorer('security')('x = 1\\n')"
+    assert set(_probe("scorers", then)["modules"]).isdisjoint(HEAVY)
+    then = "from scorers import get_scorer; get_scorer('readability')('x = 1\\n')"
+    assert "linting" in _probe("scorers", then)["modules"]
+
+
+def test_api_does_not_import_evaluation_pipeline():
+    pytest.importorskip("fastapi")
+    loaded = set(_probe("api")["modules"])
+    assert loaded.isdisjoint(HEAVY + ("evaluate_models",)), loaded & set(HEAVY + ("evaluate_models",))
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_time_budget(module):
+    best = min(_probe(module)["elapsed"] for _ in range(3))
+    assert best < BUDGETS[module], f"import {module}: {best * 1e3:.0f} ms > {BUDGETS[module] * 1e3:.0f} ms"
@@ -0,0 +1,81 @@
+import pstats
+
+import evaluate_models
+import instrumentation
+from instrumentation import Metrics, StageSummary, profiling, recording, stage
+
+CODE = "def is_palindrome(t):\n    return t == t[::-1]\n"
+
+
+def test_stage_is_noop_without_recorder():
+    with stage("anything"):
+        pass
+
+
+def test_recorder_accumulates_repeated_stages():
+    with recording() as rec:
+        for _ in range(2):
+            with stage("tests"):
+                sum(range(1000))
+    stats = rec.as_dict()["tests"]
+    assert stats["wall"] > 0 and stats["cpu"] >= 0 and stats["peak_kb"] >= 0
+
+
+def test_nested_stages_with_equal_memory_close_cleanly(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_memory_kb", lambda: (100, 100))
+    with recording() as rec:
+        with stage("cell"):
+            with stage("compile"):
+                pass
+            with stage("tests"):
+                pass
+    assert set(rec.as_dict()) == {"cell", "compile", "tests"}
+
+
+def test_peak_memory_is_measured_per_stage():
+    with recording() as rec:
+        with stage("cell"):
+            with stage("alloc"):
+                block = bytearray(64 * 1024 * 1024)
+                block[::4096] = b"\1" * len(block[::4096])
+                del block
+            # un pic atteint plus tôt dans le worker ne doit pas réapparaître ici
+            with stage("static"):
+                sum(range(1000))
+    stages = rec.as_dict()
+    assert stages["alloc"]["peak_kb"] > 32 * 1024
+    assert stages["cell"]["peak_kb"] >= stages["alloc"]["peak_kb"]
+    if instrumentation._reset_peak():
+        assert stages["static"]["peak_kb"] < 8 * 1024
+
+
+def test_cell_task_reports_pipeline_stages(tmp_path):
+    entry, stages = evaluate_models._evaluate_cell_task(
+        ("m", "is_palindrome", CODE), profile_dir=str(tmp_path),
+    )
+    assert entry["test_counts"]["total"] == 3
+    for name in ("cell", "compile", "tests", "performance", "memory", "readability", "features", "static"):
+        assert name in stages
+    assert stages["cell"]["wall"] >= stages["performance"]["wall"]
+    pstats.Stats(str(tmp_path / "m.is_palindrome.prof"))
+
+    summary = StageSummary()
+    summary.add(stages)
+    assert summary.table().splitlines()[1].startswith("cell")
+
+
+def test_profiling_writes_cprofile_dump(tmp_path):
+    with profiling(str(tmp_path / "x")):
+        sorted(range(100))
+    assert (tmp_path / "x.prof").exists()
+
+
+def test_prometheus_rendering():
+    metrics = Metrics()
+    metrics.observe_stages({"cell": {"wall": 0.02, "cpu": 0.01, "peak_kb": 2048}})
+    metrics.observe_request("GET", "/api/scores", 200, 0.003)
+    text = metrics.render()
+    assert 'evaluator_stage_seconds_bucket{stage="cell",le="0.05"} 1' in text
+    assert 'evaluator_stage_seconds_count{stage="cell"} 1' in text
+    assert 'evaluator_stage_peak_rss_bytes{stage="cell"} 2097152' in text
+    assert 'http_request_duration_seconds_count{method="GET",path="/api/scores",status="200"} 1' in text
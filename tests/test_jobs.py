@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from jobs import ClientLimitExceeded, JobManager, QueueFull
+
+SNIPPET = {"is_palindrome": "def is_palindrome(t):\n    return t == t[::-1]\n"}
+
+
+def test_backpressure_and_per_client_cap():
+    async def scenario():
+        # consommateurs non démarrés : les jobs restent en file
+        manager = JobManager(max_queue=2, per_client=1)
+        manager.submit("a", "m", SNIPPET)
+        with pytest.raises(ClientLimitExceeded):
+            manager.submit("a", "m", SNIPPET)
+        manager.submit("b", "m", SNIPPET)
+        with pytest.raises(QueueFull):
+            manager.submit("c", "m", SNIPPET)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_job_runs_off_the_event_loop():
+    async def scenario():
+        manager = JobManager(workers=1)
+        manager.start()
+        job = manager.submit("a", "m", SNIPPET)
+        ticks = 0
+        while manager.get(job.id).active:
+            await asyncio.sleep(0.05)  # la boucle reste réactive pendant le scoring
+            ticks += 1
+        await manager.stop()
+        return manager.get(job.id), ticks
+
+    job, ticks = asyncio.run(scenario())
+    assert job.status == "done", job.error
+    assert ticks > 1
+    assert list(job.result) == ["is_palindrome"]
+    assert job.result["is_palindrome"]["test_counts"] == {"passed": 2, "total": 3}
+
+
+def test_stop_cancels_queued_jobs_and_manager_restarts():
+    manager = JobManager(workers=1, per_client=4)
+
+    async def first():
+        # pas de consommateurs : le job reste en file jusqu'à l'arrêt
+        job = manager.submit("a", "m", SNIPPET)
+        await manager.stop()
+        return job
+
+    async def second():
+        manager.start()
+        job = manager.submit("a", "m", SNIPPET)
+        while manager.get(job.id).active:
+            await asyncio.sleep(0.05)
+        await manager.stop()
+        return job
+
+    cancelled = asyncio.run(first())
+    assert cancelled.status == "failed" and cancelled.error.startswith("cancelled")
+    # second cycle de vie (autre boucle) : file et threads recréés
+    job = asyncio.run(second())
+    assert job.status == "done", job.error
+
+
+def test_stop_keeps_the_event_loop_responsive():
+    async def scenario():
+        manager = JobManager(workers=1)
+        manager.start()
+        job = manager.submit("a", "m", SNIPPET)
+        while manager.get(job.id).status == "queued":
+            await asyncio.sleep(0.01)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        await manager.stop()
+        ticker.cancel()
+        return job, ticks
+
+    job, ticks = asyncio.run(scenario())
+    assert job.status == "failed" and job.error.startswith("cancelled")
+    assert ticks > 1
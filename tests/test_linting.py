@@ -0,0 +1,37 @@
+import pytest
+from linting import Linter
+from scoring import compile_snippet, score_readability, score_readability_many
+
+CLEAN = "def f(x):\n    return x\n"
+MESSY = "import os\ndef f(x) :\n  return  x\n"
+
+
+@pytest.fixture(scope="module")
+def linter():
+    lint = Linter()
+    if not lint.in_process:
+        pytest.skip("pycodestyle/pyflakes non installés")
+    return lint
+
+
+def test_counts_style_and_flakes_warnings(linter):
+    assert linter.count(CLEAN) == 0
+    # F401, E302, E203, E111, E271
+    assert linter.count(MESSY) == 5
+    assert linter.count("def f(:\n") == 1
+
+
+def test_checker_recursion_falls_back_to_no_count(linter):
+    deep = "x = " + " + ".join(["1"] * 400) + "\n"
+    assert linter.count(deep) is None
+    assert score_readability(deep) == 0.0
+
+
+def test_batch_matches_single_calls(linter):
+    assert linter.count_many([CLEAN, MESSY]) == [linter.count(CLEAN), linter.count(MESSY)]
+
+
+def test_readability_reuses_snippet_tree(linter):
+    snippet = compile_snippet("f", MESSY)
+    assert score_readability(snippet) == score_readability(MESSY) == 4.0
+    assert score_readability_many([CLEAN, snippet]) == [5.0, 4.0]
@@ -0,0 +1,48 @@
+import json
+import socket
+import urllib.request
+import pytest
+from netstub import StubResponse, stub_network
+from scoring import score_code
+
+JOKE_URL = "https://official-joke-api.appspot.com/jokes/random"
+
+
+def test_urllib_is_served_by_stub():
+    with stub_network() as net:
+        with urllib.request.urlopen(JOKE_URL) as resp:
+            data = json.loads(resp.read())
+    assert resp.status == 200 and "punchline" in data
+    assert net.requests == [JOKE_URL]
+
+
+def test_custom_routes_latency_and_errors():
+    routes = [(r"example\.org/ok", StubResponse(body="pong")),
+              (r"example\.org/down", StubResponse(status=503))]
+    with stub_network(routes, latency=0.01) as net:
+        assert urllib.request.urlopen("http://example.org/ok").read() == b"pong"
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen("http://example.org/down")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen("http://example.org/unknown")
+    assert len(net.requests) == 3
+
+
+def test_outbound_sockets_are_refused():
+    with stub_network():
+        with pytest.raises(ConnectionRefusedError):
+            socket.create_connection(("203.0.113.1", 80), timeout=1)
+    assert urllib.request.urlopen.__module__ == "urllib.request"
+
+
+def test_requests_snippet_is_testable_and_benchmarked():
+    pytest.importorskip("requests")
+    source = (
+        "import requests\n\n"
+        "def get_current_joke():\n"
+        f"    data = requests.get({JOKE_URL!r}, timeout=5).json()\n"
+        "    return f\"{data['setup']} {data['punchline']}\"\n"
+    )
+    scores = score_code("get_current_joke", source)
+    assert scores["correctness"] == 5.0
+    assert scores["performance"] > 0.0
@@ -0,0 +1,29 @@
+import io
+import json
+
+from response_loader import iter_json_object, iter_jsonl
+
+DOC = {
+    "is_palindrome": 'def is_palindrome(t):\n    return t == "\\"" or t == t[::-1]\n',
+    "éléments": [1, -2.5e-3, {"nested": "}"}],
+    "count": 1234567890.0,
+    "second_largest": None,
+}
+
+
+def test_streaming_object_matches_json_load_across_chunk_boundaries():
+    text = json.dumps(DOC, indent=2, ensure_ascii=False)
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert dict(iter_json_object(io.StringIO(text), chunk_size=chunk_size)) == DOC
+
+
+def test_unselected_values_are_skipped():
+    text = json.dumps(DOC)
+    selected = dict(iter_json_object(io.StringIO(text), {"count", "second_largest"}, chunk_size=5))
+    assert selected == {"count": DOC["count"], "second_largest": None}
+
+
+def test_jsonl_selection_skips_other_prompts():
+    lines = '{"prompt": "a", "code": "x"}\n\n{"code": "y", "prompt": "b"}\n{"prompt": "a", "code": "z"}\n'
+    assert list(iter_jsonl(io.StringIO(lines))) == [("a", "x"), ("b", "y"), ("a", "z")]
+    assert list(iter_jsonl(io.StringIO(lines), {"b"})) == [("b", "y")]
@@ -0,0 +1,59 @@
+import json
+import os
+import stat
+from results_log import ResultsLog
+
+ENTRY_A = {"present": True, "error": None, "breakdown": {"security": 5.0}}
+ENTRY_B = {"present": False, "error": "missing code", "breakdown": {}}
+
+
+def test_rollup_matches_indented_json_dump(tmp_path):
+    log = ResultsLog(str(tmp_path / "scores.ndjson"))
+    log.reset()
+    log.append("m2", "p1", None, ENTRY_B)
+    log.append("m1", "p2", "d2", ENTRY_A)
+    log.append("m1", "p1", "d1", ENTRY_B)
+    log.append("m1", "p1", "d1b", ENTRY_A)  # la dernière ligne l'emporte
+    out = tmp_path / "scores.json"
+    log.rollup(str(out), [("m1", "p1"), ("m1", "p2"), ("m2", "p1")])
+    expected = {"m1": {"p1": ENTRY_A, "p2": ENTRY_A}, "m2": {"p1": ENTRY_B}}
+    assert out.read_text(encoding="utf-8") == json.dumps(expected, indent=2, ensure_ascii=False)
+    assert log.completed() == {("m1", "p1"): "d1b", ("m1", "p2"): "d2", ("m2", "p1"): None}
+
+
+def test_truncated_last_line_is_ignored_and_repaired(tmp_path):
+    path = tmp_path / "scores.ndjson"
+    log = ResultsLog(str(path))
+    log.reset()
+    log.append("m", "p1", "d1", ENTRY_A)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"model": "m", "prompt": "p2", "dig')  # crash en pleine écriture
+    assert log.completed() == {("m", "p1"): "d1"}
+    log.append("m", "p2", "d2", ENTRY_B)
+    assert log.completed() == {("m", "p1"): "d1", ("m", "p2"): "d2"}
+
+
+def test_empty_rollup(tmp_path):
+    log = ResultsLog(str(tmp_path / "scores.ndjson"))
+    log.reset()
+    out = tmp_path / "scores.json"
+    log.rollup(str(out), [("m", "p")])
+    assert json.loads(out.read_text(encoding="utf-8")) == {}
+
+
+def test_rollup_keeps_file_mode(tmp_path):
+    log = ResultsLog(str(tmp_path / "scores.ndjson"))
+    log.reset()
+    out = tmp_path / "scores.json"
+    log.rollup(str(out), [])
+    assert stat.S_IMODE(os.stat(out).st_mode) == 0o644
+    os.chmod(out, 0o640)
+    log.rollup(str(out), [])
+    assert stat.S_IMODE(os.stat(out).st_mode) == 0o640
+
+
+def test_missing_log_falls_back(tmp_path):
+    log = ResultsLog(str(tmp_path / "absent.ndjson"))
+    out = tmp_path / "scores.json"
+    log.rollup(str(out), [("m", "p1"), ("m", "p2")], {"m": {"p2": ENTRY_B}})
+    assert json.loads(out.read_text(encoding="utf-8")) == {"m": {"p2": ENTRY_B}}
@@ -0,0 +1,115 @@
+import random
+import pytest
+
+from run_history import RunHistory, main, wilcoxon_greater
+
+
+def _entry(scale):
+    return {
+        "error": None,
+        "overall_score": 4.0,
+        "breakdown": {"performance": 4.0, "security": 5.0, "note": "n/a"},
+        "benchmark": {"timings": [
+            {"size": None, "median": 1e-6 * scale, "p95": 2e-6 * scale, "number": 1024},
+            {"size": 10, "median": 2e-6 * scale, "p95": 3e-6 * scale, "number": 512},
+        ]},
+    }
+
+
+def _run(history, scale, stage_seconds, prompts=10):
+    run_id = history.start_run()
+    rng = random.Random(run_id)
+    for p in range(prompts):
+        noise = 1 + rng.uniform(-0.01, 0.01)
+        history.record_cell(run_id, "m1", f"p{p}", "digest", _entry(scale * noise),
+                            {"cell": {"wall": stage_seconds * noise, "cpu": 0.0, "peak_kb": 0}})
+    history.finish_run(run_id)
+    return run_id
+
+
+def test_rank_tests():
+    assert wilcoxon_greater([0.5] * 10) < 0.01
+    assert wilcoxon_greater([-0.5] * 10) > 0.99
+    assert wilcoxon_greater([]) == 1.0
+
+
+def test_compare_flags_slower_code_and_evaluator(tmp_path):
+    history = RunHistory(str(tmp_path / "runs.sqlite"))
+    base = _run(history, 1.0, 0.1)
+    same = _run(history, 1.0, 0.1)
+    report = history.compare(base, same)
+    assert report["regressions"] == 0
+    assert report["models"][0]["pairs"] == 20
+
+    slow = _run(history, 2.0, 0.3)
+    report = history.compare()
+    assert (report["base"], report["head"]) == (same, slow)
+    assert report["models"][0]["regression"] and report["models"][0]["ratio"] > 1.9
+    assert report["stages"][0]["stage"] == "cell" and report["stages"][0]["regression"]
+
+    runs = history.runs()
+    assert [r["cells"] for r in runs] == [10, 10, 10]
+
+
+def test_cached_cells_are_left_out_of_the_comparison(tmp_path):
+    history = RunHistory(str(tmp_path / "runs.sqlite"))
+    base = _run(history, 1.0, 0.1)
+    head = history.start_run()
+    for p in range(10):
+        # les timings servis par le cache datent d'un autre run : ignorés
+        cached = p < 8
+        history.record_cell(head, "m1", f"p{p}", "digest", _entry(5.0 if cached else 1.0), cached=cached)
+    history.finish_run(head)
+    assert history._ready
+    report = history.compare(base, head)
+    assert report["models"][0]["pairs"] == 4
+    assert report["regressions"] == 0
+
+
+def test_cli_exit_code(tmp_path, capsys):
+    db = str(tmp_path / "runs.sqlite")
+    history = RunHistory(db)
+    assert main(["--db", db, "compare"]) == 2
+    _run(history, 1.0, 0.1)
+    _run(history, 3.0, 0.1)
+    assert main(["--db", db, "compare"]) == 1
+    assert main(["--db", db, "compare", "2", "1"]) == 0
+
+
+def test_stages_are_paired_on_cells_scored_in_both_runs(tmp_path):
+    history = RunHistory(str(tmp_path / "runs.sqlite"))
+    base = _run(history, 1.0, 0.1)
+    head = history.start_run()
+    for p in range(10):
+        # un run partiel et lent ailleurs : les cellules sans vis-à-vis ne comptent pas
+        history.record_cell(head, "m1", f"p{p}", "digest", _entry(1.0),
+                            {"cell": {"wall": 0.1, "cpu": 0.0, "peak_kb": 0}}, cached=p >= 5)
+    history.record_cell(head, "m2", "p0", "digest", _entry(1.0),
+                        {"cell": {"wall": 9.0, "cpu": 0.0, "peak_kb": 0}})
+    history.finish_run(head)
+    report = history.compare(base, head)
+    assert report["stages"][0]["pairs"] == 5
+    assert report["regressions"] == 0
+
+
+def test_timings_compare_best_and_refuse_scorer_change(tmp_path):
+    history = RunHistory(str(tmp_path / "runs.sqlite"))
+    runs = []
+    for median in (1e-6, 3e-6):
+        run_id = history.start_run()
+        for p in range(10):
+            entry = _entry(1.0)
+            for t in entry["benchmark"]["timings"]:
+                t["median"], t["best"] = median, 1e-6
+            history.record_cell(run_id, "m1", f"p{p}", "digest", entry)
+        history.finish_run(run_id)
+        runs.append(run_id)
+    # médianes gonflées par la charge, minimum inchangé : pas de régression
+    report = history.compare(*runs)
+    assert report["models"][0]["ratio"] == 1.0 and report["regressions"] == 0
+
+    with history._connect() as db:
+        db.execute("UPDATE runs SET scorer_version = 'old' WHERE id = ?", (runs[0],))
+    with pytest.raises(ValueError):
+        history.compare(*runs)
+    assert history.compare(*runs, force=True)["scorer_version"]["base"] == "old"
@@ -0,0 +1,85 @@
+import json
+
+from sampling import pass_at_k, summarize_samples
+
+GOOD = "def is_palindrome(t):\n    c = [x.lower() for x in t if x.isalnum()]\n    return c == c[::-1]\n"
+BAD = "def is_palindrome(t):\n    return True\n"
+
+
+def test_pass_at_k_estimator():
+    assert pass_at_k(10, 0, 1) == 0.0
+    assert pass_at_k(10, 10, 5) == 1.0
+    assert abs(pass_at_k(10, 3, 1) - 0.3) < 1e-12
+    assert abs(pass_at_k(4, 1, 2) - 0.5) < 1e-12
+
+
+def test_summary_keeps_best_sample_entry():
+    entries = [
+        {"error": None, "test_counts": {"passed": 1, "total": 3}, "overall_score": 2.0, "breakdown": {"a": 1.0}},
+        {"error": None, "test_counts": {"passed": 3, "total": 3}, "overall_score": 4.0, "breakdown": {"a": 3.0}},
+    ]
+    entry = summarize_samples(entries)
+    assert entry["overall_score"] == 4.0 and entry["samples"]["best"] == 1
+    assert entry["samples"]["pass_at_k"] == {"1": 0.5}
+    assert entry["samples"]["mean"] == {"a": 2.0} and entry["samples"]["variance"] == {"a": 1.0}
+
+
+def test_errored_samples_count_as_zero():
+    entries = [
+        {"error": None, "test_counts": {"passed": 3, "total": 3}, "overall_score": 4.0, "breakdown": {"a": 4.0}},
+        {"error": "timeout: 1.0 s", "test_counts": {"passed": 0, "total": 0}, "overall_score": 0.0, "breakdown": {}},
+    ]
+    samples = summarize_samples(entries)["samples"]
+    assert samples["mean"] == {"a": 2.0} and samples["variance"] == {"a": 4.0}
+
+
+def test_identical_samples_are_scored_once(tmp_path, monkeypatch):
+    import evaluate_models
+
+    calls = []
+    real = evaluate_models.evaluate_cell
+    monkeypatch.setattr(evaluate_models, "evaluate_cell", lambda key, code, *rest: calls.append(code) or real(key, code, *rest))
+
+    cells = [("m", "is_palindrome", [GOOD, BAD, GOOD, GOOD])]
+    [(i, entry)] = list(evaluate_models.iter_cell_results(cells, pool=_InlinePool()))
+    samples = entry["samples"]
+    assert samples["n"] == 4 and samples["distinct"] == 2 and samples["passed"] == 3
+    assert samples["pass_at_k"]["1"] == 0.75 and entry["test_counts"] == {"passed": 3, "total": 3}
+    assert sorted(c for c in calls if c) == sorted([BAD, GOOD])
+
+    (tmp_path / "m.jsonl").write_text(
+        "".join(json.dumps({"prompt": "is_palindrome", "code": c}) + "\n" for c in (GOOD, BAD)), encoding="utf-8",
+    )
+    monkeypatch.setattr(evaluate_models, "RESP_DIR", str(tmp_path))
+    assert evaluate_models.load_responses("m") == {"is_palindrome": [GOOD, BAD]}
+
+
+def test_hanging_sample_does_not_discard_the_others(tmp_path):
+    import evaluate_models
+    from sandbox import SandboxLimits
+    from score_cache import ScoreCache
+
+    hang = "def is_palindrome(t):\n    while True:\n        pass\n"
+    cache = ScoreCache(str(tmp_path / "cache"))
+    limits = SandboxLimits(timeout=1.0, cpu_seconds=None)
+    cells = [("m", "is_palindrome", [GOOD, hang, BAD])]
+    # correctness seule : chaque échantillon terminé tient largement dans son timeout
+    criteria = ("correctness",)
+    [(i, entry)] = list(evaluate_models.iter_cell_results(cells, workers=2, cache=cache, limits=limits,
+                                                          criteria=criteria))
+    samples = entry["samples"]
+    assert samples["n"] == 3 and samples["passed"] == 1 and samples["best"] == 0
+    assert entry["error"] is None and entry["test_counts"] == {"passed": 3, "total": 3}
+    # les échantillons scorés sont en cache, pas celui en timeout
+    assert cache.get(evaluate_models.cell_digest("is_palindrome", GOOD, criteria)) is not None
+    assert cache.get(evaluate_models.cell_digest("is_palindrome", hang, criteria)) is None
+
+
+class _InlinePool:
+    """
+    Pool exécuté dans le processus courant (pour observer les appels).
+    """
+
+    def imap_unordered(self, func, items):
+        for j, item in enumerate(items):
+            yield j, func(item)
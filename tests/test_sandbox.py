@@ -0,0 +1,88 @@
+import os
+import time
+import pytest
+from sandbox import (
+    SandboxCpuLimit,
+    SandboxLimits,
+    SandboxMemoryError,
+    SandboxPool,
+    SandboxTaskError,
+    SandboxTimeout,
+)
+
+
+def _square(x):
+    return x * x
+
+
+def _spin(_):
+    while True:
+        pass
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _allocate(mb):
+    return len(bytearray(mb * 1024 * 1024))
+
+
+def _pid(_):
+    return os.getpid()
+
+
+def _fail(_):
+    raise KeyError("boom")
+
+
+def test_map_keeps_order_and_reraises_user_exceptions():
+    with SandboxPool(2) as pool:
+        assert pool.map(_square, range(6)) == [0, 1, 4, 9, 16, 25]
+        with pytest.raises(KeyError):
+            pool.run(_fail, None)
+        # le worker reste utilisable après une exception du code exécuté
+        assert pool.run(_square, 3) == 9
+
+
+def test_batch_survives_a_task_that_raises():
+    with SandboxPool(2) as pool:
+        results = dict(pool.imap_unordered(_fail, range(3)))
+        assert all(isinstance(r, SandboxTaskError) for r in results.values())
+        assert str(results[0]) == "crash: KeyError('boom')"
+        assert pool.map(_square, [2, 3]) == [4, 9]
+
+
+def test_wall_clock_timeout_bounds_latency():
+    limits = SandboxLimits(timeout=0.5, cpu_seconds=None)
+    with SandboxPool(2, limits) as pool:
+        start = time.perf_counter()
+        results = pool.map(_sleep, [5, 0.01])
+        assert time.perf_counter() - start < 3
+        assert isinstance(results[0], SandboxTimeout)
+        assert str(results[0]).startswith("timeout:")
+        assert results[1] == 0.01
+        assert pool.run(_square, 2) == 4
+
+
+def test_cpu_limit():
+    limits = SandboxLimits(timeout=10, cpu_seconds=1)
+    with SandboxPool(1, limits) as pool:
+        with pytest.raises(SandboxCpuLimit):
+            pool.run(_spin, None)
+        assert pool.run(_square, 5) == 25
+
+
+def test_memory_limit():
+    limits = SandboxLimits(memory_mb=512)
+    with SandboxPool(1, limits) as pool:
+        with pytest.raises(SandboxMemoryError):
+            pool.run(_allocate, 1024)
+        assert pool.run(_allocate, 1) == 1024 * 1024
+
+
+def test_workers_are_recycled():
+    with SandboxPool(1, SandboxLimits(max_tasks=2)) as pool:
+        pids = [pool.run(_pid, None) for _ in range(4)]
+    assert pids[0] == pids[1] != pids[2] == pids[3]
@@ -0,0 +1,36 @@
+import os
+import time
+import scoring
+from score_cache import ScoreCache, cell_key
+from evaluate_models import evaluate_all, list_models
+
+
+def test_key_depends_on_source_prompt_and_version(monkeypatch):
+    base = cell_key("is_palindrome", "def is_palindrome(t): return True")
+    assert base == cell_key("is_palindrome", "def is_palindrome(t): return True")
+    assert base != cell_key("is_palindrome", "def is_palindrome(t): return False")
+    assert base != cell_key("second_largest", "def is_palindrome(t): return True")
+    monkeypatch.setattr("score_cache.SCORER_VERSION", scoring.SCORER_VERSION + "-next")
+    assert base != cell_key("is_palindrome", "def is_palindrome(t): return True")
+
+
+def test_roundtrip_and_lru_eviction(tmp_path):
+    cache = ScoreCache(str(tmp_path), max_entries=2)
+    assert cache.get("a" * 64) is None
+    for i, k in enumerate(("a" * 64, "b" * 64, "c" * 64)):
+        cache.put(k, {"overall_score": float(i)})
+        os.utime(cache._path(k), (time.time() + i, time.time() + i))
+    assert cache.get("a" * 64) == {"overall_score": 0.0}
+    os.utime(cache._path("a" * 64), (time.time() + 10, time.time() + 10))
+    assert cache.prune() == 1
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None and cache.get("c" * 64) is not None
+
+
+def test_unchanged_cells_are_served_from_cache(tmp_path):
+    models = list_models()[:1]
+    cache = ScoreCache(str(tmp_path))
+    first = evaluate_all(models, cache=cache)
+    assert cache.hits == 0
+    second = evaluate_all(models, cache=ScoreCache(str(tmp_path)))
+    assert second == first
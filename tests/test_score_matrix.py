@@ -0,0 +1,59 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from score_matrix import ScoreMatrix, parse_weights
+
+REPORT = {
+    "alpha": {
+        "p1": {"overall_score": 4.0, "breakdown": {"performance": 5.0, "security": 3.0, "complexity": {"class": "O(n)"}}},
+        "p2": {"overall_score": 2.0, "breakdown": {"performance": 1.0, "security": 3.0}},
+    },
+    "beta": {
+        "p1": {"overall_score": 3.5, "breakdown": {"performance": 2.0, "security": 5.0}},
+        "p2": {"overall_score": 0.0, "error": "timeout: exceeded", "breakdown": {}},
+    },
+}
+
+
+def test_dense_array_with_mask():
+    m = ScoreMatrix.from_report(REPORT)
+    assert (m.models, m.prompts, m.criteria) == (["alpha", "beta"], ["p1", "p2"], ["performance", "security"])
+    assert m.values.shape == (2, 2, 2)
+    assert not m.mask[1, 1].any() and m.mask[0].all()
+
+
+def test_uniform_weights_match_cell_overall():
+    m = ScoreMatrix.from_report(REPORT)
+    cells = m.cell_overall()
+    assert cells[0, 0] == pytest.approx(4.0) and cells[1, 0] == pytest.approx(3.5)
+    # cellule en erreur : 0, comme son overall_score
+    assert cells[1, 1] == 0.0
+    assert m.model_overall().tolist() == pytest.approx([3.0, 1.75])
+
+
+def test_absent_cells_are_ignored():
+    report = {"alpha": REPORT["alpha"], "beta": {"p1": REPORT["beta"]["p1"]}}
+    m = ScoreMatrix.from_report(report)
+    assert np.isnan(m.cell_overall()[1, 1])
+    assert m.model_overall().tolist() == pytest.approx([3.0, 3.5])
+
+
+def test_weighted_leaderboard_and_ranks():
+    m = ScoreMatrix.from_report(REPORT)
+    # beta : 3.5 et une cellule en timeout (0) → derrière alpha
+    assert [name for name, _ in m.leaderboard()] == ["alpha", "beta"]
+    assert [name for name, _ in m.leaderboard(parse_weights("performance=1"))] == ["alpha", "beta"]
+    # performance : alpha 3.0 > beta 2.0 ; security : beta 5.0 > alpha 3.0
+    assert m.criterion_ranks().tolist() == [[1, 2], [2, 1]]
+    with pytest.raises(KeyError):
+        m.leaderboard({"nope": 1.0})
+
+
+def test_npz_roundtrip(tmp_path):
+    m = ScoreMatrix.from_report(REPORT)
+    path = str(tmp_path / "scores.npz")
+    m.save(path)
+    loaded = ScoreMatrix.load(path)
+    assert loaded.models == m.models and loaded.criteria == m.criteria
+    assert np.array_equal(loaded.values, m.values) and np.array_equal(loaded.mask, m.mask)
+    assert np.array_equal(loaded.cells, m.cells)
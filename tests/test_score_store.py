@@ -0,0 +1,28 @@
+import json
+from score_store import ScoreStore
+
+
+def test_document_is_reused_until_file_changes(tmp_path):
+    path = tmp_path / "scores.json"
+    path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+    store = ScoreStore(str(path))
+    first = store.current()
+    assert first.data == {"a": 1}
+    assert store.current() is first
+
+    path.write_text(json.dumps({"a": 2, "b": 3}), encoding="utf-8")
+    second = store.current()
+    assert second is not first and second.data == {"a": 2, "b": 3}
+    assert json.loads(second.body) == second.data
+    assert second.etag != first.etag
+
+
+def test_index_built_once_per_version(tmp_path):
+    path = tmp_path / "scores.json"
+    path.write_text(json.dumps({"m": {"p": {"overall_score": 3.0, "breakdown": {"security": 5.0}}}}),
+                    encoding="utf-8")
+    store = ScoreStore(str(path))
+    index = store.current().index
+    assert store.current().index is index
+    assert index.model_means == {"m": {"overall": 3.0, "security": 5.0}}
+    assert index.ranking("security") is index.ranking("security")
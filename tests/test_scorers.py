@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+import scorers
+from scoring import score_code
+
+GOOD = "def is_palindrome(t):\n    c = [x.lower() for x in t if x.isalnum()]\n    return c == c[::-1]\n"
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # toute modification du registre est annulée après le test
+    monkeypatch.setattr(scorers, "CRITERIA", dict(scorers.CRITERIA))
+    monkeypatch.setattr(scorers, "_resolved", dict(scorers._resolved))
+
+
+def test_resolve_pulls_dependencies_in_registry_order():
+    assert [c.name for c in scorers.resolve(["memory", "security"])] == ["performance", "memory", "security"]
+    assert [c.name for c in scorers.resolve()] == list(scorers.CRITERIA)
+    with pytest.raises(KeyError):
+        scorers.resolve(["nope"])
+
+
+def test_resolve_rejects_cycles_and_unknown_inputs(registry):
+    scorers.register("a", "scoring:score_security", after=("b",))
+    scorers.register("b", "scoring:score_security", after=("a",))
+    with pytest.raises(ValueError):
+        scorers.resolve(["a"])
+    with pytest.raises(ValueError):
+        scorers.register("c", "scoring:score_security", inputs=("ast",))
+    with pytest.raises(ValueError):
+        scorers.register("c", "scoring:score_security", cost="gpu")
+
+
+def test_subset_returns_only_requested_criteria():
+    full = score_code("is_palindrome", GOOD)
+    assert list(full) == list(scorers.CRITERIA)
+    subset = score_code("is_palindrome", GOOD, criteria=["security", "correctness"])
+    assert list(subset) == ["correctness", "security"]
+    assert subset["correctness"] == full["correctness"] == 5.0
+
+
+def _thread_name(snippet):
+    return threading.current_thread().name
+
+
+def test_io_criteria_run_off_the_calling_thread(registry):
+    scorers.register("where", f"{__name__}:_thread_name", cost="io")
+    scorers.register("after_where", f"{__name__}:_thread_name", after=("where",))
+    result = score_code("is_palindrome", GOOD, criteria=["where", "after_where"])
+    assert result["where"].startswith("criterion")
+    assert result["after_where"] == threading.current_thread().name
+
+
+def test_no_thread_pool_without_io_criteria(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool créé sans critère io")
+
+    monkeypatch.setattr(scorers, "ThreadPoolExecutor", no_pool)
+    monkeypatch.setattr(scorers, "cost_of", lambda c: "cpu" if c.cost not in scorers.COSTS else c.cost)
+    assert list(score_code("is_palindrome", GOOD, criteria=["security", "readability"])) == ["readability", "security"]
+
+
+def test_static_criteria_skip_the_test_suite(monkeypatch):
+    import evaluate_models
+
+    assert scorers.uses_tests(["robustness"]) and not scorers.uses_tests(["security", "memory"])
+    monkeypatch.setattr(evaluate_models, "run_tests_for", lambda *a: pytest.fail("tests lancés"))
+    entry = evaluate_models.evaluate_cell("is_palindrome", GOOD, ("security",))
+    assert entry["breakdown"] == {"security": 5.0} and entry["tests_skipped"]
+    # schéma de scores.json conservé même sans entrée précédente
+    assert entry["test_counts"] == {"passed": 0, "total": 0}
+    previous = {"test_counts": {"passed": 3, "total": 3}, "breakdown": {"correctness": 5.0}}
+    merged = evaluate_models.merge_criteria(previous, entry)
+    assert merged["test_counts"] == {"passed": 3, "total": 3} and "tests_skipped" not in merged